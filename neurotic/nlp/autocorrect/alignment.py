@@ -1,8 +1,154 @@
 # from pypi
 import attr
+import numpy
 
 # this repo
-from neurotic.nlp.autocorrect.distance import MinimumEdits
+from neurotic.nlp.autocorrect.distance import (
+    codes,
+    Engines,
+    MinimumEdits,
+    next_row,
+)
+
+
+@attr.s(auto_attribs=True)
+class LinearSpacePath:
+    """Finds the Aligner's backtrace path without keeping the whole table
+
+    The backtrace starts at the bottom-right cell and keeps stepping to
+    the smallest of the cells above, to the left, and diagonally up and to
+    the left (so where it goes only depends on two rows at a time). Like
+    Hirschberg's algorithm this splits the rows in half, works out the
+    middle row going forward, follows the path from the bottom up to the
+    middle row and then does the same thing for the top half, so it only
+    keeps a row per level of splitting (plus the last row and column that
+    the table's negative indices wrap around to).
+
+    Args:
+     source: the source string
+     target: the target string
+     insertion_cost: how much inserting a character costs
+     deletion_cost: how much deleting a character costs
+     replacement_cost: how much swapping out a character costs
+    """
+    source: str
+    target: str
+    insertion_cost: int=1
+    deletion_cost: int=1
+    replacement_cost: int=2
+    _source_codes: numpy.ndarray=None
+    _target_codes: numpy.ndarray=None
+    _steps: numpy.ndarray=None
+    _last_row: numpy.ndarray=None
+    _last_column: numpy.ndarray=None
+
+    @property
+    def steps(self) -> numpy.ndarray:
+        """The first row of the table"""
+        if self._steps is None:
+            self._steps = (numpy.arange(len(self.target) + 1)
+                           * self.insertion_cost)
+        return self._steps
+
+    def advance(self, row: numpy.ndarray, start: int, stop: int) -> numpy.ndarray:
+        """Works the table out going forward from one row to a later one
+
+        Args:
+         row: the values for row `start`
+         start: index of the row to start from
+         stop: index of the row to stop at
+
+        Returns:
+         the values for row `stop`
+        """
+        for index in range(start + 1, stop + 1):
+            row = next_row(row, index * self.deletion_cost,
+                           self._target_codes == self._source_codes[index - 1],
+                           self.insertion_cost, self.deletion_cost,
+                           self.replacement_cost, self.steps)
+        return row
+
+    def value(self, rows: dict, row: int, column: int) -> int:
+        """The table value at a cell (wrapping negative indices like numpy)
+
+        Args:
+         rows: row-index: values for the rows that are available
+         row: index of the cell's row
+         column: index of the cell's column
+        """
+        if row < 0:
+            return self._last_row[column]
+        if column < 0:
+            return self._last_column[row]
+        return rows[row][column]
+
+    def step(self, rows: dict, row: int, column: int) -> tuple:
+        """Picks the next cell of the backtrace
+
+        Raises:
+         IndexError: the backtrace ran off the table (the full-table path
+           fails here too)
+        """
+        up, left = row - 1, column - 1
+        _, cell = min(
+            (self.value(rows, up, column), (up, column)),
+            (self.value(rows, row, left), (row, left)),
+            (self.value(rows, up, left), (up, left)))
+        if min(cell) < 0:
+            raise IndexError(f"The backtrace went off the table at {cell}")
+        return cell
+
+    def trace(self, top: int, top_row: numpy.ndarray, bottom: int,
+              column: int, path: list) -> int:
+        """Follows the path from a cell in one row up to an earlier row
+
+        Args:
+         top: index of the row to stop at
+         top_row: the values for row `top`
+         bottom: index of the row to start in
+         column: index of the column to start in
+         path: list to add the cells to (in backtrace order)
+
+        Returns:
+         the column where the path reached the top row
+        """
+        if bottom - top > 1:
+            middle = (top + bottom) // 2
+            middle_row = self.advance(top_row, top, middle)
+            column = self.trace(middle, middle_row, bottom, column, path)
+            return self.trace(top, top_row, middle, column, path)
+        if bottom == top:
+            return column
+        rows = {top: top_row, bottom: self.advance(top_row, top, bottom)}
+        row = bottom
+        while row > top:
+            row, column = self.step(rows, row, column)
+            path.append((row, column))
+        return column
+
+    def __call__(self) -> list:
+        """Finds the path
+
+        Returns:
+         list of (row, column) cells from (0, 0) to the bottom-right cell
+        """
+        self._source_codes = codes(self.source)
+        self._target_codes = codes(self.target)
+        last_column = [self.steps[-1]]
+        row = self.steps
+        for index in range(1, len(self.source) + 1):
+            row = self.advance(row, index - 1, index)
+            last_column.append(row[-1])
+        self._last_row, self._last_column = row, last_column
+
+        rows, columns = len(self.source), len(self.target)
+        path = [(rows, columns)]
+        column = self.trace(0, self.steps, rows, columns, path)
+        first_row = {0: self.steps}
+        while column > 0:
+            _, column = self.step(first_row, 0, column)
+            path.append((0, column))
+        return list(reversed(path))
 
 
 @attr.s(auto_attribs=True)
@@ -13,10 +159,14 @@ class Aligner:
      source: the source string to align
      target: the target string to align
      empty_token: character to use to fill in alignments
+     linear_space: find the path without building the whole distance table
+     engine: how the editor fills in the distance table (see MinimumEdits)
     """
     source: str
     target: str
     empty_token: str="*"
+    linear_space: bool=False
+    engine: str=Engines.python
     _source_alignment: list=None
     _target_alignment: list=None
     _table: str=None
@@ -27,12 +177,19 @@ class Aligner:
     def editor(self) -> MinimumEdits:
         """object to figure out the minimum edit distance"""
         if self._editor is None:
-            self._editor = MinimumEdits(self.source, self.target)
+            self._editor = MinimumEdits(self.source, self.target,
+                                        engine=self.engine)
         return self._editor
 
     @property
     def path(self) -> list:
         """An optimal path through the distance table"""
+        if self._path is None and self.linear_space:
+            self._path = LinearSpacePath(
+                self.source, self.target,
+                insertion_cost=self.editor.insertion_cost,
+                deletion_cost=self.editor.deletion_cost,
+                replacement_cost=self.editor.replacement_cost)()
         if self._path is None:
             distances = self.editor.distance_table
             # start at the bottom right cell
@@ -0,0 +1,78 @@
+"""Compares the Aligner's full-table and linear-space paths
+
+The full table is filled in with the numpy engine (the python engine's
+double loop would take hours at 10,000 characters). Run it as a module::
+
+    python -m neurotic.nlp.autocorrect.benchmarks --length 10000
+"""
+# python
+from argparse import ArgumentParser
+
+import random
+import time
+import tracemalloc
+
+# this repo
+from neurotic.nlp.autocorrect.alignment import Aligner
+from neurotic.nlp.autocorrect.distance import Engines
+
+
+def random_pair(length: int, seed: int=None) -> tuple:
+    """Makes a DNA-like string and a mutated copy of it
+
+    Args:
+     length: number of characters in the strings
+     seed: for the random number generator
+
+    Returns:
+     source, target strings
+    """
+    generator = random.Random(seed)
+    source = [generator.choice("acgt") for _ in range(length)]
+    target = [generator.choice("acgt") if generator.random() < 0.1
+              else character for character in source]
+    return "".join(source), "".join(target)
+
+
+def peak_memory(source: str, target: str, linear_space: bool) -> tuple:
+    """Aligns the strings and measures the memory it took
+
+    Args:
+     source: the source string to align
+     target: the target string to align
+     linear_space: use the linear-space path instead of the full table
+
+    Returns:
+     peak bytes allocated, seconds it took
+    """
+    tracemalloc.start()
+    started = time.perf_counter()
+    Aligner(source, target, linear_space=linear_space,
+            engine=Engines.numpy)()
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, seconds
+
+
+def main() -> None:
+    """Prints the peak memory for each kind of path"""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--length", type=int, default=10000,
+                        help="characters in each string (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-full", action="store_true",
+                        help="only run the linear-space path")
+    arguments = parser.parse_args()
+    source, target = random_pair(arguments.length, arguments.seed)
+    modes = [True] if arguments.skip_full else [False, True]
+    print("| path | peak MiB | seconds |")
+    for linear_space in modes:
+        peak, seconds = peak_memory(source, target, linear_space)
+        name = "linear-space" if linear_space else "full table"
+        print(f"| {name} | {peak/2**20:.1f} | {seconds:.1f} |")
+    return
+
+
+if __name__ == "__main__":
+    main()
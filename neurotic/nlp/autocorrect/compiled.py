@@ -0,0 +1,376 @@
+# python
+from argparse import Namespace
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Iterable, Iterator, Union
+
+# pypi
+import attr
+import numpy
+
+# this repository
+from neurotic.nlp.autocorrect.deletions import deletes, DeletionIndex
+
+FORMAT_VERSION = 1
+
+Files = Namespace(
+    header="header.npy",
+    characters="{}_characters.npy",
+    offsets="{}_offsets.npy",
+    counts="counts.npy",
+    probabilities="probabilities.npy",
+    postings="postings.npy",
+    posting_offsets="posting_offsets.npy",
+)
+
+Names = Namespace(
+    vocabulary="vocabulary",
+    variants="variants",
+)
+
+Header = Namespace(
+    version=0,
+    has_index=1,
+)
+
+
+class CorpusFormatError(Exception):
+    """Raised when a compiled corpus is a different format version"""
+
+
+@attr.s(auto_attribs=True)
+class SortedStrings:
+    """Sorted strings stored as one flat array of utf-8 bytes
+
+    String i is =characters[offsets[i]:offsets[i + 1]]=. Since utf-8 keeps
+    the order of the code points, lookups are a binary search on the bytes.
+
+    Args:
+     characters: all the encoded strings, one after another
+     offsets: where each string starts (with the end of the last one at the end)
+    """
+    characters: numpy.ndarray
+    offsets: numpy.ndarray
+    _lengths: frozenset=attr.ib(default=None, eq=False, repr=False)
+
+    @property
+    def lengths(self) -> frozenset:
+        """The number of utf-8 bytes in each of the strings"""
+        if self._lengths is None:
+            self._lengths = frozenset(
+                int(length) for length in numpy.unique(numpy.diff(self.offsets)))
+        return self._lengths
+
+    @classmethod
+    def from_strings(cls, strings: Iterable[str]) -> "SortedStrings":
+        """Sorts and packs the strings
+
+        Args:
+         strings: the (unique) strings to pack
+
+        Returns:
+         the packed strings
+        """
+        encoded = [string.encode() for string in sorted(strings)]
+        lengths = [0] + [len(string) for string in encoded]
+        return cls(
+            characters=numpy.frombuffer(b"".join(encoded),
+                                        dtype=numpy.uint8).copy(),
+            offsets=numpy.cumsum(lengths, dtype=numpy.int64))
+
+    def encoded(self, index: int) -> bytes:
+        """The utf-8 bytes for a string"""
+        return self.characters[
+            self.offsets[index]:self.offsets[index + 1]].tobytes()
+
+    def index(self, string: str) -> int:
+        """Finds where a string is
+
+        Args:
+         string: the string to find
+
+        Returns:
+         the string's index or -1 if it isn't one of the strings
+        """
+        target = string.encode()
+        if len(target) not in self.lengths:
+            return -1
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self.encoded(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self) and self.encoded(low) == target:
+            return low
+        return -1
+
+    def intersection(self, strings: Iterable[str]) -> set:
+        """The strings that are also in this collection
+
+        This stands in for =set.intersection= (for the WordSuggestor's
+        edits). Each string is found with a binary search so the
+        (memory-mapped) strings never get unpacked into a set, strings whose
+        length none of these strings have are dropped without searching.
+        The searches are still much slower than a set's lookups so the
+        edits engine (which makes thousands of candidates per word) is slow
+        with a compiled corpus, use the deletions engine with one instead.
+        """
+        return {string for string in set(strings) if string in self}
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        return self.encoded(index).decode()
+
+    def __contains__(self, string: str) -> bool:
+        return self.index(string) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        return (self[index] for index in range(len(self)))
+
+    def save(self, folder: Path, name: str) -> None:
+        """Saves the characters and offsets as .npy files
+
+        Args:
+         folder: the directory to save the files in
+         name: prefix for the file names
+        """
+        numpy.save(folder/Files.characters.format(name), self.characters)
+        numpy.save(folder/Files.offsets.format(name), self.offsets)
+        return
+
+    @classmethod
+    def load(cls, folder: Path, name: str,
+             memory_map: bool=True) -> "SortedStrings":
+        """Loads strings saved with =save=
+
+        Args:
+         folder: the directory with the files
+         name: prefix for the file names
+         memory_map: whether to memory-map the arrays instead of reading them
+
+        Returns:
+         the strings
+        """
+        mode = "r" if memory_map else None
+        return cls(
+            characters=numpy.load(folder/Files.characters.format(name),
+                                  mmap_mode=mode),
+            offsets=numpy.load(folder/Files.offsets.format(name),
+                               mmap_mode=mode))
+
+
+class ArrayMapping(Mapping):
+    """Read-only mapping of sorted strings to an array of values
+
+    Args:
+     keys: the sorted strings
+     values: the value for each string (in the same order)
+     kind: python type to convert the values to
+    """
+    def __init__(self, keys: SortedStrings, values: numpy.ndarray,
+                 kind: type) -> None:
+        self.keys_ = keys
+        self.values_ = values
+        self.kind = kind
+        return
+
+    def __getitem__(self, key: str):
+        index = self.keys_.index(key)
+        if index < 0:
+            raise KeyError(key)
+        return self.kind(self.values_[index])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys_)
+
+    def __len__(self) -> int:
+        return len(self.keys_)
+
+
+@attr.s(auto_attribs=True)
+class CompiledDeletionIndex:
+    """A DeletionIndex stored as arrays
+
+    The vocabulary ids for variant i are
+    =postings[posting_offsets[i]:posting_offsets[i + 1]]=.
+
+    Args:
+     vocabulary: the sorted vocabulary
+     variants: the sorted deletion-variants
+     posting_offsets: where each variant's vocabulary ids start
+     postings: the vocabulary ids for each variant
+     distance: the most letters deleted to make the variants
+    """
+    vocabulary: SortedStrings
+    variants: SortedStrings
+    posting_offsets: numpy.ndarray
+    postings: numpy.ndarray
+    distance: int=2
+
+    @classmethod
+    def from_index(cls, index: DeletionIndex,
+                   vocabulary: SortedStrings) -> "CompiledDeletionIndex":
+        """Packs a deletion index
+
+        Args:
+         index: the index to pack
+         vocabulary: the sorted vocabulary the index was built from
+
+        Returns:
+         the packed index
+        """
+        ids = {word: row for row, word in enumerate(vocabulary)}
+        variants = SortedStrings.from_strings(index.index)
+        lengths = [0]
+        postings = []
+        for variant in variants:
+            words = index.index[variant]
+            postings.extend(ids[word] for word in words)
+            lengths.append(len(words))
+        return cls(vocabulary=vocabulary, variants=variants,
+                   posting_offsets=numpy.cumsum(lengths, dtype=numpy.int64),
+                   postings=numpy.array(postings, dtype=numpy.int32),
+                   distance=index.distance)
+
+    def candidates(self, word: str) -> set:
+        """Vocabulary words that might be within `distance` edits of the word
+
+        Args:
+         word: the string to look up
+
+        Returns:
+         set of vocabulary words sharing a deletion-variant with the word
+        """
+        found = set()
+        for variant in deletes(word, self.distance):
+            row = self.variants.index(variant)
+            if row >= 0:
+                found.update(
+                    self.vocabulary[int(word_id)] for word_id in
+                    self.postings[self.posting_offsets[row]:
+                                  self.posting_offsets[row + 1]])
+        return found
+
+
+@attr.s(auto_attribs=True)
+class CompiledCorpus:
+    """A CorpusBuilder's counts (and deletion index) stored as arrays
+
+    This can stand in for the CorpusBuilder given to the suggestors. Once
+    saved, loading it only memory-maps the arrays so starting up doesn't
+    have to re-read the source text and several processes can share one
+    copy of the arrays.
+
+    Looking up a word is a binary search instead of a hash lookup so give
+    the WordSuggestor =engine="deletions"= (which only looks up the word's
+    deletes in the compiled index) rather than the default edits engine.
+
+    Args:
+     vocabulary: the sorted vocabulary
+     word_counts: the count for each vocabulary word
+     word_probabilities: the probability for each vocabulary word
+     deletion_index: the packed deletion index (if one was built)
+    """
+    vocabulary: SortedStrings
+    word_counts: numpy.ndarray
+    word_probabilities: numpy.ndarray
+    deletion_index: CompiledDeletionIndex=None
+
+    @classmethod
+    def compile(cls, corpus: object,
+                index: bool=True) -> "CompiledCorpus":
+        """Packs a corpus
+
+        Args:
+         corpus: the CorpusBuilder to pack
+         index: whether to build the deletion index too
+
+        Returns:
+         the compiled corpus
+        """
+        vocabulary = SortedStrings.from_strings(corpus.counts)
+        words = list(vocabulary)
+        compiled = cls(
+            vocabulary=vocabulary,
+            word_counts=numpy.array([corpus.counts[word] for word in words],
+                                    dtype=numpy.int64),
+            word_probabilities=numpy.array(
+                [corpus.probabilities[word] for word in words],
+                dtype=numpy.float64))
+        if index:
+            compiled.deletion_index = CompiledDeletionIndex.from_index(
+                DeletionIndex(words), vocabulary)
+        return compiled
+
+    @property
+    def counts(self) -> ArrayMapping:
+        """word: count mapping"""
+        return ArrayMapping(self.vocabulary, self.word_counts, int)
+
+    @property
+    def probabilities(self) -> ArrayMapping:
+        """word: probability mapping"""
+        return ArrayMapping(self.vocabulary, self.word_probabilities, float)
+
+    def save(self, folder: Union[Path, str]) -> None:
+        """Saves the arrays as .npy files
+
+        Args:
+         folder: the directory to save the files in
+        """
+        folder = Path(folder)
+        folder.mkdir(parents=True, exist_ok=True)
+        has_index = self.deletion_index is not None
+        numpy.save(folder/Files.header,
+                   numpy.array([FORMAT_VERSION, has_index]))
+        self.vocabulary.save(folder, Names.vocabulary)
+        numpy.save(folder/Files.counts, self.word_counts)
+        numpy.save(folder/Files.probabilities, self.word_probabilities)
+        if has_index:
+            self.deletion_index.variants.save(folder, Names.variants)
+            numpy.save(folder/Files.posting_offsets,
+                       self.deletion_index.posting_offsets)
+            numpy.save(folder/Files.postings, self.deletion_index.postings)
+        return
+
+    @classmethod
+    def load(cls, folder: Union[Path, str],
+             memory_map: bool=True) -> "CompiledCorpus":
+        """Loads a corpus saved with =save=
+
+        Args:
+         folder: the directory with the files
+         memory_map: whether to memory-map the arrays instead of reading them
+
+        Returns:
+         the compiled corpus
+
+        Raises:
+         CorpusFormatError: the files are a different format version
+        """
+        folder = Path(folder)
+        mode = "r" if memory_map else None
+        header = numpy.load(folder/Files.header)
+        if header[Header.version] != FORMAT_VERSION:
+            raise CorpusFormatError(
+                f"Format version {header[Header.version]} "
+                f"isn't {FORMAT_VERSION}")
+        vocabulary = SortedStrings.load(folder, Names.vocabulary, memory_map)
+        corpus = cls(
+            vocabulary=vocabulary,
+            word_counts=numpy.load(folder/Files.counts, mmap_mode=mode),
+            word_probabilities=numpy.load(folder/Files.probabilities,
+                                          mmap_mode=mode))
+        if header[Header.has_index]:
+            corpus.deletion_index = CompiledDeletionIndex(
+                vocabulary=vocabulary,
+                variants=SortedStrings.load(folder, Names.variants,
+                                            memory_map),
+                posting_offsets=numpy.load(folder/Files.posting_offsets,
+                                           mmap_mode=mode),
+                postings=numpy.load(folder/Files.postings, mmap_mode=mode))
+        return corpus
@@ -0,0 +1,176 @@
+# python
+from collections import defaultdict
+from typing import Iterable
+
+# pypi
+import attr
+
+# this repository
+from neurotic.nlp.autocorrect.edits import is_one_edit, TheEditor
+
+
+def deletes(word: str, distance: int=2) -> set:
+    """All the strings made by deleting up to `distance` letters
+
+    Args:
+     word: the string to delete letters from
+     distance: the most letters to delete
+
+    Returns:
+     set of the deletion-variants (including the word itself)
+    """
+    variants = level = {word}
+    for _ in range(distance):
+        level = {variant[:index] + variant[index + 1:]
+                 for variant in level for index in range(len(variant))}
+        variants = variants | level
+    return variants
+
+
+@attr.s(auto_attribs=True)
+class DeletionIndex:
+    """Maps deletion-variants to the vocabulary words they came from
+
+    Two words within `distance` edits of each other (counting a switch as
+    one edit) always share a variant made by deleting at most `distance`
+    letters from each of them, so looking up the deletes of a word finds
+    every vocabulary word that might be close to it.
+
+    Args:
+     vocabulary: the words to index
+     distance: the most letters to delete from each word
+    """
+    vocabulary: Iterable[str]
+    distance: int=2
+    _index: dict=None
+
+    @property
+    def index(self) -> dict:
+        """deletion-variant: tuple of vocabulary words with that variant"""
+        if self._index is None:
+            index = defaultdict(list)
+            for word in self.vocabulary:
+                for variant in deletes(word, self.distance):
+                    index[variant].append(word)
+            self._index = {variant: tuple(words)
+                           for variant, words in index.items()}
+        return self._index
+
+    def candidates(self, word: str) -> set:
+        """Vocabulary words that might be within `distance` edits of the word
+
+        Args:
+         word: the string to look up
+
+        Returns:
+         set of vocabulary words sharing a deletion-variant with the word
+        """
+        index = self.index
+        found = set()
+        for variant in deletes(word, self.distance):
+            found.update(index.get(variant, ()))
+        return found
+
+
+@attr.s(auto_attribs=True)
+class DeletionSuggestor:
+    """Suggests Words for Autocorrection using a deletion index
+
+    This gives the same suggestions as the WordSuggestor but instead of
+    generating every one and two-letter edit of the word it looks up the
+    word's deletes in an index of the vocabulary built ahead of time and
+    then only checks the edits for the (few) words it finds.
+
+    Args:
+     corpus: a Corpus Builder object
+     suggestions: number of suggestions to return for each word
+     want_switches: also do the =switch= edit
+    """
+    corpus: object
+    suggestions: int=2
+    want_switches: bool=True
+    _index: DeletionIndex=None
+
+    @property
+    def index(self) -> DeletionIndex:
+        """The deletion index for the corpus vocabulary
+
+        A compiled corpus that was saved with its index brings its own.
+        """
+        if self._index is None:
+            self._index = getattr(self.corpus, "deletion_index", None)
+        if self._index is None:
+            self._index = DeletionIndex(self.corpus.vocabulary)
+        return self._index
+
+    def one_letter_edits(self, word: str, candidates: set) -> set:
+        """The candidates that are one edit away from the word
+
+        Args:
+         word: the word to correct
+         candidates: vocabulary words to check
+
+        Returns:
+         the candidates the WordSuggestor's one-letter edits would make
+        """
+        return {candidate for candidate in candidates
+                if is_one_edit(word, candidate, self.want_switches)}
+
+    def two_letter_edits(self, word: str, candidates: set) -> set:
+        """The candidates that are two edits away from the word
+
+        Args:
+         word: the word to correct
+         candidates: vocabulary words to check
+
+        Returns:
+         the candidates the WordSuggestor's two-letter edits would make
+        """
+        if not candidates:
+            return set()
+        editor = TheEditor(word)
+        ones = editor.replaced + editor.inserted + editor.deleted
+        if self.want_switches:
+            ones += editor.switched
+        ones = set(ones)
+        return {candidate for candidate in candidates
+                if any(abs(len(one) - len(candidate)) < 2
+                       and is_one_edit(one, candidate, self.want_switches)
+                       for one in ones)}
+
+    def candidates(self, word: str) -> set:
+        """The closest vocabulary words (one edit away or else two)
+
+        Args:
+         word: a word that isn't in the vocabulary
+
+        Returns:
+         the vocabulary words the WordSuggestor would rank
+        """
+        candidates = self.index.candidates(word)
+        suggestions = self.one_letter_edits(word, candidates)
+        if not suggestions:
+            suggestions = self.two_letter_edits(word, candidates)
+        return suggestions
+
+    def __call__(self, word: str) -> list:
+        """Finds the closest words to the word
+
+        If the word is in our corpus then it just returns the word
+
+        Args:
+         word: potential word to correct
+
+        Returns:
+         list of (word, probability) tuples
+        """
+        if word in self.corpus.vocabulary:
+            return [(word, self.corpus.probabilities[word])]
+        suggestions = self.candidates(word)
+        if not suggestions:
+            return [(word, 0)]
+        probabilities = list(reversed(sorted(
+            [(self.corpus.probabilities.get(suggestion, 0), suggestion)
+             for suggestion in suggestions])))
+        return [(word, probability)
+                for (probability, word) in probabilities[:self.suggestions]]
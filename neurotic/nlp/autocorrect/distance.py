@@ -1,9 +1,415 @@
-# pypi
-from tabulate import tabulate
+# python
+from argparse import Namespace
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Sequence
 
+# pypi
 import attr
 import numpy
-import pandas
+
+# pandas and tabulate are only needed to show the table so they get
+# imported when they're used instead of when this module is
+
+Engines = Namespace(
+    python="python",
+    numpy="numpy",
+    numba="numba",
+)
+
+Defaults = Namespace(
+    # the most bytes block_distances' stack of prefix rows can use
+    maximum_bytes=2**26,
+)
+
+
+def codes(string: str) -> numpy.ndarray:
+    """The unicode code points of the string (to compare characters in numpy)"""
+    return numpy.frombuffer(string.encode("utf-32-le"), dtype=numpy.uint32)
+
+
+def fill_table(source: numpy.ndarray, target: numpy.ndarray,
+               insertion_cost: int, deletion_cost: int,
+               replacement_cost: int, table: numpy.ndarray) -> None:
+    """Fills in the edit-distance table one cell at a time
+
+    This is the loop that gets compiled with numba. The first row and column
+    of the table have to be filled in already.
+
+    Args:
+     source: code points for the source string
+     target: code points for the target string
+     insertion_cost: how much inserting a character costs
+     deletion_cost: how much deleting a character costs
+     replacement_cost: how much swapping out a character costs
+     table: the (len(source) + 1 x len(target) + 1) table to fill
+    """
+    for row in range(1, len(source) + 1):
+        for column in range(1, len(target) + 1):
+            replacement = (0 if source[row - 1] == target[column - 1]
+                           else replacement_cost)
+            table[row, column] = min(
+                table[row - 1, column] + deletion_cost,
+                table[row, column - 1] + insertion_cost,
+                table[row - 1, column - 1] + replacement)
+    return
+
+
+def fill_distance(source: numpy.ndarray, target: numpy.ndarray,
+                  insertion_cost: int, deletion_cost: int,
+                  replacement_cost: int) -> int:
+    """Works out the edit distance keeping only two rows of the table
+
+    This is the loop that gets compiled with numba.
+
+    Args:
+     source: code points for the source string
+     target: code points for the target string
+     insertion_cost: how much inserting a character costs
+     deletion_cost: how much deleting a character costs
+     replacement_cost: how much swapping out a character costs
+
+    Returns:
+     the minimum edit distance
+    """
+    previous = numpy.arange(len(target) + 1) * insertion_cost
+    current = numpy.empty_like(previous)
+    for row in range(1, len(source) + 1):
+        current[0] = previous[0] + deletion_cost
+        for column in range(1, len(target) + 1):
+            replacement = (0 if source[row - 1] == target[column - 1]
+                           else replacement_cost)
+            current[column] = min(previous[column] + deletion_cost,
+                                  current[column - 1] + insertion_cost,
+                                  previous[column - 1] + replacement)
+        previous, current = current, previous
+    return previous[-1]
+
+
+# the numba-compiled (fill_table, fill_distance) or False if there's no numba
+_compiled = None
+
+
+def compiled_kernels() -> tuple:
+    """Compiles the fill functions with numba (the first time it's called)
+
+    Returns:
+     (fill_table, fill_distance) compiled or None if numba isn't installed
+    """
+    global _compiled
+    if _compiled is None:
+        try:
+            import numba
+            _compiled = (numba.njit(fill_table), numba.njit(fill_distance))
+        except ImportError:
+            _compiled = False
+    return _compiled or None
+
+
+def next_row(previous: numpy.ndarray, first: int, matches: numpy.ndarray,
+             insertion_cost: int, deletion_cost: int, replacement_cost: int,
+             steps: numpy.ndarray) -> numpy.ndarray:
+    """Works out one row of the edit-distance table with numpy
+
+    The insertions are a chain along the row (each cell depends on the one
+    to its left) which unrolls to
+    =row[c] = min over j <= c of (best[j] + (c - j) * insertion_cost)=
+    so it becomes a running minimum instead of a loop.
+
+    Args:
+     previous: the row above
+     first: the value for the first column of this row
+     matches: whether the row's source character matches each target character
+     insertion_cost: how much inserting a character costs
+     deletion_cost: how much deleting a character costs
+     replacement_cost: how much swapping out a character costs
+     steps: =arange(len(previous)) * insertion_cost=
+
+    Returns:
+     the new row
+    """
+    best = numpy.empty_like(previous)
+    best[0] = first
+    best[1:] = numpy.minimum(
+        previous[1:] + deletion_cost,
+        previous[:-1] + numpy.where(matches, 0, replacement_cost))
+    return numpy.minimum.accumulate(best - steps) + steps
+
+
+def check_engine(engine: str) -> None:
+    """Makes sure the engine is one the array functions can use
+
+    Args:
+     engine: the engine to check
+
+    Raises:
+     ValueError: the engine isn't numpy or numba
+    """
+    if engine not in (Engines.numpy, Engines.numba):
+        raise ValueError(f"Unknown engine: {engine}")
+    return
+
+
+def distance_table(source: str, target: str, insertion_cost: int=1,
+                   deletion_cost: int=1, replacement_cost: int=2,
+                   engine: str=Engines.numpy) -> numpy.ndarray:
+    """Builds the full edit-distance table without a python double loop
+
+    Args:
+     source: the starting string
+     target: what to transform the source to
+     insertion_cost: how much inserting a character costs
+     deletion_cost: how much deleting a character costs
+     replacement_cost: how much swapping out a character costs
+     engine: 'numba' (uses numpy if numba isn't installed) or 'numpy'
+
+    Returns:
+     the same table MinimumEdits.distance_table builds
+
+    Raises:
+     ValueError: the engine isn't numpy or numba
+    """
+    check_engine(engine)
+    table = numpy.empty((len(source) + 1, len(target) + 1), dtype=int)
+    table[0] = numpy.arange(len(target) + 1) * insertion_cost
+    table[:, 0] = numpy.arange(len(source) + 1) * deletion_cost
+    source, target = codes(source), codes(target)
+    kernels = compiled_kernels() if engine == Engines.numba else None
+    if kernels is not None:
+        kernels[0](source, target, insertion_cost, deletion_cost,
+                   replacement_cost, table)
+        return table
+    steps = table[0]
+    for row in range(1, len(source) + 1):
+        table[row] = next_row(table[row - 1], table[row, 0],
+                              target == source[row - 1],
+                              insertion_cost, deletion_cost,
+                              replacement_cost, steps)
+    return table
+
+
+def edit_distance(source: str, target: str, insertion_cost: int=1,
+                  deletion_cost: int=1, replacement_cost: int=2,
+                  engine: str=Engines.numpy) -> int:
+    """The minimum edit distance using only two rows of the table
+
+    Args:
+     source: the starting string
+     target: what to transform the source to
+     insertion_cost: how much inserting a character costs
+     deletion_cost: how much deleting a character costs
+     replacement_cost: how much swapping out a character costs
+     engine: 'numba' (uses numpy if numba isn't installed) or 'numpy'
+
+    Returns:
+     the bottom-right entry of the distance table
+
+    Raises:
+     ValueError: the engine isn't numpy or numba
+    """
+    check_engine(engine)
+    source, target = codes(source), codes(target)
+    kernels = compiled_kernels() if engine == Engines.numba else None
+    if kernels is not None:
+        return int(kernels[1](source, target, insertion_cost, deletion_cost,
+                              replacement_cost))
+    steps = numpy.arange(len(target) + 1) * insertion_cost
+    row = steps
+    for index, character in enumerate(source, start=1):
+        row = next_row(row, index * deletion_cost, target == character,
+                       insertion_cost, deletion_cost, replacement_cost, steps)
+    return int(row[-1])
+
+
+def block_distances(sources: Sequence[str], targets: Sequence[str],
+                    insertion_cost: int=1, deletion_cost: int=1,
+                    replacement_cost: int=2,
+                    maximum_bytes: int=Defaults.maximum_bytes) -> numpy.ndarray:
+    """Edit distances from each (sorted) source to every target
+
+    The targets are padded into one matrix so each row of the distance
+    table gets worked out for all of them at once. The rows for a source
+    are kept on a stack so the next source only has to add the rows for
+    the characters after the prefix it shares with the one before it (so
+    sorting the sources shares the most rows).
+
+    The stack can hold a row for every character of the longest source
+    and each row has a column for every character of the longest target,
+    so if it would need more than `maximum_bytes` the targets get worked
+    out a few at a time instead.
+
+    Args:
+     sources: the starting strings (sorted)
+     targets: what to transform the sources to
+     insertion_cost: how much inserting a character costs
+     deletion_cost: how much deleting a character costs
+     replacement_cost: how much swapping out a character costs
+     maximum_bytes: the most memory to use for the stack of rows
+
+    Returns:
+     (len(sources) x len(targets)) array of minimum edit distances
+    """
+    lengths = numpy.array([len(target) for target in targets], dtype=int)
+    longest = int(lengths.max(initial=0))
+    deepest = max((len(source) for source in sources), default=0) + 1
+    row_bytes = (longest + 1) * numpy.dtype(numpy.int32).itemsize
+    most_targets = max(1, maximum_bytes // (deepest * row_bytes))
+    if len(targets) > most_targets:
+        return numpy.concatenate(
+            [block_distances(sources, targets[start:start + most_targets],
+                             insertion_cost, deletion_cost, replacement_cost,
+                             maximum_bytes)
+             for start in range(0, len(targets), most_targets)], axis=1)
+    # the padding can't match a character (code points stop at 0x10FFFF)
+    padded = numpy.full((len(targets), longest), -1, dtype=numpy.int32)
+    for index, target in enumerate(targets):
+        padded[index, :len(target)] = codes(target)
+    steps = numpy.arange(longest + 1, dtype=numpy.int32) * insertion_cost
+    rows = [numpy.tile(steps, (len(targets), 1))]
+    ends = numpy.arange(len(targets))
+    distances = numpy.empty((len(sources), len(targets)), dtype=int)
+    previous_source = ""
+    for index, source in enumerate(sources):
+        shared = 0
+        for left, right in zip(source, previous_source):
+            if left != right:
+                break
+            shared += 1
+        del rows[shared + 1:]
+        for row, character in enumerate(source[shared:], start=shared + 1):
+            above = rows[-1]
+            best = numpy.empty_like(above)
+            best[:, 0] = row * deletion_cost
+            best[:, 1:] = numpy.minimum(
+                above[:, 1:] + deletion_cost,
+                above[:, :-1] + numpy.where(padded == ord(character), 0,
+                                            replacement_cost))
+            rows.append(numpy.minimum.accumulate(best - steps, axis=1)
+                        + steps)
+        distances[index] = rows[-1][ends, lengths]
+        previous_source = source
+    return distances
+
+
+def _block_task(block: tuple, insertion_cost: int, deletion_cost: int,
+                replacement_cost: int, maximum_bytes: int) -> numpy.ndarray:
+    """Works out one (sources, targets) block in a worker process"""
+    sources, targets = block
+    return block_distances(sources, targets, insertion_cost, deletion_cost,
+                           replacement_cost, maximum_bytes)
+
+
+def pairwise_distances(sources: Sequence[str], targets: Sequence[str]=None,
+                       workers: int=1, insertion_cost: int=1,
+                       deletion_cost: int=1, replacement_cost: int=2,
+                       block_size: int=1024,
+                       maximum_bytes: int=Defaults.maximum_bytes
+                       ) -> numpy.ndarray:
+    """Edit distances between every source and every target
+
+    The sources are sorted (so neighbors share prefix rows) and cut into
+    blocks along with the targets, the blocks can be spread over a pool of
+    processes.
+
+    Args:
+     sources: the starting strings
+     targets: what to transform the sources to (the sources if not given)
+     workers: number of processes to use (1 means don't use a pool)
+     insertion_cost: how much inserting a character costs
+     deletion_cost: how much deleting a character costs
+     replacement_cost: how much swapping out a character costs
+     block_size: the most sources or targets to put in one block
+     maximum_bytes: the most memory each block's stack of rows can use
+
+    Returns:
+     (len(sources) x len(targets)) array of minimum edit distances
+    """
+    sources = list(sources)
+    targets = sources if targets is None else list(targets)
+    order = sorted(range(len(sources)), key=sources.__getitem__)
+    ordered = [sources[index] for index in order]
+    source_starts = range(0, len(ordered), block_size)
+    target_starts = range(0, len(targets), block_size)
+    blocks = [(ordered[source:source + block_size],
+               targets[target:target + block_size])
+              for source in source_starts for target in target_starts]
+    task = partial(_block_task, insertion_cost=insertion_cost,
+                   deletion_cost=deletion_cost,
+                   replacement_cost=replacement_cost,
+                   maximum_bytes=maximum_bytes)
+    if workers is None or workers <= 1 or len(blocks) < 2:
+        results = map(task, blocks)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(task, blocks))
+
+    distances = numpy.empty((len(sources), len(targets)), dtype=int)
+    rows = numpy.array(order, dtype=int)
+    results = iter(results)
+    for source in source_starts:
+        for target in target_starts:
+            distances[rows[source:source + block_size],
+                      target:target + block_size] = next(results)
+    return distances
+
+
+def bounded_distance(source: str, target: str, limit: int,
+                     insertion_cost: int=1, deletion_cost: int=1,
+                     replacement_cost: int=2) -> int:
+    """The edit distance if it's at most `limit`
+
+    A cell that's d columns off the diagonal costs at least d times the
+    cheaper of inserting or deleting, so only the band of cells within
+    =limit // min(insertion_cost, deletion_cost)= of the diagonal (2k+1 wide
+    with unit costs) can lead to a distance within the limit. Each row only
+    fills in the band and it quits as soon as a whole row is over the limit.
+
+    Args:
+     source: the starting string
+     target: what to transform the source to
+     limit: the largest distance to care about
+     insertion_cost: how much inserting a character costs
+     deletion_cost: how much deleting a character costs
+     replacement_cost: how much swapping out a character costs
+
+    Returns:
+     the minimum edit distance or None if it's more than the limit
+    """
+    rows, columns = len(source), len(target)
+    cheapest = min(insertion_cost, deletion_cost)
+    width = rows + columns if cheapest <= 0 else limit // cheapest
+    if abs(rows - columns) > width:
+        return None
+    # anything over the limit is the same as limit + 1
+    over = limit + 1
+    previous_low, previous_high = 0, min(columns, width)
+    previous = [min(column * insertion_cost, over)
+                for column in range(previous_high + 1)]
+    for row in range(1, rows + 1):
+        low, high = max(0, row - width), min(columns, row + width)
+        current = []
+        for column in range(low, high + 1):
+            if column == 0:
+                current.append(min(row * deletion_cost, over))
+                continue
+            value = over
+            if column <= previous_high:
+                value = min(value,
+                            previous[column - previous_low] + deletion_cost)
+            if column > low:
+                value = min(value, current[-1] + insertion_cost)
+            if column - 1 >= previous_low:
+                replacement = (0 if source[row - 1] == target[column - 1]
+                               else replacement_cost)
+                value = min(value,
+                            previous[column - 1 - previous_low] + replacement)
+            current.append(min(value, over))
+        if min(current) > limit:
+            return None
+        previous, previous_low, previous_high = current, low, high
+    distance = previous[columns - previous_low]
+    return distance if distance <= limit else None
+
 
 @attr.s(auto_attribs=True)
 class MinimumEdits:
@@ -11,6 +417,18 @@ class MinimumEdits:
 
     Uses the Levenshtein distance
 
+    The engine is how the table gets filled in:
+
+     - python: a python double loop
+     - numpy: a row at a time with numpy
+     - numba: a compiled loop (numpy if numba isn't installed)
+
+    Any other engine raises a ValueError once the table or distance is
+    asked for.
+
+    With the numpy and numba engines asking for the minimum_distance before
+    the distance_table only keeps two rows of the table.
+
     Args:
      source: the starting string
      target: what to transform the source to
@@ -18,6 +436,7 @@ class MinimumEdits:
      deletion_cost: how much deleting a character costs
      replacement_cost: how much swapping out a character costs
      table_format: tabluate table format for printing table
+     engine: how to fill in the table
     """
     source: str
     target: str
@@ -25,10 +444,11 @@ class MinimumEdits:
     deletion_cost: int=1
     replacement_cost: int=2
     table_format: str="orgtbl"
+    engine: str=Engines.python
     _rows: int=None
     _columns: int=None
     _distance_table: numpy.ndarray=None
-    _distance_frame: pandas.DataFrame=None
+    _distance_frame: "pandas.DataFrame"=None
     _minimum_distance: int=None
     _backtrace: list=None
 
@@ -49,6 +469,10 @@ class MinimumEdits:
     @property
     def distance_table(self) -> numpy.ndarray:
         """Table of edit distances"""
+        if self._distance_table is None and self.engine != Engines.python:
+            self._distance_table = distance_table(
+                self.source, self.target, self.insertion_cost,
+                self.deletion_cost, self.replacement_cost, self.engine)
         if self._distance_table is None:
             self._distance_table = numpy.zeros((self.rows + 1, self.columns + 1),
                                                dtype=int)
@@ -78,9 +502,10 @@ class MinimumEdits:
         return self._distance_table
 
     @property
-    def distance_frame(self) -> pandas.DataFrame:
+    def distance_frame(self) -> "pandas.DataFrame":
         """pandas dataframe of the distance table"""
         if self._distance_frame is None:
+            import pandas
             self._distance_frame = pandas.DataFrame(
                 self.distance_table,
                 index= list("#" + self.source),
@@ -92,14 +517,39 @@ class MinimumEdits:
     def minimum_distance(self) -> int:
         """The minimum edit distance from source to target"""
         if self._minimum_distance is None:
-            self._minimum_distance = self.distance_table[
-                self.rows, self.columns]
+            if self._distance_table is None and self.engine != Engines.python:
+                self._minimum_distance = edit_distance(
+                    self.source, self.target, self.insertion_cost,
+                    self.deletion_cost, self.replacement_cost, self.engine)
+            else:
+                self._minimum_distance = self.distance_table[
+                    self.rows, self.columns]
         return self._minimum_distance
 
+    def bounded_distance(self, limit: int) -> int:
+        """The minimum distance if it's at most `limit`
+
+        This only fills in a band of the table around the diagonal and
+        doesn't keep it.
+
+        Args:
+         limit: the largest distance to care about
+
+        Returns:
+         the minimum edit distance or None if it's more than the limit
+        """
+        if self._minimum_distance is not None:
+            return (self._minimum_distance
+                    if self._minimum_distance <= limit else None)
+        return bounded_distance(self.source, self.target, limit,
+                                self.insertion_cost, self.deletion_cost,
+                                self.replacement_cost)
+
     def __str__(self) -> str:
         """tabluate version of distance frame
     
         Returns:
          table formatted string of distance table
         """
+        from tabulate import tabulate
         return tabulate(self.distance_frame, headers="keys", tablefmt=self.table_format)
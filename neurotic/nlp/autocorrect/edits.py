@@ -78,3 +78,45 @@ class TheEditor:
                               for left, right in self.splits
                               for letter in ascii_lowercase]
         return self._inserted
+
+
+def is_one_edit(source: str, target: str, want_switches: bool=True) -> bool:
+    """Checks if the target is one of TheEditor's edits of the source
+
+    This matches the edits the suggestor makes (so letters that get inserted
+    or used as replacements have to be lower-case ascii) without building
+    all of them.
+
+    Args:
+     source: the string to edit
+     target: the string that might be an edit of the source
+     want_switches: also check the =switch= edit
+
+    Returns:
+     True if one replace, insert, delete (or switch) turns source into target
+    """
+    if len(target) == len(source):
+        if target == source:
+            # switching a doubled letter gives back the same word
+            return want_switches and any(
+                left == right for left, right in zip(source, source[1:]))
+        different = [index for index, (left, right) in enumerate(
+            zip(source, target)) if left != right]
+        if len(different) == 1:
+            return target[different[0]] in ascii_lowercase
+        if len(different) == 2 and want_switches:
+            first, second = different
+            return (second == first + 1
+                    and source[first] == target[second]
+                    and source[second] == target[first])
+        return False
+    if len(target) == len(source) + 1:
+        index = next((index for index, (left, right) in enumerate(
+            zip(source, target)) if left != right), len(source))
+        return (target[index] in ascii_lowercase
+                and target[index + 1:] == source[index:])
+    if len(target) == len(source) - 1:
+        index = next((index for index, (left, right) in enumerate(
+            zip(source, target)) if left != right), len(target))
+        return source[index + 1:] == target[index:]
+    return False
@@ -1,6 +1,10 @@
 # python
+from argparse import Namespace
 from collections import Counter
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Iterable, Iterator, Union
 
 import math
 import os
@@ -9,20 +13,125 @@ import re
 # pypi
 import attr
 
+WORD = re.compile(r"\w+")
+
+Defaults = Namespace(
+    chunk_size=2**20,
+)
+
+
+def count_words(path: Union[Path, str],
+                chunk_size: int=Defaults.chunk_size) -> Counter:
+    """Counts the lower-cased words in a file without keeping them
+
+    The file is read `chunk_size` characters at a time. A word that runs
+    up to the end of a chunk is held back and joined to the next chunk in
+    case it was cut in half.
+
+    Args:
+     path: the text file to count
+     chunk_size: number of characters to read at a time
+
+    Returns:
+     word-frequency counter
+    """
+    counts = Counter()
+    carry = ""
+    with Path(path).open() as reader:
+        for chunk in iter(lambda: reader.read(chunk_size), ""):
+            text = carry + chunk
+            words = WORD.findall(text)
+            carry = words.pop() if words and WORD.match(text[-1]) else ""
+            counts.update(word.lower() for word in words)
+    if carry:
+        counts[carry.lower()] += 1
+    return counts
+
+
+class CountProbabilities(Mapping):
+    """Word probabilities worked out from the counts when asked for
+
+    Args:
+     counts: the word-frequency counter
+    """
+    def __init__(self, counts: Counter) -> None:
+        self.counts = counts
+        self.total = sum(counts.values())
+        return
+
+    def __getitem__(self, word: str) -> float:
+        if word not in self.counts:
+            raise KeyError(word)
+        return self.counts[word]/self.total
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.counts)
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
 
 @attr.s(auto_attribs=True)
 class CorpusBuilder:
     """Builds the autocorrect corpus counts
 
+    If `streaming` is set the counts are made by reading the file in chunks
+    without keeping a list of the words, and the vocabulary and
+    probabilities come from the counts.
+
     Args:
      path: Path to the corpus source file
+     streaming: count the words without building the word list
+     chunk_size: characters to read at a time when streaming
     """
     path: Path
+    streaming: bool=False
+    chunk_size: int=Defaults.chunk_size
     _words: list=None
     _counts: Counter=None
     _probabilities: dict=None
     _vocabulary: set=None
 
+    @classmethod
+    def from_shards(cls, paths: Iterable[Union[Path, str]], workers: int=1,
+                    chunk_size: int=Defaults.chunk_size) -> "CorpusBuilder":
+        """Counts several files (possibly in parallel) as one corpus
+
+        Args:
+         paths: the corpus source files
+         workers: number of processes to use (1 means don't use a pool)
+         chunk_size: characters to read at a time
+
+        Returns:
+         streaming CorpusBuilder with the combined counts
+        """
+        paths = [Path(path) for path in paths]
+        chunk_sizes = [chunk_size] * len(paths)
+        counts = Counter()
+        if workers is None or workers <= 1:
+            for shard in map(count_words, paths, chunk_sizes):
+                counts.update(shard)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for shard in pool.map(count_words, paths, chunk_sizes):
+                    counts.update(shard)
+        return cls(path=None, streaming=True, chunk_size=chunk_size,
+                   counts=counts)
+
+    def merge(self, other: "CorpusBuilder") -> "CorpusBuilder":
+        """Combines the counts of two corpora
+
+        Args:
+         other: the corpus (shard) to add to this one
+
+        Returns:
+         streaming CorpusBuilder with the counts of both
+        """
+        counts = Counter(self.counts)
+        counts.update(other.counts)
+        return CorpusBuilder(path=None, streaming=True,
+                             chunk_size=self.chunk_size, counts=counts)
+
     @property
     def words(self) -> list:
         """
@@ -45,7 +154,10 @@ class CorpusBuilder:
          word: word-frequency counter
         """
         if self._counts is None:
-            self._counts = Counter(self.words)
+            if self.streaming:
+                self._counts = count_words(self.path, self.chunk_size)
+            else:
+                self._counts = Counter(self.words)
         return self._counts
 
     @property
@@ -56,14 +168,20 @@ class CorpusBuilder:
          word:probability dictionary
         """
         if self._probabilities is None:
-            total = sum(self.counts.values())
-            self._probabilities = {word: self.counts[word]/total
-                                   for word in self.counts}
+            if self.streaming:
+                self._probabilities = CountProbabilities(self.counts)
+            else:
+                total = sum(self.counts.values())
+                self._probabilities = {word: self.counts[word]/total
+                                       for word in self.counts}
         return self._probabilities
 
     @property
     def vocabulary(self) -> set:
         """The set of vocabulary words"""
         if self._vocabulary is None:
-            self._vocabulary = set(self.words)
+            if self.streaming:
+                self._vocabulary = set(self.counts)
+            else:
+                self._vocabulary = set(self.words)
         return self._vocabulary
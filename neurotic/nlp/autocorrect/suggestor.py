@@ -1,22 +1,107 @@
+# python
+from argparse import Namespace
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable
+
+import re
+
 # pypi
 import attr
 
 # this repository
+from neurotic.nlp.autocorrect.deletions import DeletionSuggestor
 from neurotic.nlp.autocorrect.edits import TheEditor
+from neurotic.nlp.autocorrect.trie import VocabularyTrie
+from neurotic.nlp.lru_cache import LRUCache
+
+Engines = Namespace(
+    edits="edits",
+    deletions="deletions",
+    trie="trie",
+)
 
 
 @attr.s(auto_attribs=True)
 class WordSuggestor:
     """Suggests Words for Autocorrection
 
+    The engine is how the candidate words get found:
+
+     - edits: make every one (and then two) letter edit of the word
+     - deletions: look the word up in an index of the vocabulary's deletes
+       (same suggestions as edits)
+     - trie: walk a trie of the vocabulary to find the words with the
+       smallest edit distance (up to `distance` edits)
+
+    The trie's distance only switches letters that were next to each other
+    in the word and aren't edited again (the restricted, or optimal string
+    alignment, distance) but the edits engine can switch letters that one
+    of its edits brought together. So with switches the trie can miss words
+    the other engines find - 'cabgb' is two edits from 'adcbgb' for the
+    edits engine (delete the 'd' then switch 'ac') but three for the trie.
+
     Args:
      corpus: a Corpus Builder object
      suggestions: number of suggestions to return for each word
      want_switches: also do the =switch= edit
+     engine: how to find the candidates
+     distance: the most edits away a candidate can be (trie engine only)
+     cache: where correct_many keeps its suggestions (pass one in to share
+       it between suggestors)
     """
     corpus: object
     suggestions: int=2
     want_switches: bool=True
+    engine: str=Engines.edits
+    distance: int=2
+    _deletions: DeletionSuggestor=None
+    _trie: VocabularyTrie=None
+    _cache: LRUCache=attr.ib(factory=LRUCache)
+
+    @property
+    def cache(self) -> LRUCache:
+        """cache_key: suggestions found by correct_many and correct_text
+
+        The keys include the settings so changing them (or sharing the
+        cache with a differently-configured suggestor) doesn't return
+        suggestions made with the old ones.
+        """
+        return self._cache
+
+    @property
+    def deletions(self) -> DeletionSuggestor:
+        """The deletion-index suggestor for the corpus
+
+        It's rebuilt (keeping the index) if the settings have changed
+        since it was made.
+        """
+        if (self._deletions is None
+                or self._deletions.suggestions != self.suggestions
+                or self._deletions.want_switches != self.want_switches):
+            index = None if self._deletions is None else self._deletions._index
+            self._deletions = DeletionSuggestor(
+                self.corpus, suggestions=self.suggestions,
+                want_switches=self.want_switches, index=index)
+        return self._deletions
+
+    def cache_key(self, word: str) -> tuple:
+        """The key for the word's suggestions with the current settings
+
+        Args:
+         word: the word being corrected
+
+        Returns:
+         tuple of the word and the settings that change its suggestions
+        """
+        return (word, self.suggestions, self.want_switches, self.engine,
+                self.distance)
+
+    @property
+    def trie(self) -> VocabularyTrie:
+        """The trie of the corpus vocabulary"""
+        if self._trie is None:
+            self._trie = VocabularyTrie(self.corpus.vocabulary)
+        return self._trie
 
     def one_letter_edits(self, word: str) -> set:
         """Get all possible words one edit away from the original
@@ -45,6 +130,26 @@ class WordSuggestor:
         ones = self.one_letter_edits(word)
         return set.union(*(self.one_letter_edits(one) for one in ones))
 
+    def candidates(self, word: str) -> set:
+        """Finds the vocabulary words to rank for a word
+    
+        Args:
+         word: a word that isn't in the vocabulary
+    
+        Returns:
+         set of the closest vocabulary words found by the engine
+        """
+        if self.engine == Engines.deletions:
+            return self.deletions.candidates(word)
+        if self.engine == Engines.trie:
+            return self.trie.nearest(word, self.distance, self.want_switches)
+        if self.engine != Engines.edits:
+            raise ValueError(f"Unknown engine: {self.engine}")
+        suggestions = self.corpus.vocabulary.intersection(self.one_letter_edits(word))
+        if not suggestions:
+            suggestions = self.corpus.vocabulary.intersection(self.two_letter_edits(word))
+        return suggestions
+
     def __call__(self, word: str) -> list:
         """Finds the closest words to the word
     
@@ -59,9 +164,7 @@ class WordSuggestor:
         if word in self.corpus.vocabulary:
             best = [(word, self.corpus.probabilities[word])]
         else:
-            suggestions = self.corpus.vocabulary.intersection(self.one_letter_edits(word))
-            if not suggestions:
-                suggestions = self.corpus.vocabulary.intersection(self.two_letter_edits(word))
+            suggestions = self.candidates(word)
             if suggestions:
                 probabilities = list(reversed(sorted(
                     [(self.corpus.probabilities.get(suggestion, 0), suggestion)
@@ -72,3 +175,88 @@ class WordSuggestor:
             else:
                 best = [(word, 0)]
         return best
+
+    def correct_many(self, words: Iterable[str], workers: int=1,
+                     chunksize: int=None) -> list:
+        """Finds the closest words for a batch of words
+
+        Each different word only gets looked up once, and only if its
+        suggestions aren't already in the cache.
+
+        Args:
+         words: potential words to correct
+         workers: number of processes to use (1 means don't use a pool)
+         chunksize: words to send to a worker at a time (default splits
+           the words into four chunks per worker)
+
+        Returns:
+         list of (word, probability) lists in the same order as the words
+        """
+        words = list(words)
+        found = {}
+        missing = []
+        for word in dict.fromkeys(words):
+            best = self.cache.get(self.cache_key(word))
+            if best is None:
+                missing.append(word)
+            else:
+                found[word] = best
+
+        if workers is None or workers <= 1 or len(missing) < 2:
+            corrected = [self(word) for word in missing]
+        else:
+            if chunksize is None:
+                chunksize = max(1, len(missing) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers,
+                                     initializer=_set_worker_suggestor,
+                                     initargs=(self,)) as pool:
+                corrected = list(pool.map(_suggest_with_worker, missing,
+                                          chunksize=chunksize))
+
+        for word, best in zip(missing, corrected):
+            best = tuple(best)
+            self.cache[self.cache_key(word)] = best
+            found[word] = best
+        return [list(found[word]) for word in words]
+
+    def correct_text(self, document: str, workers: int=1) -> str:
+        """Replaces the words in the document with their best suggestion
+
+        The words are found (and lower-cased) the same way the
+        CorpusBuilder finds them, words that are in the vocabulary or that
+        have no suggestions are left as they are.
+
+        Args:
+         document: the text to correct
+         workers: number of processes to use (1 means don't use a pool)
+
+        Returns:
+         the document with the misspelled words replaced
+        """
+        words = [word.lower() for word in re.findall(r"\w+", document)]
+        unknown = [word for word in words if word not in self.corpus.vocabulary]
+        best = dict(zip(unknown, self.correct_many(unknown, workers=workers)))
+
+        def substitute(match: re.Match) -> str:
+            word = match.group().lower()
+            if word not in best:
+                return match.group()
+            correction, probability = best[word][0]
+            return correction if probability else match.group()
+        return re.sub(r"\w+", substitute, document)
+
+
+# the suggestor for each process in a correct_many pool
+_worker_suggestor = None
+
+
+def _set_worker_suggestor(suggestor: WordSuggestor) -> None:
+    """Stores the suggestor for this worker process"""
+    global _worker_suggestor
+    _worker_suggestor = suggestor
+    return
+
+
+def _suggest_with_worker(word: str) -> list:
+    """Finds the suggestions with this worker process' suggestor"""
+    return _worker_suggestor(word)
@@ -0,0 +1,105 @@
+# python
+from typing import Iterable
+
+# pypi
+import attr
+
+# the key for the word stored at the node where it ends (letters are never
+# None so it can't clash with a child)
+END = None
+
+
+@attr.s(auto_attribs=True)
+class VocabularyTrie:
+    """A letter-trie of the vocabulary to find the words near a word
+
+    Walking the trie fills in one row of the edit-distance table per letter
+    so words that share a prefix share those rows, and a branch is dropped
+    as soon as every entry in its row is more than the distance, so only
+    words that are in the vocabulary ever get looked at.
+
+    Args:
+     vocabulary: the words to put in the trie
+    """
+    vocabulary: Iterable[str]
+    _root: dict=None
+
+    @property
+    def root(self) -> dict:
+        """The top of the trie (nested dicts of letter: node)"""
+        if self._root is None:
+            self._root = {}
+            for word in self.vocabulary:
+                node = self._root
+                for letter in word:
+                    node = node.setdefault(letter, {})
+                node[END] = word
+        return self._root
+
+    def within(self, word: str, distance: int=2,
+               want_switches: bool=True) -> dict:
+        """Finds the vocabulary words within `distance` edits of the word
+
+        Each insertion, deletion or replacement of a letter (and switch of
+        two neighboring letters if wanted) counts as one edit. A switched
+        pair of letters can't be edited again (this is the restricted
+        distance, see the WordSuggestor).
+
+        Args:
+         word: the string to find words near
+         distance: the most edits away a word can be
+         want_switches: count a switch as one edit instead of two
+
+        Returns:
+         word: edit-distance dict of the vocabulary words found
+        """
+        found = {}
+        first = list(range(len(word) + 1))
+        if END in self.root and first[-1] <= distance:
+            found[self.root[END]] = first[-1]
+        stack = [(child, letter, first, None, None)
+                 for letter, child in self.root.items() if letter is not END]
+        while stack:
+            node, letter, previous, before_previous, previous_letter = stack.pop()
+            row = [previous[0] + 1]
+            for column in range(1, len(first)):
+                row.append(min(row[column - 1] + 1,
+                               previous[column] + 1,
+                               previous[column - 1]
+                               + (word[column - 1] != letter)))
+                if (want_switches and before_previous is not None
+                        and column > 1
+                        and word[column - 1] == previous_letter
+                        and word[column - 2] == letter):
+                    row[column] = min(row[column],
+                                      before_previous[column - 2] + 1)
+            if END in node and row[-1] <= distance:
+                found[node[END]] = row[-1]
+            if min(row) <= distance:
+                stack.extend((child, next_letter, row, previous, letter)
+                             for next_letter, child in node.items()
+                             if next_letter is not END)
+        return found
+
+    def nearest(self, word: str, distance: int=2,
+                want_switches: bool=True) -> set:
+        """The vocabulary words with the smallest edit distance to the word
+
+        Args:
+         word: the string to find words near
+         distance: the most edits away a word can be
+         want_switches: count a switch as one edit instead of two
+
+        Returns:
+         the closest words (other than the word itself) or an empty set
+        """
+        # most words have something close by so widening the search one edit
+        # at a time is cheaper than searching out to the full distance
+        for edits in range(1, distance + 1):
+            found = self.within(word, edits, want_switches)
+            found.pop(word, None)
+            if found:
+                closest = min(found.values())
+                return {candidate for candidate in found
+                        if found[candidate] == closest}
+        return set()
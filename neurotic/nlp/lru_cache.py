@@ -0,0 +1,99 @@
+# python
+from argparse import Namespace
+from collections import OrderedDict
+from typing import Hashable, Iterable
+
+import threading
+
+# pypi
+import attr
+
+Defaults = Namespace(
+    maximum=2**16,
+)
+
+
+@attr.s(auto_attribs=True)
+class LRUCache:
+    """A thread-safe least-recently-used cache
+
+    None can't be cached since =get= uses it to mean the key is missing.
+
+    Args:
+     maximum: the most values to keep before evicting the least recently used
+    """
+    maximum: int = Defaults.maximum
+    hits: int = 0
+    misses: int = 0
+    _values: OrderedDict = attr.ib(factory=OrderedDict)
+    _lock: threading.Lock = attr.ib(factory=threading.Lock)
+
+    def get(self, key: Hashable):
+        """Gets a cached value (and counts the hit or miss)
+
+        Args:
+         key: the key for the value
+
+        Returns:
+         the value or None if it isn't cached
+        """
+        with self._lock:
+            value = self._values.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._values.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value) -> None:
+        with self._lock:
+            self._values[key] = value
+            self._values.move_to_end(key)
+            if len(self._values) > self.maximum:
+                self._values.popitem(last=False)
+        return
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._values
+
+    def items(self) -> list:
+        """The (key, value) pairs from the oldest to the most recently used"""
+        with self._lock:
+            return list(self._values.items())
+
+    def update(self, items: Iterable[tuple]) -> None:
+        """Adds (key, value) pairs as if they were used in that order
+
+        Args:
+         items: the pairs to add
+        """
+        with self._lock:
+            for key, value in items:
+                self._values[key] = value
+                self._values.move_to_end(key)
+            while len(self._values) > self.maximum:
+                self._values.popitem(last=False)
+        return
+
+    def __getstate__(self) -> dict:
+        """Drops the lock so the cache can be pickled (for process pools)"""
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restores the pickled cache with a new lock"""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        return
+
+    def clear(self) -> None:
+        """Empties the cache and resets the counters"""
+        with self._lock:
+            self._values.clear()
+            self.hits = self.misses = 0
+        return
@@ -0,0 +1,216 @@
+# python
+from argparse import Namespace
+
+import multiprocessing
+import pickle
+import queue
+import random
+import threading
+import time
+
+# pypi
+import attr
+import numpy
+
+Backends = Namespace(
+    thread="thread",
+    process="process",
+)
+
+Items = Namespace(
+    batch="batch",
+    done="done",
+    error="error",
+)
+
+Defaults = Namespace(
+    depth=2,
+    put_timeout=0.1,
+    get_timeout=0.1,
+    join_timeout=1,
+)
+
+
+class WorkerError(Exception):
+    """Raised when the background worker stops without finishing"""
+
+
+def produce(generator, batches, stop, seed: int=None) -> None:
+    """Puts the generator's batches on the queue until it's done or stopped
+
+    Args:
+     generator: the batch generator
+     batches: the queue to put the batches on
+     stop: event to tell this to quit early
+     seed: seed for python's and numpy's random number generators
+    """
+    if seed is not None:
+        random.seed(seed)
+        numpy.random.seed(seed)
+    try:
+        for batch in generator:
+            while not stop.is_set():
+                try:
+                    batches.put((Items.batch, batch),
+                                timeout=Defaults.put_timeout)
+                    break
+                except queue.Full:
+                    continue
+            if stop.is_set():
+                return
+        batches.put((Items.done, None))
+    except Exception as error:
+        # a process queue pickles in the background where a failure would
+        # be lost, so an error that can't be pickled is sent as its repr
+        if not isinstance(batches, queue.Queue):
+            try:
+                pickle.dumps(error)
+            except Exception:
+                error = WorkerError(repr(error))
+        batches.put((Items.error, error))
+    return
+
+
+@attr.s(auto_attribs=True)
+class Prefetcher:
+    """Builds a generator's batches in the background
+
+    This wraps batch generators (e.g. the twitter TensorGenerator or the
+    DataGenerators) so the next batches get built while the training loop
+    is working on the current one. The batches come out in the same order
+    the generator makes them. With the process backend the generator is
+    copied to the new process, seeded there, and nothing else touches its
+    random state, so the batches are the same for the same seed. The
+    thread backend shares python's and numpy's random number generators
+    with the training loop so it leaves the seeding to the caller.
+
+    Use it in a =with= block (or call =close=) so the worker stops even if
+    the training loop quits early::
+
+        with Prefetcher(generator) as batches:
+            for inputs, targets, weights in batches:
+                ...
+
+    Args:
+     generator: the batch generator to wrap
+     depth: the most batches to build ahead of the training loop
+     backend: 'thread' or 'process'
+     seed: seed for the random number generators in the producer process
+       (not used by the thread backend)
+    """
+    generator: object
+    depth: int=Defaults.depth
+    backend: str=Backends.thread
+    seed: int=None
+    batches: int=0
+    stalls: int=0
+    stall_seconds: float=0
+    _started: float=None
+    _finished: bool=False
+    _queue: object=None
+    _stop: object=None
+    _worker: object=None
+
+    def start(self) -> None:
+        """Starts building batches in the background"""
+        if self.backend == Backends.thread:
+            self._queue = queue.Queue(maxsize=self.depth)
+            self._stop = threading.Event()
+            worker = threading.Thread
+            # re-seeding the global generators from a thread would reset the
+            # training loop's random state too
+            seed = None
+        elif self.backend == Backends.process:
+            self._queue = multiprocessing.Queue(maxsize=self.depth)
+            self._stop = multiprocessing.Event()
+            worker = multiprocessing.Process
+            seed = self.seed
+        else:
+            raise ValueError(f"Unknown backend: {self.backend}")
+        self._worker = worker(target=produce,
+                              args=(self.generator, self._queue, self._stop,
+                                    seed),
+                              daemon=True)
+        self._worker.start()
+        self._started = time.perf_counter()
+        return
+
+    def close(self) -> None:
+        """Stops the background worker"""
+        if self._worker is not None:
+            self._stop.set()
+            self._worker.join(timeout=Defaults.join_timeout)
+            if self.backend == Backends.process and self._worker.is_alive():
+                # a process can't exit while batches it queued are unread
+                self._worker.terminate()
+            self._worker = None
+        return
+
+    def __enter__(self) -> "Prefetcher":
+        self.start()
+        return self
+
+    def __exit__(self, *exception) -> None:
+        self.close()
+        return
+
+    def wait(self) -> tuple:
+        """Waits for the next item from the worker
+
+        Returns:
+         (kind, item) tuple from the queue
+
+        Raises:
+         WorkerError: the worker stopped (e.g. the process was killed)
+           without saying it was done
+        """
+        while True:
+            try:
+                return self._queue.get(timeout=Defaults.get_timeout)
+            except queue.Empty:
+                if self._worker.is_alive():
+                    continue
+            # it might have put its last item just before it stopped
+            try:
+                return self._queue.get_nowait()
+            except queue.Empty:
+                self._finished = True
+                self.close()
+                raise WorkerError("The batch worker stopped without finishing")
+
+    @property
+    def stall_fraction(self) -> float:
+        """Fraction of the time since starting spent waiting for batches
+
+        If this is near 1 the input pipeline is the bottleneck, if it is near 0
+        the training is.
+        """
+        if self._started is None:
+            return 0
+        return self.stall_seconds/(time.perf_counter() - self._started)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._finished:
+            raise StopIteration
+        if self._worker is None:
+            self.start()
+        try:
+            kind, item = self._queue.get_nowait()
+        except queue.Empty:
+            self.stalls += 1
+            waiting = time.perf_counter()
+            kind, item = self.wait()
+            self.stall_seconds += time.perf_counter() - waiting
+        if kind == Items.error:
+            self._finished = True
+            self.close()
+            raise item
+        if kind == Items.done:
+            self._finished = True
+            self.close()
+            raise StopIteration
+        self.batches += 1
+        return item
@@ -1,15 +1,217 @@
 # A Word Counter
 
 # from python
+from array import array
 from collections import Counter
 import typing
 
 # from pypi
+from scipy import sparse
+
 import attr
+import numpy
 
 # this project
 from .processor import TwitterProcessor
 
+Classes = 2
+
+# tweets to hold before adding them to a CountMatrix in WordCounter.update
+UPDATE_BATCH = 1024
+
+
+@attr.s(auto_attribs=True)
+class CountMatrix:
+    """Word-sentiment counts stored as an array
+
+    This can stand in for the (word, label) Counter - =counts[(word, label)]=
+    works the same - but the counts are held in one integer array so
+    summing the counts for a tweet is array indexing.
+
+    Args:
+     vocabulary: map of word to its row in the counts
+     counts: (vocabulary size x number of labels) array of counts
+    """
+    vocabulary: dict
+    counts: numpy.ndarray
+    _storage: numpy.ndarray = None
+
+    @classmethod
+    def from_counter(cls, counter: Counter,
+                     classes: int=Classes) -> "CountMatrix":
+        """Builds the matrix from a (word, label) Counter
+
+        Args:
+         counter: the word-sentiment counts
+         classes: the number of labels (the labels have to be 0...classes - 1)
+
+        Returns:
+         matrix with the same counts
+        """
+        vocabulary = {}
+        for word, label in counter:
+            vocabulary.setdefault(word, len(vocabulary))
+        counts = numpy.zeros((len(vocabulary), classes), dtype=numpy.int64)
+        for (word, label), count in counter.items():
+            counts[vocabulary[word], int(label)] = count
+        return cls(vocabulary, counts)
+
+    @classmethod
+    def from_tweets(cls, tweets: typing.Iterable[list],
+                    labels: typing.Iterable[int],
+                    classes: int=Classes) -> "CountMatrix":
+        """Counts the processed tweets without building a Counter
+
+        Args:
+         tweets: iterable of processed (tokenized) tweets
+         labels: the label for each tweet
+         classes: the number of labels (the labels have to be 0...classes - 1)
+
+        Returns:
+         matrix of the counts
+        """
+        vocabulary = {}
+        cells = array("q")
+        for tokens, label in zip(tweets, labels):
+            label = int(label)
+            for token in tokens:
+                row = vocabulary.setdefault(token, len(vocabulary))
+                cells.append(row * classes + label)
+        counts = numpy.bincount(numpy.frombuffer(cells, dtype=numpy.int64),
+                                minlength=len(vocabulary) * classes)
+        return cls(vocabulary, counts.reshape((-1, classes)))
+
+    def update(self, tweets: typing.Iterable[list],
+               labels: typing.Iterable[int]) -> None:
+        """Adds the counts for more processed tweets in place
+
+        New words are added to the end of the vocabulary. The rows are kept
+        in a buffer that doubles when it runs out of room, so repeated updates
+        don't copy the whole array each time.
+
+        Args:
+         tweets: iterable of processed (tokenized) tweets
+         labels: the label for each tweet
+        """
+        self.add(zip(tweets, labels))
+        return
+
+    def add(self, labeled: typing.Iterable[tuple]) -> None:
+        """Adds the counts for (processed tweet, label) pairs in place
+
+        Args:
+         labeled: iterable of (tokens, label) pairs
+        """
+        vocabulary = self.vocabulary
+        classes = self.counts.shape[1]
+        cells = array("q")
+        for tokens, label in labeled:
+            label = int(label)
+            for token in tokens:
+                row = vocabulary.setdefault(token, len(vocabulary))
+                cells.append(row * classes + label)
+        rows = len(vocabulary)
+        storage = self.counts if self._storage is None else self._storage
+        if rows > len(storage):
+            grown = numpy.zeros((max(rows, 2 * len(storage)), classes),
+                                dtype=self.counts.dtype)
+            grown[:len(self.counts)] = self.counts
+            storage = grown
+        self._storage = storage
+        self.counts = storage[:rows]
+        numpy.add.at(self.counts.reshape(-1),
+                     numpy.frombuffer(cells, dtype=numpy.int64), 1)
+        return
+
+    @property
+    def words(self) -> list:
+        """The vocabulary in row order"""
+        return list(self.vocabulary)
+
+    @property
+    def totals(self) -> numpy.ndarray:
+        """The count of all the words for each label"""
+        return self.counts.sum(axis=0)
+
+    def ids(self, tokens: typing.Iterable[str]) -> numpy.ndarray:
+        """Rows for the tokens (tokens not in the vocabulary are dropped)
+
+        Args:
+         tokens: the words to look up
+
+        Returns:
+         array of row indices
+        """
+        get = self.vocabulary.get
+        rows = [get(token) for token in tokens]
+        return numpy.array([row for row in rows if row is not None],
+                           dtype=numpy.int64)
+
+    def document_term_matrix(self, tweets: typing.Iterable[list]
+                             ) -> sparse.csr_matrix:
+        """Builds the (tweets x vocabulary) sparse matrix of token counts
+
+        Tokens that aren't in the vocabulary are left out.
+
+        Args:
+         tweets: processed tweets
+
+        Returns:
+         sparse matrix with the count of each token in each tweet
+        """
+        vocabulary = self.vocabulary
+        columns, row_starts = [], [0]
+        for tokens in tweets:
+            columns.extend(vocabulary[token] for token in tokens
+                           if token in vocabulary)
+            row_starts.append(len(columns))
+        columns = numpy.array(columns, dtype=numpy.int64)
+        return sparse.csr_matrix(
+            (numpy.ones(len(columns), dtype=numpy.int64), columns,
+             numpy.array(row_starts, dtype=numpy.int64)),
+            shape=(len(row_starts) - 1, len(vocabulary)))
+
+    def token_counts(self, tokens: typing.Iterable[str]) -> numpy.ndarray:
+        """Sum of the counts for the tokens
+
+        Args:
+         tokens: the words to add up
+
+        Returns:
+         array with the sum of the counts for each label
+        """
+        return self.counts[self.ids(tokens)].sum(axis=0)
+
+    def __getitem__(self, key: tuple) -> int:
+        word, label = key
+        row = self.vocabulary.get(word)
+        return 0 if row is None else int(self.counts[row, int(label)])
+
+    def get(self, key: tuple, default: int=0) -> int:
+        word, label = key
+        return self[key] if word in self.vocabulary else default
+
+    def keys(self) -> typing.Iterator[tuple]:
+        """The (word, label) pairs with counts (like the Counter's keys)"""
+        words = self.words
+        for row, label in zip(*self.counts.nonzero()):
+            yield words[row], int(label)
+        return
+
+    def items(self) -> typing.Iterator[tuple]:
+        """((word, label), count) pairs like the Counter's items"""
+        words = self.words
+        for row, label in zip(*self.counts.nonzero()):
+            yield (words[row], int(label)), int(self.counts[row, label])
+        return
+
+    def __iter__(self) -> typing.Iterator[tuple]:
+        return self.keys()
+
+    def __len__(self) -> int:
+        return int(numpy.count_nonzero(self.counts))
+
+
 @attr.s(auto_attribs=True)
 class WordCounter:
     """A word-sentiment counter
@@ -17,12 +219,15 @@ class WordCounter:
     Args:
      tweets: list of unprocessed tweets
      labels: list of 1's (positive) and 0's that identifies sentiment for each tweet
+     workers: number of processes to use to process the tweets
     """
     tweets: typing.List[str]
     labels: typing.List[int]
+    workers: int = 1
     _process: TwitterProcessor = None
     _processed: list = None
     _counts: Counter = None
+    _matrix: CountMatrix = None
 
     @property
     def process(self) -> TwitterProcessor:
@@ -35,16 +240,26 @@ class WordCounter:
     def processed(self) -> list:
         """The processed and tokenized tweets"""
         if self._processed is None:
-            self._processed = [self.process(tweet) for tweet in self.tweets]
+            if self.workers > 1:
+                self._processed = self.process.process_many(
+                    self.tweets, workers=self.workers)
+            else:
+                self._processed = [self.process(tweet) for tweet in self.tweets]
         return self._processed
 
     @property
     def counts(self) -> Counter:
         """Processes the tweets and labels
 
+        If the CountMatrix was built first the Counter is copied from it
+        since the matrix might have counted tweets (see =update=) that
+        aren't in the tweets.
+
         Returns:
          counts of word-sentiment pairs
         """
+        if self._counts is None and self._matrix is not None:
+            self._counts = Counter(dict(self._matrix.items()))
         if self._counts is None:
             assert len(self.tweets) == len(self.labels), \
                 f"Tweets: {len(self.tweets)}, Labels: {len(self.labels)}"
@@ -53,3 +268,57 @@ class WordCounter:
                 for word in tweet:
                     self._counts[(word, label)] += 1
         return self._counts
+
+    @property
+    def matrix(self) -> CountMatrix:
+        """The counts as a CountMatrix
+
+        If the Counter hasn't been built this counts the processed tweets
+        directly so the Counter is never created.
+        """
+        if self._matrix is None:
+            if self._counts is None:
+                assert len(self.tweets) == len(self.labels), \
+                    f"Tweets: {len(self.tweets)}, Labels: {len(self.labels)}"
+                self._matrix = CountMatrix.from_tweets(self.processed,
+                                                       self.labels)
+            else:
+                self._matrix = CountMatrix.from_counter(self._counts)
+        return self._matrix
+
+    def update(self, tweets: typing.Iterable, labels: typing.Iterable[int],
+               processed: bool=False) -> Counter:
+        """Adds the counts for more tweets without keeping the tweets
+
+        Since nothing is stored but the counts this can be fed from a
+        generator (e.g. a TweetStream) to count more tweets than fit in memory.
+        If only the CountMatrix has been built then only it gets updated
+        (the matrix is then where the =counts= come from).
+
+        Args:
+         tweets: iterable of tweets to count
+         labels: iterable of labels for the tweets (e.g. itertools.repeat(1))
+         processed: whether the tweets are already lists of tokens
+
+        Returns:
+         the updated counts (the CountMatrix if there's no Counter)
+        """
+        counts, matrix = self._counts, self._matrix
+        if counts is None and matrix is None:
+            counts = self.counts
+        labeled = zip(tweets, labels)
+        if not processed:
+            labeled = ((self.process(tweet), label) for tweet, label in labeled)
+        batch = []
+        for tokens, label in labeled:
+            if counts is not None:
+                for word in tokens:
+                    counts[(word, label)] += 1
+            if matrix is not None:
+                batch.append((tokens, label))
+                if len(batch) == UPDATE_BATCH:
+                    matrix.add(batch)
+                    batch = []
+        if batch:
+            matrix.add(batch)
+        return matrix if counts is None else counts
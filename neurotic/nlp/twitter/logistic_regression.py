@@ -1,24 +1,53 @@
+# python
+from argparse import Namespace
+from pathlib import Path
+from typing import Union
+
 # from pypi
+from scipy import optimize
+
 import attr
 import numpy
 
 # this project
 from .counter import WordCounter
+from .persistence import load_model, save_model
 from .sentiment import TweetSentiment
 from .vectorizer import TweetVectorizer
 
+MODEL = "logistic_regression"
+
+Solvers = Namespace(
+    batch="batch",
+    sgd="sgd",
+    lbfgs="lbfgs",
+)
+
+
 @attr.s(auto_attribs=True)
 class LogisticRegression:
     """train and predict tweet sentiment
 
     Args:
-     iterations: number of times to run gradient descent
+     iterations: number of times to run gradient descent (epochs for sgd)
      learning_rate: how fast to change the weights during training
+     solver: 'batch' (full-batch gradient descent), 'sgd' (mini-batch) or 'lbfgs'
+     batch_size: number of tweets in each mini-batch for 'sgd'
+     tolerance: stop once the loss changes by less than this (None to never stop)
+     loss_every: number of steps between calculating the loss
+     seed: seed for shuffling the mini-batches
+     warm_start: start fitting from the current weights instead of zeros
     """
     iterations: int
     learning_rate: float
     _weights: numpy.array = None
     loss: float=None
+    solver: str=Solvers.batch
+    batch_size: int=128
+    tolerance: float=None
+    loss_every: int=100
+    seed: int=None
+    warm_start: bool=False
 
     @property
     def weights(self) -> numpy.array:
@@ -47,6 +76,27 @@ class LogisticRegression:
         """
         return 1/(1 + numpy.exp(-vectors))
 
+    def log_loss(self, x: numpy.ndarray, y: numpy.ndarray) -> float:
+        """The mean loss for the current weights
+
+        Args:
+         x: the tweet vectors
+         y: the positive/negative labels
+        """
+        y_hat = self.sigmoid(x.dot(self.weights))
+        return float(numpy.squeeze(-((y.T.dot(numpy.log(y_hat))) +
+                                     (1 - y.T).dot(numpy.log(1 - y_hat))))/len(x))
+
+    def converged(self, previous: float, loss: float) -> bool:
+        """Checks if the loss has stopped changing
+
+        Args:
+         previous: the last loss calculated (None if there wasn't one)
+         loss: the latest loss
+        """
+        return (self.tolerance is not None and previous is not None
+                and abs(previous - loss) < self.tolerance)
+
     def gradient_descent(self, x: numpy.ndarray, y: numpy.ndarray):
         """Finds the weights for the model
     
@@ -56,21 +106,80 @@ class LogisticRegression:
         """
         assert len(x) == len(y)
         rows = len(x)
-        self.learning_rate /= rows
+        learning_rate = self.learning_rate/rows
+        loss = None
         for iteration in range(self.iterations):
             y_hat = self.sigmoid(x.dot(self.weights))
-            # average loss
-            loss = numpy.squeeze(-((y.T.dot(numpy.log(y_hat))) +
-                                   (1 - y.T).dot(numpy.log(1 - y_hat))))/rows
+            last = iteration == self.iterations - 1
+            if last or iteration % self.loss_every == 0:
+                # average loss
+                previous, loss = loss, numpy.squeeze(
+                    -((y.T.dot(numpy.log(y_hat))) +
+                      (1 - y.T).dot(numpy.log(1 - y_hat))))/rows
+                if self.converged(previous, loss):
+                    break
             gradient = ((y_hat - y).T.dot(x)).sum(axis=0, keepdims=True)
-            self.weights -= self.learning_rate * gradient.T
+            self.weights -= learning_rate * gradient.T
+        return loss
+
+    def stochastic_gradient_descent(self, x: numpy.ndarray, y: numpy.ndarray):
+        """Finds the weights using shuffled mini-batches
+
+        Args:
+         x: the tweet vectors
+         y: the positive/negative labels
+        """
+        assert len(x) == len(y)
+        generator = numpy.random.default_rng(self.seed)
+        loss = None
+        for epoch in range(self.iterations):
+            order = generator.permutation(len(x))
+            for start in range(0, len(x), self.batch_size):
+                batch = order[start:start + self.batch_size]
+                x_batch, y_batch = x[batch], y[batch]
+                y_hat = self.sigmoid(x_batch.dot(self.weights))
+                gradient = (y_hat - y_batch).T.dot(x_batch)
+                self.weights -= (self.learning_rate/len(batch)) * gradient.T
+            if epoch == self.iterations - 1 or epoch % self.loss_every == 0:
+                previous, loss = loss, self.log_loss(x, y)
+                if self.converged(previous, loss):
+                    break
         return loss
 
+    def lbfgs(self, x: numpy.ndarray, y: numpy.ndarray):
+        """Finds the weights with scipy's L-BFGS-B optimizer
+
+        Args:
+         x: the tweet vectors
+         y: the positive/negative labels
+        """
+        assert len(x) == len(y)
+        rows = len(x)
+        targets = y.ravel()
+
+        def loss_and_gradient(weights: numpy.ndarray) -> tuple:
+            z = x.dot(weights)
+            # log(1 + e^z) - yz is the log-loss without overflowing
+            loss = numpy.sum(numpy.logaddexp(0, z) - targets * z)/rows
+            gradient = x.T.dot(self.sigmoid(z) - targets)/rows
+            return loss, gradient
+
+        options = dict(maxiter=self.iterations)
+        if self.tolerance is not None:
+            options["ftol"] = self.tolerance
+        solution = optimize.minimize(loss_and_gradient,
+                                     self.weights.ravel().astype(float),
+                                     jac=True, method="L-BFGS-B",
+                                     options=options)
+        self.weights = solution.x.reshape(self.weights.shape)
+        return solution.fun
+
     def fit(self, x_train: numpy.ndarray, y_train:numpy.ndarray) -> float:
         """fits the weights for the logistic regression
     
         Note:
          as a side effect this also sets counter, loss, and sentimenter attributes
+         and unless =warm_start= is set the weights start over at zeros
     
         Args:
          x_train: the training tweets
@@ -79,10 +188,16 @@ class LogisticRegression:
         Returns:
          The final mean loss (which is also saved as the =.loss= attribute)
         """
+        if not self.warm_start:
+            self._weights = None
         self.counter = WordCounter(x_train, y_train)
-        vectorizer = TweetVectorizer(x_train, self.counter.counts, processed=False)
+        vectorizer = TweetVectorizer(x_train, self.counter.matrix, processed=False,
+                                     process=self.counter.process)
         y = y_train.values.reshape((-1, 1))
-        self.loss = self.gradient_descent(vectorizer.vectors, y)
+        solvers = {Solvers.batch: self.gradient_descent,
+                   Solvers.sgd: self.stochastic_gradient_descent,
+                   Solvers.lbfgs: self.lbfgs}
+        self.loss = solvers[self.solver](vectorizer.vectors, y)
         return self.loss
 
     def predict(self, x: numpy.ndarray) -> numpy.ndarray:
@@ -94,10 +209,39 @@ class LogisticRegression:
         Returns:
          array of predicted labels for the tweets
         """
-        vectorizer = TweetVectorizer(x, self.counter.counts, processed=False)
+        vectorizer = TweetVectorizer(x, self.counter.matrix, processed=False,
+                                     process=self.counter.process)
         sentimenter = TweetSentiment(vectorizer, self.weights)
         return sentimenter()
 
+    def save(self, path: Union[Path, str]) -> None:
+        """Saves the weights and the word counts
+
+        Args:
+         path: where to save the model (an npz file)
+        """
+        save_model(path, MODEL, self.counter, weights=self.weights,
+                   iterations=numpy.array(self.iterations),
+                   learning_rate=numpy.array(self.learning_rate))
+        return
+
+    @classmethod
+    def load(cls, path: Union[Path, str]) -> "LogisticRegression":
+        """Loads a model saved with =save=
+
+        Args:
+         path: the saved model
+
+        Returns:
+         the fitted model, ready to predict
+        """
+        counter, arrays = load_model(path, MODEL)
+        model = cls(iterations=int(arrays["iterations"]),
+                    learning_rate=float(arrays["learning_rate"]),
+                    weights=arrays["weights"])
+        model.counter = counter
+        return model
+
     def score(self, x: numpy.ndarray, y: numpy.ndarray) -> float:
         """Get the mean accuracy
         
@@ -1,7 +1,8 @@
 # python
 from argparse import Namespace
 from collections import Counter
-from typing import Iterable
+from pathlib import Path
+from typing import Iterable, Union
 
 # pypi
 import attr
@@ -9,6 +10,9 @@ import numpy
 
 # my stuff
 from neurotic.nlp.twitter.counter import WordCounter
+from neurotic.nlp.twitter.persistence import load_model, save_model
+
+MODEL = "naive_bayes"
 
 Sentiment = Namespace(
     negative = 0,
@@ -29,6 +33,10 @@ class NaiveBayes:
     _vocabulary: set = None
     _logprior: float = None
     _loglikelihood: dict = None
+    _documents: numpy.ndarray = None
+    _word_totals: numpy.ndarray = None
+    _ratios: numpy.ndarray = None
+    _changed: set = attr.ib(factory=set)
 
     @property
     def counter(self) -> WordCounter:
@@ -41,46 +49,114 @@ class NaiveBayes:
     def vocabulary(self) -> set:
         """The unique tokens in the tweets"""
         if self._vocabulary is None:
-            self._vocabulary = {key[0] for key in self.counter.counts}
+            self._vocabulary = set(self.counter.matrix.vocabulary)
         return self._vocabulary
 
+    @property
+    def documents(self) -> numpy.ndarray:
+        """The number of tweets for each sentiment"""
+        if self._documents is None:
+            positive_documents = numpy.sum(self.labels)
+            self._documents = numpy.array(
+                [len(self.labels) - positive_documents, positive_documents])
+        return self._documents
+
     @property
     def logprior(self) -> float:
         """the log-odds of the priors"""
         if self._logprior is None:
-            positive_documents = numpy.sum(self.labels)
-            negative_documents = len(self.labels) - positive_documents
+            positive_documents = self.documents[Sentiment.positive]
+            negative_documents = self.documents[Sentiment.negative]
             self._logprior = numpy.log(positive_documents) - numpy.log(negative_documents)
         return self._logprior
 
+    @property
+    def word_totals(self) -> numpy.ndarray:
+        """The count of all the words for each sentiment"""
+        if self._word_totals is None:
+            self._word_totals = self.counter.matrix.totals
+        return self._word_totals
+
+    @property
+    def offset(self) -> float:
+        """The part of every word's log-likelihood that doesn't depend on the word
+
+        The log-likelihood for a word is
+
+        log((positive + 1)/(all positive + V)) - log((negative + 1)/(all negative + V))
+
+        which splits into the word's ratio log(positive + 1) - log(negative + 1)
+        and this offset, log(all negative + V) - log(all positive + V).
+        """
+        vocabulary_size = len(self.counter.matrix.vocabulary)
+        return float(
+            numpy.log(self.word_totals[Sentiment.negative] + vocabulary_size)
+            - numpy.log(self.word_totals[Sentiment.positive] + vocabulary_size))
+
+    @property
+    def ratios(self) -> numpy.ndarray:
+        """log(positive + 1) - log(negative + 1) for each row of the counts
+
+        Only the words changed by =partial_fit= are re-calculated.
+        """
+        matrix = self.counter.matrix
+        if self._ratios is None:
+            self._ratios = (numpy.log(matrix.counts[:, Sentiment.positive] + 1)
+                            - numpy.log(matrix.counts[:, Sentiment.negative] + 1))
+            self._changed.clear()
+        elif self._changed:
+            ratios = numpy.zeros(len(matrix.vocabulary))
+            ratios[:len(self._ratios)] = self._ratios
+            rows = numpy.array([matrix.vocabulary[word]
+                                for word in self._changed])
+            ratios[rows] = (numpy.log(matrix.counts[rows, Sentiment.positive] + 1)
+                            - numpy.log(matrix.counts[rows, Sentiment.negative] + 1))
+            self._ratios = ratios
+            self._changed.clear()
+        return self._ratios
+
+    @property
+    def word_ratios(self) -> dict:
+        """map of word to its log-likelihood ratio (without the offset)"""
+        return dict(zip(self.counter.matrix.words, self.ratios.tolist()))
+
     @property
     def loglikelihood(self) -> dict:
         """The log-likelihoods for words"""
         if self._loglikelihood is None:
-            self._loglikelihood = {}
-            counts = self.counter.counts        
-    
-            all_positive_words = sum(
-                (counts[(token, sentiment)] for token, sentiment in counts
-                 if sentiment == Sentiment.positive))
-            all_negative_words = sum(
-                (counts[(token, sentiment)] for token, sentiment in counts
-                 if sentiment == Sentiment.negative))
-            vocabulary_size = len(self.vocabulary)
-    
-            for word in self.vocabulary:
-                this_word_positive_count = counts[(word, Sentiment.positive)]
-                this_word_negative_count = counts[(word, Sentiment.negative)]
-    
-                probability_word_is_positive = ((this_word_positive_count + 1)/
-                                             (all_positive_words + vocabulary_size))
-                probability_word_is_negative = ((this_word_negative_count + 1)/
-                                             (all_negative_words + vocabulary_size))
-    
-                self._loglikelihood[word] = (numpy.log(probability_word_is_positive) -
-                                             numpy.log(probability_word_is_negative))
+            offset = self.offset
+            self._loglikelihood = {word: ratio + offset
+                                   for word, ratio in self.word_ratios.items()}
         return self._loglikelihood
 
+    def partial_fit(self, tweets: Iterable[str], labels: Iterable[int]) -> None:
+        """Adds more training tweets without re-counting the old ones
+
+        The counts and totals are updated in place and only the ratios for
+        the words in the new tweets get re-calculated (when next needed).
+
+        Args:
+         tweets: the new training tweets
+         labels: the sentiment labels for the new tweets
+        """
+        labels = list(labels)
+        processed = [self.counter.process(tweet) for tweet in tweets]
+        assert len(processed) == len(labels)
+        # the totals have to come from the counts before they're updated
+        word_totals = self.word_totals.copy()
+        self.counter.update(processed, labels, processed=True)
+        documents = self.documents.copy()
+        for tokens, label in zip(processed, labels):
+            documents[int(label)] += 1
+            word_totals[int(label)] += len(tokens)
+            self._changed.update(tokens)
+        self._documents = documents
+        self._word_totals = word_totals
+        self._vocabulary = None
+        self._logprior = None
+        self._loglikelihood = None
+        return
+
     def predict_ratio(self, tweet: str) -> float:
         """predict the odds-ratio positive/negative
     
@@ -91,7 +167,41 @@ class NaiveBayes:
          log-odds-ratio for tweet (positive/negative)
         """
         tokens = self.counter.process(tweet)
-        return self.logprior + sum(self.loglikelihood.get(token, 0) for token in tokens)
+        rows = self.counter.matrix.ids(tokens)
+        return self.logprior + float(self.ratios[rows].sum()) + self.offset * len(rows)
+
+    def predict_ratios(self, tweets: Iterable[str], workers: int=1) -> numpy.ndarray:
+        """predict the odds-ratios for a batch of tweets
+
+        The tweets are turned into a sparse (tweets x vocabulary) count matrix
+        so the scoring is one sparse matrix-vector product.
+
+        Args:
+         tweets: the tweets to predict
+         workers: number of processes to use to tokenize the tweets
+
+        Returns:
+         array of log-odds-ratios (positive/negative) for the tweets
+        """
+        process = self.counter.process
+        if workers > 1:
+            tokens = process.process_many(tweets, workers=workers)
+        else:
+            tokens = (process(tweet) for tweet in tweets)
+        documents = self.counter.matrix.document_term_matrix(tokens)
+        return self.logprior + documents @ (self.ratios + self.offset)
+
+    def predict_many(self, tweets: Iterable[str], workers: int=1) -> numpy.ndarray:
+        """Predict the sentiments for a batch of tweets
+
+        Args:
+         tweets: the 'documents' to analyze
+         workers: number of processes to use to tokenize the tweets
+
+        Returns:
+         array of sentiments (0=negative, 1=positive)
+        """
+        return (self.predict_ratios(tweets, workers=workers) > 0).astype(int)
 
     def predict_sentiment(self, tweet: str) -> int:
         """Predict whether the tweet's sentiment is positive or negative
@@ -104,6 +214,32 @@ class NaiveBayes:
         """
         return self.predict_ratio(tweet) > 0
 
+    def save(self, path: Union[Path, str]) -> None:
+        """Saves the counts and document totals
+
+        Args:
+         path: where to save the model (an npz file)
+        """
+        save_model(path, MODEL, self.counter, documents=self.documents)
+        return
+
+    @classmethod
+    def load(cls, path: Union[Path, str]) -> "NaiveBayes":
+        """Loads a model saved with =save=
+
+        The loaded model has no training tweets but can still predict and
+        be updated with =partial_fit=.
+
+        Args:
+         path: the saved model
+
+        Returns:
+         the classifier
+        """
+        counter, arrays = load_model(path, MODEL)
+        return cls(tweets=[], labels=[], counter=counter,
+                   documents=arrays["documents"])
+
     def check_rep(self) -> None:
         """Does some basic checks of the input arguments"""
         assert len(self.tweets) == len(self.labels)
@@ -0,0 +1,85 @@
+# python
+from argparse import Namespace
+from pathlib import Path
+from typing import Union
+
+# pypi
+import numpy
+
+# this project
+from .counter import CountMatrix, WordCounter
+from .processor import TwitterProcessor
+
+FORMAT_VERSION = 1
+
+Keys = Namespace(
+    version="format_version",
+    model="model",
+    vocabulary="vocabulary",
+    counts="counts",
+    stopwords="stopwords",
+)
+
+
+class ModelFormatError(Exception):
+    """Raised when a saved model isn't the expected kind or version"""
+
+
+def save_model(path: Union[Path, str], model: str, counter: WordCounter,
+               **arrays) -> None:
+    """Saves a model's counts and arrays to an (uncompressed) npz file
+
+    The processor's stopwords are saved too so that loading the model doesn't
+    need the NLTK corpora.
+
+    Args:
+     path: where to save the model
+     model: name for the kind of model (checked when loading)
+     counter: the word-counter with the counts to save
+     arrays: the model's own arrays (e.g. weights)
+    """
+    matrix = counter.matrix
+    arrays[Keys.version] = numpy.array(FORMAT_VERSION)
+    arrays[Keys.model] = numpy.array(model)
+    arrays[Keys.vocabulary] = numpy.array(matrix.words, dtype=str)
+    arrays[Keys.counts] = matrix.counts
+    if isinstance(counter.process, TwitterProcessor):
+        arrays[Keys.stopwords] = numpy.array(counter.process.stopwords,
+                                             dtype=str)
+    with Path(path).open("wb") as writer:
+        numpy.savez(writer, **arrays)
+    return
+
+
+def load_model(path: Union[Path, str], model: str) -> tuple:
+    """Loads a model saved with =save_model=
+
+    Args:
+     path: the saved model
+     model: the kind of model expected
+
+    Returns:
+     WordCounter with the counts, dict of the rest of the saved arrays
+
+    Raises:
+     ModelFormatError: the file is a different model or format version
+    """
+    with numpy.load(path, allow_pickle=False) as saved:
+        arrays = {key: saved[key] for key in saved.files}
+    version = int(arrays.pop(Keys.version))
+    saved_model = str(arrays.pop(Keys.model))
+    if version != FORMAT_VERSION:
+        raise ModelFormatError(
+            f"Format version {version} isn't {FORMAT_VERSION}")
+    if saved_model != model:
+        raise ModelFormatError(f"Expected a {model} model not {saved_model}")
+
+    words = arrays.pop(Keys.vocabulary).tolist()
+    matrix = CountMatrix({word: row for row, word in enumerate(words)},
+                         arrays.pop(Keys.counts))
+    stopwords = arrays.pop(Keys.stopwords, None)
+    processor = TwitterProcessor(
+        stopwords=None if stopwords is None else stopwords.tolist())
+    counter = WordCounter(tweets=[], labels=[], process=processor,
+                          matrix=matrix)
+    return counter, arrays
@@ -1,13 +1,27 @@
 # python
+from argparse import Namespace
 from pathlib import Path
+from typing import Iterable
 
 # from pypi
 from trax.supervised import training
 
 import attr
+import numpy
 import trax
 import trax.layers as trax_layers
 
+# this project
+from .tensor_generator import TensorBuilder
+
+Checkpoint = Namespace(
+    model="model.pkl.gz",
+)
+
+Defaults = Namespace(
+    batch_size=256,
+)
+
 
 @attr.s(auto_attribs=True)
 class SentimentNetwork:
@@ -16,38 +30,75 @@ class SentimentNetwork:
     Args:
      training_generator: generator of training batches
      validation_generator: generator of validation batches
-     vocabulary_size: number of tokens in the training vocabulary
+     vocabulary_size: number of tokens in the training vocabulary (None to
+       use the converter's vocabulary_size)
      training_loops: number of times to run the training loop
      output_path: path to where to store the model
      embedding_dimension: output dimension for the Embedding layer
      output_dimension: dimension for the Dense layer
+     converter: TensorBuilder to convert tweets for predictions
     """
-    vocabulary_size: int
+    _vocabulary_size: int
     training_generator: object
     validation_generator: object
     training_loops: int
     output_path: Path
     embedding_dimension: int=256
     output_dimension: int=2
+    converter: TensorBuilder=None
     _model: trax_layers.Serial=None
+    _predictor: trax_layers.Serial=None
     _training_task: training.TrainTask=None
     _evaluation_task: training.EvalTask=None
     _training_loop: training.Loop=None
 
+    @property
+    def vocabulary_size(self) -> int:
+        """The number of rows for the Embedding layer"""
+        if self._vocabulary_size is None:
+            self._vocabulary_size = self.converter.vocabulary_size
+        return self._vocabulary_size
+
+    def build_model(self) -> trax_layers.Serial:
+        """Builds a new (un-trained) Embeddings model"""
+        return trax_layers.Serial(
+            trax_layers.Embedding(
+                vocab_size=self.vocabulary_size,
+                d_feature=self.embedding_dimension),
+            trax_layers.Mean(axis=1),
+            trax_layers.Dense(n_units=self.output_dimension),
+            trax_layers.LogSoftmax(),
+        )
+
     @property
     def model(self) -> trax_layers.Serial:
         """The Embeddings model"""
         if self._model is None:
-            self._model = trax_layers.Serial(
-                trax_layers.Embedding(
-                    vocab_size=self.vocabulary_size,
-                    d_feature=self.embedding_dimension),
-                trax_layers.Mean(axis=1),
-                trax_layers.Dense(n_units=self.output_dimension),
-                trax_layers.LogSoftmax(),
-            )
+            self._model = self.build_model()
         return self._model
 
+    @property
+    def predictor(self) -> trax_layers.Serial:
+        """The trained model to make predictions with
+
+        If the training loop was run the model it trained is used, otherwise
+        the weights are restored from the checkpoint in the output path
+        (without building the training or evaluation tasks). None of the
+        layers have dropout so the model behaves the same in eval mode.
+        """
+        if self._predictor is None:
+            if self._training_loop is not None:
+                self._predictor = self.model
+            else:
+                predictor = self.build_model()
+                predictor.init_from_file(
+                    str(Path(self.output_path)/Checkpoint.model),
+                    weights_only=True,
+                    input_signature=trax.shapes.ShapeDtype((1, 1),
+                                                           numpy.int32))
+                self._predictor = predictor
+        return self._predictor
+
     @property
     def training_task(self) -> training.TrainTask:
         """The training task for training the model"""
@@ -85,4 +136,29 @@ class SentimentNetwork:
     def fit(self):
         """Runs the training loop"""
         self.training_loop.run(n_steps=self.training_loops)
+        self._predictor = None
         return
+
+    def predict(self, tweets: Iterable[str],
+                batch_size: int=Defaults.batch_size) -> numpy.ndarray:
+        """Predicts the class probabilities for the tweets
+
+        The tweets are tokenized together and sorted by length before being
+        batched so each batch only needs a little padding.
+
+        Args:
+         tweets: the strings to classify
+         batch_size: the most tweets to give the model at once
+
+        Returns:
+         (tweets x output dimension) array of class probabilities
+        """
+        encoded = self.converter.encode(tweets)
+        lengths = encoded.lengths
+        order = numpy.argsort(lengths, kind="stable")
+        probabilities = numpy.zeros((len(encoded), self.output_dimension))
+        for start in range(0, len(order), batch_size):
+            indices = order[start:start + batch_size]
+            log_probabilities = self.predictor(encoded.padded(indices))
+            probabilities[indices] = numpy.exp(numpy.asarray(log_probabilities))
+        return probabilities
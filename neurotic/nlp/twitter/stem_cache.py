@@ -0,0 +1,75 @@
+# python
+from argparse import Namespace
+from pathlib import Path
+from typing import Union
+
+import json
+
+# pypi
+from nltk.stem import PorterStemmer
+
+import attr
+
+# this project
+from ..lru_cache import LRUCache
+
+Defaults = Namespace(
+    encoding="utf-8",
+)
+
+
+@attr.s(auto_attribs=True)
+class StemCache(LRUCache):
+    """A least-recently-used cache of word stems
+
+    Args:
+     maximum: the most words to keep before evicting the least recently used
+     stemmer: the stemmer to cache (defaults to a PorterStemmer)
+    """
+    _stemmer: PorterStemmer = None
+
+    @property
+    def stemmer(self) -> PorterStemmer:
+        """The stemmer to use on cache-misses"""
+        if self._stemmer is None:
+            self._stemmer = PorterStemmer()
+        return self._stemmer
+
+    def __call__(self, word: str) -> str:
+        """Get the stem for the word
+
+        Args:
+         word: the token to stem
+
+        Returns:
+         the stemmed word
+        """
+        stem = self.get(word)
+        if stem is None:
+            stem = self[word] = self.stemmer.stem(word)
+        return stem
+
+    def save(self, path: Union[Path, str]) -> None:
+        """Saves the stems as JSON (oldest to most recently used)
+
+        Args:
+         path: where to save the stems
+        """
+        with Path(path).open("w", encoding=Defaults.encoding) as writer:
+            json.dump(self.items(), writer)
+        return
+
+    def warm(self, path: Union[Path, str]) -> None:
+        """Loads stems saved with =save= into the cache
+
+        Args:
+         path: the file with the stems
+        """
+        with Path(path).open(encoding=Defaults.encoding) as reader:
+            stems = json.load(reader)
+        self.update(stems[-self.maximum:])
+        return
+
+
+# the cache that processors using the default stemmer share
+SHARED_STEMS = StemCache()
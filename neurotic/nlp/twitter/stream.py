@@ -0,0 +1,70 @@
+# python
+from argparse import Namespace
+from pathlib import Path
+from typing import Iterator, Union
+
+import json
+
+# pypi
+import attr
+
+# this project
+from .processor import TwitterProcessor
+
+Formats = Namespace(
+    json="json",
+    text="text",
+)
+
+Defaults = Namespace(
+    key="text",
+    encoding="utf-8",
+    json_suffixes={".json", ".jsonl"},
+)
+
+
+@attr.s(auto_attribs=True)
+class TweetStream:
+    """Lazily reads and processes a file of tweets
+
+    Args:
+     path: the file with one tweet per line
+     format: 'json' (JSON-lines) or 'text' (guessed from the suffix if not set)
+     key: the key for the tweet's text in each JSON line
+     encoding: the file encoding
+    """
+    path: Union[Path, str]
+    format: str=None
+    key: str=Defaults.key
+    encoding: str=Defaults.encoding
+    _process: TwitterProcessor=None
+
+    @property
+    def process(self) -> TwitterProcessor:
+        """Processes tweet strings to tokens"""
+        if self._process is None:
+            self._process = TwitterProcessor()
+        return self._process
+
+    @property
+    def is_json(self) -> bool:
+        """Whether each line is a JSON object"""
+        if self.format is None:
+            return Path(self.path).suffix in Defaults.json_suffixes
+        return self.format == Formats.json
+
+    def tweets(self) -> Iterator[str]:
+        """Generates the raw tweets one line at a time"""
+        is_json = self.is_json
+        with Path(self.path).open(encoding=self.encoding) as lines:
+            for line in lines:
+                line = line.rstrip("\r\n")
+                if not line.strip():
+                    continue
+                yield json.loads(line)[self.key] if is_json else line
+        return
+
+    def __iter__(self) -> Iterator[list]:
+        """Generates the processed tweets"""
+        process = self.process
+        return (process(tweet) for tweet in self.tweets())
@@ -1,8 +1,12 @@
 # python
 from argparse import Namespace
+from collections import Counter
 from itertools import cycle
+from pathlib import Path
+from typing import Union
 
 import random
+import zlib
 
 # pypi
 from nltk.corpus import twitter_samples
@@ -15,8 +19,25 @@ from .processor import TwitterProcessor
 
 Defaults = Namespace(
     split = 4000,
+    boundaries=[8, 16, 32, 64],
+    batch_sizes=[64, 32, 16, 8, 4],
 )
 
+Encoded = Namespace(
+    positive_training="positive_training",
+    negative_training="negative_training",
+    positive_validation="positive_validation",
+    negative_validation="negative_validation",
+    vocabulary="vocabulary.npy",
+    tokens="{}_tokens.npy",
+    offsets="{}_offsets.npy",
+    settings="settings.npy",
+)
+
+# the TensorBuilder settings the cached vocabulary and tensors depend on
+# (saved in this order, with -1 for the ones that aren't set)
+CacheSettings = ("split", "min_count", "max_size", "hash_buckets")
+
 NLTK = Namespace(
     corpus="twitter_samples",
     negative = "negative_tweets.json",
@@ -33,14 +54,158 @@ SpecialIDs = Namespace(
     unknown=2,
 )
 
+class CacheSettingsError(Exception):
+    """Raised when a cache folder was built with different settings"""
+
+
+@attr.s(auto_attribs=True)
+class RaggedTensors:
+    """Variable-length token-id lists stored as one flat array
+
+    The tokens for tensor i are =tokens[offsets[i]:offsets[i + 1]]=.
+
+    Args:
+     tokens: all the token ids, one tensor after another
+     offsets: where each tensor starts (with the end of the last one at the end)
+    """
+    tokens: numpy.ndarray
+    offsets: numpy.ndarray
+
+    @classmethod
+    def from_lists(cls, tensors: list) -> "RaggedTensors":
+        """Packs lists of token ids into the flat store
+
+        Args:
+         tensors: iterable of lists of token ids
+
+        Returns:
+         the packed tensors
+        """
+        lengths = [0]
+        tokens = []
+        for tensor in tensors:
+            tokens.extend(tensor)
+            lengths.append(len(tensor))
+        return cls(tokens=numpy.array(tokens, dtype=numpy.int32),
+                   offsets=numpy.cumsum(lengths, dtype=numpy.int64))
+
+    @property
+    def lengths(self) -> numpy.ndarray:
+        """The number of tokens in each tensor"""
+        return numpy.diff(self.offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> numpy.ndarray:
+        return self.tokens[self.offsets[index]:self.offsets[index + 1]]
+
+    def save(self, folder: Union[Path, str], name: str) -> None:
+        """Saves the tokens and offsets as .npy files
+
+        Args:
+         folder: the directory to save the files in
+         name: prefix for the file names
+        """
+        folder = Path(folder)
+        folder.mkdir(parents=True, exist_ok=True)
+        numpy.save(folder/Encoded.tokens.format(name), self.tokens)
+        numpy.save(folder/Encoded.offsets.format(name), self.offsets)
+        return
+
+    @classmethod
+    def load(cls, folder: Union[Path, str], name: str,
+             memory_map: bool=True) -> "RaggedTensors":
+        """Loads tensors saved with =save=
+
+        Args:
+         folder: the directory with the files
+         name: prefix for the file names
+         memory_map: whether to memory-map the arrays instead of reading them
+
+        Returns:
+         the tensors
+        """
+        folder = Path(folder)
+        mode = "r" if memory_map else None
+        return cls(
+            tokens=numpy.load(folder/Encoded.tokens.format(name),
+                              mmap_mode=mode),
+            offsets=numpy.load(folder/Encoded.offsets.format(name),
+                               mmap_mode=mode))
+
+    @classmethod
+    def exists(cls, folder: Union[Path, str], name: str) -> bool:
+        """Checks if tensors were saved in the folder"""
+        folder = Path(folder)
+        return all((folder/template.format(name)).is_file()
+                   for template in (Encoded.tokens, Encoded.offsets))
+
+    def padded(self, indices: numpy.ndarray,
+               padding: int=SpecialIDs.padding) -> numpy.ndarray:
+        """Builds a padded batch of the tensors
+
+        Args:
+         indices: which tensors to put in the batch
+         padding: the id to fill the ends with
+
+        Returns:
+         (len(indices) x longest tensor) int32 array
+        """
+        lengths = self.lengths[indices]
+        longest = max(int(lengths.max(initial=0)), 1)
+        batch = numpy.full((len(indices), longest), padding, dtype=numpy.int32)
+        filled = numpy.arange(longest) < lengths[:, None]
+        batch[filled] = numpy.concatenate(
+            [self[index] for index in indices]) if len(indices) else []
+        return batch
+
+
+def pad_pair(positive: RaggedTensors, positives: numpy.ndarray,
+             negative: RaggedTensors, negatives: numpy.ndarray) -> numpy.ndarray:
+    """Pads a half-positive, half-negative batch to its longest tweet
+
+    Args:
+     positive: the encoded positive tweets
+     positives: indices of the positive tweets for the batch
+     negative: the encoded negative tweets
+     negatives: indices of the negative tweets for the batch
+
+    Returns:
+     the padded positive tweets followed by the padded negative tweets
+    """
+    positive = positive.padded(positives)
+    negative = negative.padded(negatives)
+    longest = max(positive.shape[1], negative.shape[1])
+    inputs = numpy.full((len(positives) + len(negatives), longest),
+                        SpecialIDs.padding, dtype=numpy.int32)
+    inputs[:len(positives), :positive.shape[1]] = positive
+    inputs[len(positives):, :negative.shape[1]] = negative
+    return inputs
+
+
 @attr.s(auto_attribs=True)
 class TensorBuilder:
     """converts tweets to tensors
 
     Args: 
      - split: where to split the training and validation data
+     - workers: number of processes to use to build the vocabulary
+     - cache: folder to save the encoded tweets in (and load them from),
+       it can only be used with the settings it was built with
+     - memory_map: whether to memory-map the cached tensors
+     - min_count: tokens seen fewer times than this in training are unknown
+     - max_size: most (non-special) tokens to keep (the most frequent ones)
+     - hash_buckets: if set, hash tokens into this many ids instead of
+       building a vocabulary
     """
     split = Defaults.split
+    workers: int=1
+    cache: Path=None
+    memory_map: bool=True
+    min_count: int=1
+    max_size: int=None
+    hash_buckets: int=None
     _positive: list=None
     _negative: list=None
     _positive_training: list=None
@@ -50,6 +215,8 @@ class TensorBuilder:
     _process: TwitterProcessor=None
     _vocabulary: dict=None
     _x_train: list=None
+    _encoded: dict=attr.ib(factory=dict)
+    _cache_checked: bool=False
 
     @property
     def positive(self) -> list:
@@ -102,17 +269,110 @@ class TensorBuilder:
 
     @property
     def vocabulary(self) -> dict:
-        """A map of token to numeric id"""
+        """A map of token to numeric id
+
+        Only the special tokens when hashing. Otherwise the training tokens
+        (pruned by min_count and max_size) in the order they were first seen.
+        """
+        if self._vocabulary is None and self.cache is not None:
+            self.check_cache()
+        vocabulary_path = (None if self.cache is None or self.hash_buckets
+                           else Path(self.cache)/Encoded.vocabulary)
+        if (self._vocabulary is None and vocabulary_path is not None
+                and vocabulary_path.is_file()):
+            tokens = numpy.load(vocabulary_path).tolist()
+            self._vocabulary = {token: index for index, token in enumerate(tokens)}
         if self._vocabulary is None:
             self._vocabulary = {SpecialTokens.padding: SpecialIDs.padding,
                                 SpecialTokens.ending: SpecialIDs.ending,
                                 SpecialTokens.unknown: SpecialIDs.unknown}
-            for tweet in self.x_train:
-                for token in self.process(tweet):
-                    if token not in self._vocabulary:
-                        self._vocabulary[token] = len(self._vocabulary)
+            if self.hash_buckets:
+                return self._vocabulary
+            if self.workers > 1:
+                tweets = self.process.process_many(self.x_train,
+                                                   workers=self.workers)
+            else:
+                tweets = (self.process(tweet) for tweet in self.x_train)
+            # counters remember the order the tokens were first seen
+            counts = Counter()
+            for tokens in tweets:
+                counts.update(tokens)
+            for special in SpecialTokens.__dict__.values():
+                counts.pop(special, None)
+            kept = [token for token, count in counts.items()
+                    if count >= self.min_count]
+            if self.max_size is not None and len(kept) > self.max_size:
+                most_common = sorted(kept, key=counts.get,
+                                     reverse=True)[:self.max_size]
+                most_common = set(most_common)
+                kept = [token for token in kept if token in most_common]
+            for token in kept:
+                self._vocabulary[token] = len(self._vocabulary)
+            if vocabulary_path is not None:
+                vocabulary_path.parent.mkdir(parents=True, exist_ok=True)
+                numpy.save(vocabulary_path,
+                           numpy.array(list(self._vocabulary), dtype=str))
         return self._vocabulary
 
+    @property
+    def settings(self) -> numpy.ndarray:
+        """The =CacheSettings= values (-1 for the ones that aren't set)"""
+        values = (getattr(self, name) for name in CacheSettings)
+        return numpy.array([-1 if value is None else value
+                            for value in values], dtype=numpy.int64)
+
+    def check_cache(self) -> None:
+        """Makes sure the cache folder was built with these settings
+
+        The first time the folder is used the settings are saved in it.
+
+        Raises:
+         CacheSettingsError: the folder was built with other settings
+        """
+        if self._cache_checked:
+            return
+        folder = Path(self.cache)
+        path = folder/Encoded.settings
+        if path.is_file():
+            saved = numpy.load(path)
+            different = [f"{name}={old} (not {new})" for name, old, new
+                         in zip(CacheSettings, saved.tolist(),
+                                self.settings.tolist())
+                         if old != new]
+            if different:
+                raise CacheSettingsError(
+                    f"{folder} was built with {', '.join(different)}")
+        elif folder.is_dir() and any(folder.glob("*.npy")):
+            raise CacheSettingsError(
+                f"{folder} has tensors but no {Encoded.settings}")
+        else:
+            folder.mkdir(parents=True, exist_ok=True)
+            numpy.save(path, self.settings)
+        self._cache_checked = True
+        return
+
+    @property
+    def vocabulary_size(self) -> int:
+        """The number of ids the tensors can have (the Embedding's rows)"""
+        if self.hash_buckets:
+            return len(vars(SpecialIDs)) + self.hash_buckets
+        return len(self.vocabulary)
+
+    def hashed(self, token: str) -> int:
+        """The id for a token when hashing
+
+        This uses crc32 rather than python's hash so the ids are the same
+        in every process.
+
+        Args:
+         token: the string to hash
+
+        Returns:
+         id after the special ids
+        """
+        return (len(vars(SpecialIDs))
+                + zlib.crc32(token.encode("utf-8")) % self.hash_buckets)
+
     @property
     def x_train(self) -> list:
         """The unprocessed training data"""
@@ -129,10 +389,71 @@ class TensorBuilder:
         Returns:
          list of IDs for the tweet
         """
+        if self.hash_buckets:
+            return [self.hashed(token) for token in self.process(tweet)]
         tensor = [self.vocabulary.get(token, SpecialIDs.unknown)
                   for token in self.process(tweet)]
         return tensor
 
+    def encode(self, tweets: list) -> RaggedTensors:
+        """Converts all the tweets to token ids once
+
+        Args:
+         tweets: the strings to convert
+
+        Returns:
+         the token ids packed into a RaggedTensors store
+        """
+        return RaggedTensors.from_lists(self.to_tensor(tweet)
+                                        for tweet in tweets)
+
+    def encoded(self, name: str) -> RaggedTensors:
+        """Encodes one of the data sets once
+
+        If there's a cache folder the tensors are loaded from it when they
+        were saved before, otherwise they're encoded and saved there.
+
+        Raises:
+         CacheSettingsError: the cache folder was built with other settings
+
+        Args:
+         name: one of the =Encoded= data-set names (e.g. 'positive_training')
+
+        Returns:
+         the encoded tweets
+        """
+        if name not in self._encoded:
+            if self.cache is not None:
+                self.check_cache()
+            if self.cache is not None and RaggedTensors.exists(self.cache, name):
+                self._encoded[name] = RaggedTensors.load(
+                    self.cache, name, memory_map=self.memory_map)
+            else:
+                self._encoded[name] = self.encode(getattr(self, name))
+                if self.cache is not None:
+                    self._encoded[name].save(self.cache, name)
+        return self._encoded[name]
+
+    @property
+    def positive_training_tensors(self) -> RaggedTensors:
+        """The encoded positive training tweets"""
+        return self.encoded(Encoded.positive_training)
+
+    @property
+    def negative_training_tensors(self) -> RaggedTensors:
+        """The encoded negative training tweets"""
+        return self.encoded(Encoded.negative_training)
+
+    @property
+    def positive_validation_tensors(self) -> RaggedTensors:
+        """The encoded positive validation tweets"""
+        return self.encoded(Encoded.positive_validation)
+
+    @property
+    def negative_validation_tensors(self) -> RaggedTensors:
+        """The encoded negative validation tweets"""
+        return self.encoded(Encoded.negative_validation)
+
 
 @attr.s(auto_attribs=True)
 class TensorGenerator:
@@ -140,15 +461,15 @@ class TensorGenerator:
 
     Args:
      converter: TensorBuilder object
-     positive_data: list of positive data
-     negative_data: list of negative data
+     positive_data: list of positive data (or the RaggedTensors encoding them)
+     negative_data: list of negative data (or the RaggedTensors encoding them)
      batch_size: the size for each generated batch     
      shuffle: whether to shuffle the generated data
      infinite: whether to generate data forever
     """
     converter: TensorBuilder
-    positive_data: list
-    negative_data: list
+    positive_data: Union[list, RaggedTensors]
+    negative_data: Union[list, RaggedTensors]
     batch_size: int
     shuffle: bool=True
     infinite: bool = True
@@ -229,6 +550,9 @@ class TensorGenerator:
     def __next__(self):
         assert self.batch_size % 2 == 0
         half_batch = self.batch_size // 2
+
+        if isinstance(self.positive_data, RaggedTensors):
+            return self.next_encoded(half_batch)
     
         # get the indices
         positives = (next(self.positives) for index in range(half_batch))
@@ -266,3 +590,126 @@ class TensorGenerator:
         # default the weights to ones
         weights = numpy.ones_like(targets)    
         return inputs, targets, weights
+
+    def next_encoded(self, half_batch: int) -> tuple:
+        """Builds the next batch by slicing the pre-encoded tweets
+
+        Args:
+         half_batch: number of tweets for each sentiment
+
+        Returns:
+         inputs, targets, weights
+        """
+        positives = numpy.array([next(self.positives)
+                                 for index in range(half_batch)])
+        negatives = numpy.array([next(self.negatives)
+                                 for index in range(half_batch)])
+        inputs = pad_pair(self.positive_data, positives,
+                          self.negative_data, negatives)
+        targets = numpy.array([1] * half_batch + [0] * half_batch)
+        return inputs, targets, numpy.ones_like(targets)
+
+
+@attr.s(auto_attribs=True)
+class BucketedTensorGenerator:
+    """Generates batches of pre-tokenized tweets of similar lengths
+
+    This is like trax's =BucketByLength=: each tweet goes in the bucket for
+    the first boundary its length is less than (or the last bucket) and each
+    batch is drawn from one bucket, so short tweets aren't padded out to the
+    length of long ones. Each batch is half positive and half negative; the
+    tweets left over in a bucket once one of the sentiments runs out wait for
+    the next (re-shuffled) epoch.
+
+    Args:
+     positive: the encoded positive tweets
+     negative: the encoded negative tweets
+     boundaries: upper (exclusive) token-lengths for the buckets
+     batch_sizes: batch size for each bucket (one more than the boundaries)
+     shuffle: whether to shuffle the tweets and batches each epoch
+     infinite: whether to generate batches forever
+     seed: seed for the shuffling
+    """
+    positive: RaggedTensors
+    negative: RaggedTensors
+    boundaries: list=attr.ib(factory=lambda: list(Defaults.boundaries))
+    batch_sizes: list=attr.ib(factory=lambda: list(Defaults.batch_sizes))
+    shuffle: bool=True
+    infinite: bool=True
+    seed: int=None
+    _random: numpy.random.Generator=None
+    _batches: iter=None
+
+    @property
+    def random(self) -> numpy.random.Generator:
+        """The random number generator for the shuffling"""
+        if self._random is None:
+            self._random = numpy.random.default_rng(self.seed)
+        return self._random
+
+    def buckets(self, tensors: RaggedTensors) -> list:
+        """Splits the tensor indices up by length
+
+        Args:
+         tensors: the encoded tweets
+
+        Returns:
+         list of index-arrays, one per bucket
+        """
+        bucket = numpy.searchsorted(self.boundaries, tensors.lengths,
+                                    side="right")
+        return [numpy.flatnonzero(bucket == index)
+                for index in range(len(self.batch_sizes))]
+
+    def epoch(self) -> list:
+        """Plans the batches for one pass through the data
+
+        Returns:
+         list of (positive indices, negative indices) for each batch
+        """
+        assert len(self.batch_sizes) == len(self.boundaries) + 1
+        plan = []
+        for positives, negatives, batch_size in zip(
+                self.buckets(self.positive), self.buckets(self.negative),
+                self.batch_sizes):
+            assert batch_size % 2 == 0
+            half_batch = batch_size // 2
+            if self.shuffle:
+                positives = self.random.permutation(positives)
+                negatives = self.random.permutation(negatives)
+            batches = min(len(positives), len(negatives)) // half_batch
+            for batch in range(batches):
+                start, stop = batch * half_batch, (batch + 1) * half_batch
+                plan.append((positives[start:stop], negatives[start:stop]))
+        if self.shuffle:
+            plan = [plan[index] for index in self.random.permutation(len(plan))]
+        return plan
+
+    def batch_generator(self):
+        """Generates the (inputs, targets, weights) batches"""
+        while True:
+            plan = self.epoch()
+            if not plan:
+                break
+            for positives, negatives in plan:
+                inputs = pad_pair(self.positive, positives,
+                                  self.negative, negatives)
+                targets = numpy.array([1] * len(positives)
+                                      + [0] * len(negatives))
+                yield inputs, targets, numpy.ones_like(targets)
+            if not self.infinite:
+                break
+        return
+
+    @property
+    def batches(self):
+        """The batch generator instance"""
+        if self._batches is None:
+            self._batches = self.batch_generator()
+        return self._batches
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.batches)
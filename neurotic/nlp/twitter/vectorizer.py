@@ -10,7 +10,7 @@ import attr
 
 # this package
 from neurotic.nlp.twitter.processor import TwitterProcessor
-from neurotic.nlp.twitter.counter import WordCounter
+from neurotic.nlp.twitter.counter import CountMatrix, WordCounter
 
 Columns = Namespace(
     bias=0,
@@ -34,16 +34,19 @@ class TweetVectorizer:
 
     Args:
      tweets: the pre-processed/tokenized tweets to vectorize
-     counts: the counter with the tweet token counts
+     counts: the counter (or CountMatrix) with the tweet token counts
      processed: to not process the bulk tweets
      bias: constant to use for the bias
+     workers: number of processes to use if the tweets need processing
     """
     tweets: Tweets
-    counts: Counter
+    counts: Union[Counter, CountMatrix]
     processed: bool=True
     bias: float=1
+    workers: int=1
     _process: TwitterProcessor=None
     _vectors: numpy.ndarray=None
+    _matrix: CountMatrix=None
 
     @property
     def process(self) -> TwitterProcessor:
@@ -52,14 +55,46 @@ class TweetVectorizer:
             self._process = TwitterProcessor()
         return self._process
 
+    @property
+    def matrix(self) -> CountMatrix:
+        """The counts as a CountMatrix"""
+        if self._matrix is None:
+            self._matrix = (self.counts if isinstance(self.counts, CountMatrix)
+                            else CountMatrix.from_counter(self.counts))
+        return self._matrix
+
     @property
     def vectors(self) -> numpy.ndarray:
         """The vectorized tweet counts"""
         if self._vectors is None:
-            rows = [self.extract_features(tweet) for tweet in self.tweets]
-            self._vectors = numpy.array(rows)
+            if self.processed:
+                tweets = self.tweets
+            elif self.workers > 1:
+                tweets = self.process.process_many(self.tweets,
+                                                   workers=self.workers)
+            else:
+                tweets = (self.process(tweet) for tweet in self.tweets)
+            self._vectors = self.sparse_vectors(tweets)
         return self._vectors
 
+    def sparse_vectors(self, tweets: Tweets) -> numpy.ndarray:
+        """Vectorizes the processed tweets with one sparse-dense product
+
+        Args:
+         tweets: processed tweets
+
+        Returns:
+         (tweets x 3) array of bias, positive count, negative count
+        """
+        sums = self.matrix.document_term_matrix(tweets) @ self.matrix.counts
+        vectors = numpy.empty((sums.shape[0], len(vars(Columns))),
+                              dtype=numpy.result_type(numpy.array(self.bias),
+                                                      sums.dtype))
+        vectors[:, Columns.bias] = self.bias
+        vectors[:, Columns.positive] = sums[:, TweetClass.positive]
+        vectors[:, Columns.negative] = sums[:, TweetClass.negative]
+        return vectors
+
     def extract_features(self, tweet: str, as_array: bool=False) -> Vector:
         """converts a single tweet to an array of counts
 
@@ -72,19 +107,36 @@ class TweetVectorizer:
         """
         # this is a hack to make this work both in bulk and one tweet at a time
         tokens = tweet if self.processed else self.process(tweet)
-        vector = [
+        vector = self.token_features(tokens)
+        vector = numpy.array([vector]) if as_array else vector
+        return vector
+
+    def token_features(self, tokens: List[str]) -> list:
+        """converts a processed tweet to a list of counts
+
+        Args:
+         tokens: the processed tweet
+
+        Returns:
+         bias, positive count, negative count
+        """
+        if isinstance(self.counts, CountMatrix):
+            counts = self.counts.token_counts(tokens)
+            return [self.bias,
+                    int(counts[TweetClass.positive]),
+                    int(counts[TweetClass.negative])]
+        return [
             self.bias,
             sum((self.counts[(token, TweetClass.positive)]
                  for token in tokens)),
             sum((self.counts[(token, TweetClass.negative)]
                                 for token in tokens))
         ]
-        vector = numpy.array([vector]) if as_array else vector
-        return vector
 
     def reset(self) -> None:
         """Removes the vectors"""
         self._vectors = None
+        self._matrix = None
         return
 
     def check_rep(self) -> None:
@@ -95,5 +147,5 @@ class TweetVectorizer:
         """
         for tweet in self.tweets:
             assert type(tweet) is str
-        assert type(self.counts) is Counter
+        assert type(self.counts) in (Counter, CountMatrix)
         return
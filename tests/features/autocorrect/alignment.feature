@@ -0,0 +1,24 @@
+Feature: Aligning Strings
+
+Scenario Outline: The linear-space path is the full-table path
+  Given random pairs of strings to align
+  When the user finds the paths with the <engine> engine
+  Then the linear-space paths are the full-table paths
+  And the pairs that run off the full table run off the linear-space one
+
+  Examples:
+  | engine |
+  | python |
+  | numpy  |
+
+Scenario Outline: The backtrace runs off the table
+  Given the strings "<source>" and "<target>" to align
+  When the user finds the path both ways
+  Then both ways raise an IndexError
+
+  Examples:
+  | source | target |
+  | a      |        |
+  |        | ab     |
+  | ab     | bba    |
+  | aabb   | ba     |
@@ -0,0 +1,30 @@
+Feature: Compiled Autocorrect Corpus
+
+Scenario Outline: The user saves and loads a compiled corpus
+  Given a compiled corpus with non-ascii words
+  When the user saves it and loads it back <how>
+  Then the loaded corpus has the same counts and probabilities
+  And the loaded deletion index finds the same candidates
+  And the suggestors give the same suggestions as with the corpus builder
+
+  Examples:
+  | how                 |
+  | with memory-mapping |
+  | without mapping     |
+
+Scenario: The user loads a compiled corpus without a deletion index
+  Given a compiled corpus without a deletion index
+  When the user saves it and loads it back with memory-mapping
+  Then the loaded corpus has the same counts and probabilities
+  And the loaded corpus has no deletion index
+
+Scenario: The user loads a compiled corpus with another format version
+  Given a compiled corpus saved with another format version
+  When the user loads the compiled corpus
+  Then it raises a CorpusFormatError
+
+Scenario: The compiled vocabulary skips strings with lengths it doesn't have
+  Given a compiled corpus with non-ascii words
+  When the user intersects the vocabulary with some strings
+  Then the intersection matches the corpus builder's
+  And the strings with missing lengths weren't searched for
@@ -0,0 +1,23 @@
+Feature: Autocorrect Corpus Builder
+
+Scenario Outline: The user counts a file a few characters at a time
+  Given a corpus file with words of different lengths
+  When the user counts the words <size> characters at a time
+  Then the counts are the same as counting the whole file at once
+
+  Examples:
+  | size |
+  | 1    |
+  | 2    |
+  | 3    |
+  | 7    |
+
+Scenario Outline: The user counts several files as one corpus
+  Given corpus files with words of different lengths
+  When the user counts the files with <workers> workers
+  Then the counts are the same as counting the files joined together
+
+  Examples:
+  | workers |
+  | 1       |
+  | 2       |
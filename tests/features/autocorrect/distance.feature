@@ -0,0 +1,75 @@
+Feature: Minimum Edit Distance Engines
+
+Scenario Outline: The faster engines match the python engine
+  Given random pairs of strings
+  And the <engine> engine
+  When the user works out the distances with costs <insertion>, <deletion> and <replacement>
+  Then the tables and distances match the python engine's
+
+  Examples:
+  | engine | insertion | deletion | replacement |
+  | numpy  | 1         | 1        | 2           |
+  | numpy  | 2         | 3        | 1           |
+  | numpy  | 3         | 1        | 5           |
+  | numpy  | 1         | 2        | 0           |
+  | numba  | 1         | 1        | 2           |
+  | numba  | 2         | 3        | 1           |
+  | numba  | 3         | 1        | 5           |
+  | numba  | 1         | 2        | 0           |
+
+Scenario Outline: The user only wants distances within a limit
+  Given random pairs of strings
+  When the user works out the distances within <limit> with costs <insertion>, <deletion> and <replacement>
+  Then the distances within the limit are the minimum distances
+  And the others are None
+
+  Examples:
+  | limit | insertion | deletion | replacement |
+  | 0     | 1         | 1        | 2           |
+  | 3     | 1         | 1        | 2           |
+  | 5     | 2         | 3        | 1           |
+  | 7     | 3         | 1        | 5           |
+  | 4     | 1         | 2        | 0           |
+  | 6     | 0         | 2        | 1           |
+
+Scenario Outline: The user works out the distances between many strings
+  Given random sources and targets with shared prefixes
+  When the user works out the pairwise distances in blocks of <size> with <workers> workers and costs <insertion>, <deletion> and <replacement>
+  Then each distance is the minimum distance for that pair
+
+  Examples:
+  | size | workers | insertion | deletion | replacement |
+  | 1024 | 1       | 1         | 1        | 2           |
+  | 3    | 1       | 2         | 3        | 1           |
+  | 3    | 2       | 2         | 3        | 1           |
+  | 4    | 2       | 3         | 1        | 5           |
+  | 5    | 2       | 1         | 2        | 0           |
+
+Scenario: The user works out the distances between one set of strings
+  Given random sources and targets with shared prefixes
+  When the user works out the pairwise distances between the sources
+  Then the distances are symmetric with zeros on the diagonal
+
+Scenario Outline: The user caps the memory for the rows
+  Given random sources and targets with shared prefixes
+  When the user works out the pairwise distances with at most <bytes> bytes of rows
+  Then each distance is the minimum distance for that pair
+  And the targets were split into groups of <group>
+
+  Examples:
+  | bytes    | group |
+  | 1        | 1     |
+  | 4000     | 3     |
+  | 67108864 | 12    |
+
+Scenario Outline: The user asks for an engine that doesn't exist
+  When the user works out a distance with the <engine> engine using <how>
+  Then it raises a ValueError for the engine
+
+  Examples:
+  | engine | how                           |
+  | numbaa | distance_table                |
+  | numbaa | edit_distance                 |
+  | python | edit_distance                 |
+  | numbaa | MinimumEdits.distance_table   |
+  | numbaa | MinimumEdits.minimum_distance |
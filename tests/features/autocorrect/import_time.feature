@@ -0,0 +1,11 @@
+Feature: Importing the autocorrect code stays light
+
+Scenario: The autocorrect modules are imported
+  Given the import-time report for the autocorrect modules
+  Then pandas wasn't imported
+  And tabulate wasn't imported
+
+Scenario: A distance table is printed
+  Given a minimum edits object
+  When the user prints the distance table
+  Then the table has the distances
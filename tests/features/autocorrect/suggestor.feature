@@ -0,0 +1,51 @@
+Feature: Autocorrect Word Suggestor Engines
+
+Scenario Outline: The deletion index finds the same suggestions as the edits
+  Given a corpus with doubled letters and non-ascii words
+  And misspellings of the corpus words
+  When the user gets suggestions with both engines <switches> switches
+  Then the deletions engine suggests the same words as the edits engine
+
+  Examples:
+  | switches |
+  | with     |
+  | without  |
+
+Scenario: The user corrects a batch of words
+  Given a corpus with doubled letters and non-ascii words
+  And a word suggestor for the corpus
+  When the user corrects a batch of words with repeats
+  Then each word gets the same suggestions as correcting it alone
+  And each different word was only looked up once
+
+Scenario: The user corrects a batch of words with a pool of processes
+  Given a corpus with doubled letters and non-ascii words
+  And a word suggestor for the corpus
+  When the user corrects a batch of words with two processes
+  Then each word gets the same suggestions as correcting it alone
+  And the suggestions are cached
+
+Scenario: The user corrects a document
+  Given a corpus with doubled letters and non-ascii words
+  And a word suggestor for the corpus
+  When the user corrects a document
+  Then the misspelled words are replaced with their best suggestions
+
+Scenario Outline: The user changes the settings after correcting words
+  Given a corpus with doubled letters and non-ascii words
+  And a word suggestor with the <engine> engine and <count> suggestions
+  When the user corrects words before and after changing <setting>
+  Then the second batch matches a new suggestor with the new settings
+
+  Examples:
+  | engine    | count | setting       |
+  | edits     | 1     | suggestions   |
+  | edits     | 3     | want_switches |
+  | deletions | 1     | suggestions   |
+  | deletions | 3     | want_switches |
+
+Scenario: Two suggestors share a cache
+  Given a corpus with doubled letters and non-ascii words
+  When the user corrects words with two suggestors sharing a cache
+  Then each suggestor gets its own suggestions
+  And the cache holds the suggestions for both
@@ -0,0 +1,20 @@
+Feature: Vocabulary Trie
+
+Scenario Outline: The user finds the words within a few edits
+  Given a trie of random words
+  When the user finds the words within <distance> edits <switches> switches
+  Then they are the words a brute-force search finds
+
+  Examples:
+  | distance | switches |
+  | 1        | with     |
+  | 3        | with     |
+  | 4        | with     |
+  | 3        | without  |
+  | 4        | without  |
+
+Scenario: The trie only switches neighboring letters once
+  Given a trie with a word two edits away if a switch can follow a delete
+  When the user finds the words within two edits
+  Then the word isn't found
+  But the edits engine finds it
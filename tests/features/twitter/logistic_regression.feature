@@ -0,0 +1,37 @@
+Feature: Logistic Regression Tweet Sentiment Classifier
+
+Scenario Outline: The user fits the weights with a solver
+  Given a small separable set of tweet vectors
+  When the user fits the vectors with the <solver> solver
+  Then the loss is close to zero
+
+  Examples:
+  | solver |
+  | batch  |
+  | sgd    |
+  | lbfgs  |
+
+Scenario: The loss stops changing
+  Given a small separable set of tweet vectors
+  When the user fits the vectors with a tolerance
+  Then it stops before running all the iterations
+
+Scenario: The user fits the model twice
+  Given a logistic regression model with some tweets
+  When the user fits the model twice
+  Then both fits end with the same weights
+
+Scenario: The user saves and loads the model
+  Given a logistic regression model fit on some tweets
+  When the user saves and re-loads the model
+  Then the loaded model makes the same predictions
+
+Scenario Outline: The user loads a file that isn't a logistic regression model
+  Given a logistic regression model fit on some tweets
+  When the user saves the model with the wrong <field>
+  Then loading it raises a ModelFormatError
+
+  Examples:
+  | field          |
+  | model name     |
+  | format version |
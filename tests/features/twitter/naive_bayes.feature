@@ -34,3 +34,18 @@ Scenario: The user predicts tweet sentiment
   Given a valid Naive Bayes Classifier
   When the user predicts the sentiment of tweets
   Then the sentiments are the expected ones
+
+Scenario: The user updates the classifier with new tweets
+  Given a Naive Bayes Classifier trained on some of the tweets
+  When the user partially fits the rest of the tweets
+  Then it matches a classifier trained on all the tweets
+
+Scenario: The user predicts a batch of tweets
+  Given a Naive Bayes Classifier trained on some of the tweets
+  When the user predicts the ratios for a batch of tweets
+  Then they match the one-at-a-time predictions
+
+Scenario: The user saves and loads the classifier
+  Given a Naive Bayes Classifier trained on some of the tweets
+  When the user saves and re-loads the classifier
+  Then the loaded classifier makes the same predictions
@@ -0,0 +1,51 @@
+Feature: Batch Prefetcher
+
+Scenario Outline: The user prefetches the tweet batches
+  Given a tweet batch generator that isn't shuffled
+  When the user prefetches the batches with the <backend> backend
+  Then the batches come out in the same order as the generator's
+
+  Examples:
+  | backend |
+  | thread  |
+  | process |
+
+Scenario: The batch generator fails
+  Given a batch generator that raises an error part way through
+  When the user prefetches the batches
+  Then the batches before the error come out
+  And the error is raised in the training loop
+  And the prefetcher is finished
+
+Scenario: The batch generator is slower than the training loop
+  Given a slow batch generator
+  When the user prefetches the batches
+  Then the waits for the batches are counted
+
+Scenario: The user prefetches in a thread with a seed
+  Given a tweet batch generator that isn't shuffled
+  When the user prefetches the batches in a thread with a seed
+  Then the training loop's random state isn't changed
+
+Scenario: The user prefetches in a with block
+  Given a slow batch generator
+  When the user leaves the with block early
+  Then the background worker is stopped
+
+Scenario: The producer process raises an error that can't be pickled
+  Given a batch generator that raises an error that can't be pickled
+  When the user prefetches the batches in a process
+  Then the batches before the error come out
+  And the error's description is raised in the training loop
+
+Scenario: The producer process dies
+  Given a batch generator whose process dies part way through
+  When the user prefetches the batches in a process
+  Then the batches before the error come out
+  And the training loop is told the worker stopped
+
+Scenario: The user prefetches random batches in a process with a seed
+  Given a batch generator that uses the global random number generators
+  When the user prefetches the batches in processes with the same seed
+  Then the batches are the same each time
+  And another seed gives other batches
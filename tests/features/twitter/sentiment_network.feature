@@ -0,0 +1,13 @@
+Feature: Sentiment Network Predictions
+
+Scenario: The user predicts with a stand-in model
+  Given a sentiment network with a stand-in predictor
+  When the user predicts tweets of different lengths in small batches
+  Then the rows are in the order of the tweets
+  And they match predicting one tweet at a time
+
+Scenario: The user restores a trained network
+  Given a sentiment network trained for a few steps
+  When the user restores the network from its checkpoint
+  Then the restored network makes the same predictions
+  And they match predicting one tweet at a time
@@ -0,0 +1,63 @@
+Feature: Pre-Encoded Tweet Tensors
+
+Scenario: The user pads a batch of encoded tweets
+  Given some encoded tweets of different lengths
+  When the user pads a batch of them
+  Then the rows are the tweets filled out with padding
+
+Scenario: The user pads a positive and negative batch
+  Given encoded positive and negative tweets of different lengths
+  When the user pads a pair of batches
+  Then both halves are padded to the longest tweet
+
+Scenario: The user saves and memory-maps the encoded tweets
+  Given some encoded tweets of different lengths
+  When the user saves them and loads them back
+  Then the loaded tweets are memory-mapped copies of the originals
+
+Scenario: The user buckets the tweets by length
+  Given encoded positive and negative tweets of many lengths
+  When the user runs through one epoch of buckets
+  Then each batch comes from one bucket with that bucket's size
+
+Scenario: The user runs out of encoded tweets
+  Given encoded positive and negative tweets of different lengths
+  When the user generates batches that aren't infinite
+  Then the generator stops after the last full batch
+
+Scenario: The user re-uses a cache folder with the same settings
+  Given tweets encoded into a cache folder
+  When the user builds the tensors again with the same settings
+  Then the tensors are loaded from the cache
+
+Scenario Outline: The user re-uses a cache folder with other settings
+  Given tweets encoded into a cache folder
+  When the user builds the tensors again with <setting> set to <value>
+  Then the cache folder is refused
+
+  Examples:
+  | setting      | value |
+  | min_count    | 2     |
+  | max_size     | 3     |
+  | hash_buckets | 16    |
+
+Scenario Outline: The user builds a pruned vocabulary
+  Given a tensor builder with <setting> set to <value>
+  When the user converts a tweet to a tensor
+  Then the vocabulary is <vocabulary>
+  And the tensor is <tensor>
+  And the vocabulary size is <size>
+
+  Examples:
+  | setting   | value | vocabulary  | tensor  | size |
+  | min_count | 1     | b a c d e f | 4 5 2 2 | 9    |
+  | min_count | 2     | b a         | 4 2 2 2 | 5    |
+  | max_size  | 3     | b a c       | 4 5 2 2 | 6    |
+  | max_size  | 1     | a           | 3 2 2 2 | 4    |
+
+Scenario: The user hashes the tokens instead of building a vocabulary
+  Given a tensor builder with hash_buckets set to 16
+  When the user converts a tweet to a tensor
+  Then the vocabulary is only the special tokens
+  And the tensor is the hashed ids
+  And the vocabulary size is 19
@@ -41,3 +41,18 @@ Scenario: The user calls the processor
   Given a tweet
   When the processor is called with the tweet
   Then it returns the cleaned, tokenized, and stemmed list
+
+Scenario: The fast processor matches the processor
+  Given the NLTK twitter corpus
+  When the fast processor and the processor are called with the tweets
+  Then they return the same tokens
+
+Scenario: The stem cache is saved and warmed
+  Given a stem cache with some stems in it
+  When the stem cache is saved and a new one is warmed from it
+  Then the new cache has the stems without re-stemming
+
+Scenario: The user processes a batch of tweets with a pool of processes
+  Given a batch of tweets
+  When the batch is processed with two workers
+  Then the tweets are processed in the original order
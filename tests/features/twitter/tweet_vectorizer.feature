@@ -27,3 +27,8 @@ Scenario: the check-rep is called with a bad word-counter
 Given a Tweet Vectorizer with the wrong counter object
 When check-rep is called
 Then it raises an AssertionError
+
+Scenario: The sparse vectors match the extracted features
+Given a Tweet Vectorizer with random tweets
+When the user checks the count vectors
+Then they are the same as the extracted features
@@ -12,3 +12,20 @@ Scenario: The Word Frequency counter is called
   Given a word frequency counter
   When the counter is called
   Then the counts are the expected
+
+Scenario: The Word Frequency counter is updated from a stream of tweets
+  Given a file of tweets
+  When the counter is updated from a stream of the file
+  Then the counts are the expected
+
+Scenario: The Word Frequency counter builds a count matrix
+  Given a word frequency counter
+  When the count matrix is built
+  Then the counts are the expected
+  And the matrix rows have the counts
+
+Scenario: The Word Frequency counter is updated after the count matrix
+  Given a word frequency counter
+  When the count matrix is built
+  And the counter is updated with more tweets
+  Then the counts include the new tweets
@@ -0,0 +1,108 @@
+"""Aligning Strings feature tests."""
+# python
+import random
+
+# pypi
+from expects import (
+    be_above,
+    equal,
+    expect,
+    raise_error,
+)
+
+from pytest_bdd import (
+    given,
+    parsers,
+    scenarios,
+    then,
+    when,
+)
+
+# this test repo
+from fixtures import katamari
+
+# software under test
+from neurotic.nlp.autocorrect.alignment import Aligner
+
+and_also = then
+scenarios("autocorrect/alignment.feature")
+
+PAIRS = 300
+
+
+def find_path(source: str, target: str, **settings):
+    """The aligner's path or the IndexError class if it runs off the table"""
+    try:
+        return Aligner(source, target, **settings).path
+    except IndexError:
+        return IndexError
+
+# ********** #
+# Scenario Outline: The linear-space path is the full-table path
+
+
+@given("random pairs of strings to align")
+def setup_pairs(katamari):
+    generator = random.Random(0)
+
+    def random_string():
+        return "".join(generator.choice("abc")
+                       for _ in range(generator.randint(0, 9)))
+    katamari.pairs = [(random_string(), random_string())
+                      for _ in range(PAIRS)]
+    return
+
+
+@when(parsers.parse("the user finds the paths with the {engine} engine"))
+def find_paths(katamari, engine):
+    katamari.full = [find_path(source, target, engine=engine)
+                     for source, target in katamari.pairs]
+    katamari.linear = [find_path(source, target, linear_space=True)
+                       for source, target in katamari.pairs]
+    return
+
+
+@then("the linear-space paths are the full-table paths")
+def check_paths(katamari):
+    for pair, full, linear in zip(katamari.pairs, katamari.full,
+                                  katamari.linear):
+        expect((pair, linear)).to(equal((pair, full)))
+    found = sum(path is not IndexError for path in katamari.full)
+    expect(found).to(be_above(PAIRS//2))
+    return
+
+
+@and_also("the pairs that run off the full table run off the linear-space one")
+def check_wrapped(katamari):
+    wrapped = [pair for pair, path in zip(katamari.pairs, katamari.full)
+               if path is IndexError]
+    expect(len(wrapped)).to(be_above(0))
+    expect(wrapped).to(equal(
+        [pair for pair, path in zip(katamari.pairs, katamari.linear)
+         if path is IndexError]))
+    return
+
+# ********** #
+# Scenario Outline: The backtrace runs off the table
+
+
+@given(parsers.re('the strings "(?P<source>[a-z]*)" and "(?P<target>[a-z]*)"'
+                  ' to align'))
+def setup_strings(katamari, source, target):
+    katamari.source, katamari.target = source, target
+    return
+
+
+@when("the user finds the path both ways")
+def find_both_ways(katamari):
+    katamari.full = lambda: Aligner(katamari.source, katamari.target).path
+    katamari.linear = lambda: Aligner(katamari.source, katamari.target,
+                                      linear_space=True).path
+    return
+
+
+@then("both ways raise an IndexError")
+def check_index_error(katamari):
+    expect(katamari.full).to(raise_error(IndexError))
+    expect(katamari.linear).to(raise_error(IndexError))
+    return
@@ -0,0 +1,180 @@
+"""Compiled Autocorrect Corpus feature tests."""
+# pypi
+from expects import (
+    be_none,
+    equal,
+    expect,
+    raise_error,
+)
+
+from pytest_bdd import (
+    given,
+    parsers,
+    scenarios,
+    then,
+    when,
+)
+
+import numpy
+
+# this test repo
+from fixtures import katamari
+
+# software under test
+from neurotic.nlp.autocorrect.compiled import (
+    CompiledCorpus,
+    CorpusFormatError,
+    Files,
+    FORMAT_VERSION,
+    SortedStrings,
+)
+from neurotic.nlp.autocorrect.deletions import DeletionIndex
+from neurotic.nlp.autocorrect.preprocessing import CorpusBuilder
+from neurotic.nlp.autocorrect.suggestor import Engines, WordSuggestor
+
+and_also = then
+scenarios("autocorrect/compiled.feature")
+
+TEXT = """The bookkeeper ordered coffee at the café by the façade.
+A naïve committee wrote the bookkeeper a letter about the coffee.
+Straße is a street, a street is a straße and a letter is a letter."""
+
+WORDS = ["bokkeeper", "cofee", "caffé", "naive", "comittee", "strase",
+         "leter", "streeet", "th", "zzzzzz", "letter"]
+
+
+def compile_corpus(katamari, tmp_path, index: bool) -> None:
+    """Builds and compiles the corpus"""
+    path = tmp_path/"corpus.txt"
+    path.write_text(TEXT, encoding="utf-8")
+    katamari.corpus = CorpusBuilder(path)
+    katamari.compiled = CompiledCorpus.compile(katamari.corpus, index=index)
+    katamari.folder = tmp_path/"compiled"
+    return
+
+# ********** #
+# Scenario Outline: The user saves and loads a compiled corpus
+
+
+@given("a compiled corpus with non-ascii words")
+def setup_compiled(katamari, tmp_path):
+    compile_corpus(katamari, tmp_path, index=True)
+    return
+
+
+@when(parsers.parse("the user saves it and loads it back {how}"))
+def save_and_load(katamari, how):
+    katamari.memory_map = how == "with memory-mapping"
+    katamari.compiled.save(katamari.folder)
+    katamari.loaded = CompiledCorpus.load(katamari.folder,
+                                          memory_map=katamari.memory_map)
+    return
+
+
+@then("the loaded corpus has the same counts and probabilities")
+def check_counts(katamari):
+    expect(list(katamari.loaded.vocabulary)).to(
+        equal(sorted(katamari.corpus.vocabulary)))
+    expect(dict(katamari.loaded.counts)).to(equal(dict(katamari.corpus.counts)))
+    expect(dict(katamari.loaded.probabilities)).to(
+        equal(katamari.corpus.probabilities))
+    mapped = isinstance(katamari.loaded.word_counts, numpy.memmap)
+    expect(mapped).to(equal(katamari.memory_map))
+    return
+
+
+@and_also("the loaded deletion index finds the same candidates")
+def check_index(katamari):
+    index = DeletionIndex(katamari.corpus.vocabulary)
+    for word in WORDS:
+        expect((word, katamari.loaded.deletion_index.candidates(word))).to(
+            equal((word, index.candidates(word))))
+    return
+
+
+@and_also("the suggestors give the same suggestions as with the corpus builder")
+def check_suggestions(katamari):
+    for engine in vars(Engines).values():
+        expected = WordSuggestor(katamari.corpus, engine=engine)
+        actual = WordSuggestor(katamari.loaded, engine=engine)
+        for word in WORDS:
+            expect((engine, word, actual(word))).to(
+                equal((engine, word, expected(word))))
+    return
+
+# ********** #
+# Scenario: The user loads a compiled corpus without a deletion index
+
+
+@given("a compiled corpus without a deletion index")
+def setup_no_index(katamari, tmp_path):
+    compile_corpus(katamari, tmp_path, index=False)
+    return
+
+
+@and_also("the loaded corpus has no deletion index")
+def check_no_index(katamari):
+    expect(katamari.loaded.deletion_index).to(be_none)
+    expect((katamari.folder/Files.postings).exists()).to(equal(False))
+    return
+
+# ********** #
+# Scenario: The user loads a compiled corpus with another format version
+
+
+@given("a compiled corpus saved with another format version")
+def setup_old_format(katamari, tmp_path):
+    compile_corpus(katamari, tmp_path, index=True)
+    katamari.compiled.save(katamari.folder)
+    numpy.save(katamari.folder/Files.header,
+               numpy.array([FORMAT_VERSION + 1, True]))
+    return
+
+
+@when("the user loads the compiled corpus")
+def load_compiled(katamari):
+    katamari.load = lambda: CompiledCorpus.load(katamari.folder)
+    return
+
+
+@then("it raises a CorpusFormatError")
+def check_format_error(katamari):
+    expect(katamari.load).to(raise_error(CorpusFormatError))
+    return
+
+# ********** #
+# Scenario: The compiled vocabulary skips strings with lengths it doesn't have
+
+# the longest vocabulary word is 'bookkeeper' (10 bytes) and 'façade' and
+# 'straße' are 7 bytes since their non-ascii letters take two
+STRINGS = ["letter", "lettre", "façade", "facade", "straße", "bookkeeper",
+           "bookkeepers", "committeeman", "a", "zzzzzzzzzzzzzz"]
+
+
+@when("the user intersects the vocabulary with some strings")
+def intersect(katamari, mocker):
+    vocabulary = katamari.compiled.vocabulary
+    katamari.actual = vocabulary.intersection(STRINGS)
+    katamari.missing = [string for string in STRINGS
+                        if len(string.encode()) not in vocabulary.lengths]
+    katamari.search = mocker.spy(SortedStrings, "encoded")
+    katamari.skipped = vocabulary.intersection(katamari.missing)
+    return
+
+
+@then("the intersection matches the corpus builder's")
+def check_intersection(katamari):
+    expect(katamari.actual).to(
+        equal(katamari.corpus.vocabulary.intersection(STRINGS)))
+    return
+
+
+@and_also("the strings with missing lengths weren't searched for")
+def check_lengths(katamari):
+    expect(katamari.compiled.vocabulary.lengths).to(equal(
+        {len(word.encode()) for word in katamari.corpus.vocabulary}))
+    expect(katamari.missing).to(
+        equal(["bookkeepers", "committeeman", "zzzzzzzzzzzzzz"]))
+    expect(katamari.skipped).to(equal(set()))
+    expect(katamari.search.call_count).to(equal(0))
+    return
@@ -0,0 +1,95 @@
+"""Autocorrect Corpus Builder feature tests."""
+# python
+from collections import Counter
+
+# pypi
+from expects import (
+    equal,
+    expect,
+)
+
+from pytest_bdd import (
+    given,
+    parsers,
+    scenarios,
+    then,
+    when,
+)
+
+# this test repo
+from fixtures import katamari
+
+# software under test
+from neurotic.nlp.autocorrect.preprocessing import (
+    CorpusBuilder,
+    count_words,
+)
+
+scenarios("autocorrect/corpus_builder.feature")
+
+# words that run across the chunk boundaries, non-ascii letters and a word
+# at the very end of the file
+SHARDS = ["A bookkeeper's Café; naïve 42 under_score\n",
+          "I\nbookkeeper BOOKKEEPER\n\nstraße--façade a\n",
+          "Mississippi, mississippi... Ok"]
+
+# ********** #
+# Scenario Outline: The user counts a file a few characters at a time
+
+
+@given("a corpus file with words of different lengths")
+def setup_file(katamari, tmp_path):
+    katamari.path = tmp_path/"corpus.txt"
+    katamari.path.write_text("".join(SHARDS), encoding="utf-8")
+    return
+
+
+@when(parsers.parse("the user counts the words {size:d} characters at a time"))
+def count_chunks(katamari, size):
+    katamari.counts = count_words(katamari.path, chunk_size=size)
+    katamari.builder = CorpusBuilder(katamari.path, streaming=True,
+                                     chunk_size=size)
+    return
+
+
+@then("the counts are the same as counting the whole file at once")
+def check_counts(katamari):
+    expected = CorpusBuilder(katamari.path).counts
+    expect(katamari.counts).to(equal(expected))
+    expect(katamari.builder.counts).to(equal(expected))
+    expect(dict(katamari.builder.probabilities)).to(
+        equal(CorpusBuilder(katamari.path).probabilities))
+    return
+
+# ********** #
+# Scenario Outline: The user counts several files as one corpus
+
+
+@given("corpus files with words of different lengths")
+def setup_files(katamari, tmp_path):
+    katamari.paths = []
+    for index, text in enumerate(SHARDS):
+        path = tmp_path/f"shard_{index}.txt"
+        path.write_text(text, encoding="utf-8")
+        katamari.paths.append(path)
+    katamari.joined = tmp_path/"joined.txt"
+    katamari.joined.write_text("".join(SHARDS), encoding="utf-8")
+    return
+
+
+@when(parsers.parse("the user counts the files with {workers:d} workers"))
+def count_shards(katamari, workers):
+    katamari.builder = CorpusBuilder.from_shards(katamari.paths,
+                                                 workers=workers,
+                                                 chunk_size=4)
+    return
+
+
+@then("the counts are the same as counting the files joined together")
+def check_shard_counts(katamari):
+    # each file ends a word so joining them doesn't change the words
+    expected = CorpusBuilder(katamari.joined).counts
+    expect(katamari.builder.counts).to(equal(expected))
+    expect(isinstance(katamari.builder.counts, Counter)).to(equal(True))
+    expect(katamari.builder.vocabulary).to(equal(set(expected)))
+    return
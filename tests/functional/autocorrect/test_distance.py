@@ -0,0 +1,257 @@
+"""Minimum Edit Distance Engines feature tests."""
+# python
+import random
+
+# pypi
+from expects import (
+    be_none,
+    be_true,
+    contain,
+    equal,
+    expect,
+    raise_error,
+)
+
+from pytest_bdd import (
+    given,
+    parsers,
+    scenarios,
+    then,
+    when,
+)
+
+import numpy
+import pytest
+
+# this test repo
+from fixtures import katamari
+
+# software under test
+import neurotic.nlp.autocorrect.distance as distance
+from neurotic.nlp.autocorrect.distance import (
+    Engines,
+    MinimumEdits,
+    bounded_distance,
+    distance_table,
+    edit_distance,
+    pairwise_distances,
+)
+
+and_also = given
+scenarios("autocorrect/distance.feature")
+
+LETTERS = "abcdé"
+PAIRS = 50
+
+
+def random_string(generator: random.Random) -> str:
+    """A short string from a small alphabet (so there are matches)"""
+    return "".join(generator.choice(LETTERS)
+                   for _ in range(generator.randint(0, 12)))
+
+# ********** #
+# Scenario Outline: The faster engines match the python engine
+
+
+@given("random pairs of strings")
+def setup_pairs(katamari):
+    generator = random.Random(0)
+    katamari.pairs = [(random_string(generator), random_string(generator))
+                      for _ in range(PAIRS)]
+    # pairs that are close (or the same) so the limits have some under them
+    katamari.pairs += [(source, source[1:] + source[:1])
+                       for source, _ in katamari.pairs[:PAIRS//2]]
+    return
+
+
+@and_also(parsers.parse("the {engine} engine"))
+def setup_engine(katamari, engine):
+    if engine == Engines.numba:
+        # the numba engine falls back to numpy without numba so there's
+        # nothing new to check
+        pytest.importorskip("numba")
+    katamari.engine = engine
+    return
+
+
+@when(parsers.parse("the user works out the distances with costs "
+                    "{insertion:d}, {deletion:d} and {replacement:d}"))
+def work_out_distances(katamari, insertion, deletion, replacement):
+    costs = dict(insertion_cost=insertion, deletion_cost=deletion,
+                 replacement_cost=replacement)
+    katamari.expected, katamari.tables, katamari.distances = [], [], []
+    for source, target in katamari.pairs:
+        katamari.expected.append(MinimumEdits(source, target, **costs,
+                                              engine=Engines.python))
+        katamari.tables.append(MinimumEdits(
+            source, target, **costs, engine=katamari.engine).distance_table)
+        # asking for the distance first only keeps two rows
+        katamari.distances.append(MinimumEdits(
+            source, target, **costs, engine=katamari.engine).minimum_distance)
+    return
+
+
+@then("the tables and distances match the python engine's")
+def check_engines(katamari):
+    for expected, table, distance in zip(katamari.expected, katamari.tables,
+                                         katamari.distances):
+        expect(bool(numpy.array_equal(table, expected.distance_table))).to(
+            be_true)
+        expect((expected.source, expected.target, distance)).to(equal(
+            (expected.source, expected.target, expected.minimum_distance)))
+    return
+
+# ********** #
+# Scenario Outline: The user only wants distances within a limit
+
+
+@when(parsers.parse("the user works out the distances within {limit:d} with "
+                    "costs {insertion:d}, {deletion:d} and {replacement:d}"))
+def work_out_bounded(katamari, limit, insertion, deletion, replacement):
+    costs = dict(insertion_cost=insertion, deletion_cost=deletion,
+                 replacement_cost=replacement)
+    katamari.limit = limit
+    katamari.expected = [MinimumEdits(source, target, **costs).minimum_distance
+                         for source, target in katamari.pairs]
+    katamari.bounded = [bounded_distance(source, target, limit, **costs)
+                        for source, target in katamari.pairs]
+    katamari.methods = [MinimumEdits(source, target,
+                                     **costs).bounded_distance(limit)
+                        for source, target in katamari.pairs]
+    return
+
+
+@then("the distances within the limit are the minimum distances")
+def check_bounded(katamari):
+    for pair, expected, bounded, method in zip(
+            katamari.pairs, katamari.expected, katamari.bounded,
+            katamari.methods):
+        if expected <= katamari.limit:
+            expect((pair, bounded)).to(equal((pair, expected)))
+            expect((pair, method)).to(equal((pair, expected)))
+    return
+
+
+@then("the others are None")
+def check_over(katamari):
+    for pair, expected, bounded, method in zip(
+            katamari.pairs, katamari.expected, katamari.bounded,
+            katamari.methods):
+        if expected > katamari.limit:
+            expect(bounded).to(be_none)
+            expect(method).to(be_none)
+    return
+
+# ********** #
+# Scenario Outline: The user works out the distances between many strings
+
+
+@given("random sources and targets with shared prefixes")
+def setup_sources(katamari):
+    generator = random.Random(1)
+    stems = [random_string(generator) for _ in range(5)]
+    # repeats and shared prefixes exercise the stack of prefix rows
+    katamari.sources = [generator.choice(stems) + random_string(generator)
+                        for _ in range(17)] + ["", stems[0], stems[0]]
+    katamari.targets = [random_string(generator) for _ in range(11)] + [""]
+    return
+
+
+@when(parsers.parse(
+    "the user works out the pairwise distances in blocks of {size:d} with "
+    "{workers:d} workers and costs {insertion:d}, {deletion:d} and "
+    "{replacement:d}"))
+def work_out_pairwise(katamari, size, workers, insertion, deletion,
+                      replacement):
+    katamari.costs = dict(insertion_cost=insertion, deletion_cost=deletion,
+                          replacement_cost=replacement)
+    katamari.distances = pairwise_distances(
+        katamari.sources, katamari.targets, workers=workers,
+        block_size=size, **katamari.costs)
+    return
+
+
+@then("each distance is the minimum distance for that pair")
+def check_pairwise(katamari):
+    expected = numpy.array(
+        [[MinimumEdits(source, target, **katamari.costs).minimum_distance
+          for target in katamari.targets]
+         for source in katamari.sources])
+    expect(katamari.distances.shape).to(equal(expected.shape))
+    expect(bool(numpy.array_equal(katamari.distances, expected))).to(be_true)
+    return
+
+# ********** #
+# Scenario: The user works out the distances between one set of strings
+
+
+@when("the user works out the pairwise distances between the sources")
+def work_out_self_pairwise(katamari):
+    katamari.distances = pairwise_distances(katamari.sources, block_size=4,
+                                            insertion_cost=2, deletion_cost=2)
+    return
+
+
+@then("the distances are symmetric with zeros on the diagonal")
+def check_symmetric(katamari):
+    distances = katamari.distances
+    expect(bool((distances == distances.T).all())).to(be_true)
+    expect(bool((numpy.diag(distances) == 0).all())).to(be_true)
+    expect(int(distances[0, 1])).to(equal(MinimumEdits(
+        katamari.sources[0], katamari.sources[1], insertion_cost=2,
+        deletion_cost=2).minimum_distance))
+    return
+
+# ********** #
+# Scenario Outline: The user caps the memory for the rows
+
+
+@when(parsers.parse("the user works out the pairwise distances with at most "
+                    "{maximum:d} bytes of rows"))
+def work_out_capped(katamari, mocker, maximum):
+    katamari.costs = dict(insertion_cost=1, deletion_cost=1,
+                          replacement_cost=2)
+    katamari.blocks = mocker.spy(distance, "block_distances")
+    katamari.distances = pairwise_distances(
+        katamari.sources, katamari.targets,
+        maximum_bytes=maximum, **katamari.costs)
+    return
+
+
+@then(parsers.parse("the targets were split into groups of {group:d}"))
+def check_groups(katamari, group):
+    # the first call gets every target and splits them if it has to (the
+    # longest target has 12 characters and the longest source over 20 so
+    # a target's rows take over 1,000 bytes)
+    calls = katamari.blocks.call_args_list
+    splits = calls[1:] if len(calls) > 1 else calls
+    expect([len(call.args[1]) for call in splits]).to(equal(
+        [len(katamari.targets[start:start + group])
+         for start in range(0, len(katamari.targets), group)]))
+    return
+
+# ********** #
+# Scenario Outline: The user asks for an engine that doesn't exist
+
+
+@when(parsers.parse(
+    "the user works out a distance with the {engine} engine using {how}"))
+def unknown_engine(katamari, engine, how):
+    katamari.engine = engine
+    calls = {
+        "distance_table": lambda: distance_table("cat", "hat", engine=engine),
+        "edit_distance": lambda: edit_distance("cat", "hat", engine=engine),
+        "MinimumEdits.distance_table":
+        lambda: MinimumEdits("cat", "hat", engine=engine).distance_table,
+        "MinimumEdits.minimum_distance":
+        lambda: MinimumEdits("cat", "hat", engine=engine).minimum_distance,
+    }
+    katamari.call = calls[how]
+    return
+
+
+@then("it raises a ValueError for the engine")
+def check_unknown_engine(katamari):
+    expect(katamari.call).to(raise_error(
+        ValueError, contain(f"Unknown engine: {katamari.engine}")))
+    return
@@ -0,0 +1,83 @@
+# from python
+import subprocess
+import sys
+
+# from pypi
+from expects import (
+    contain,
+    expect,
+    have_key,
+)
+from pytest_bdd import (
+    given,
+    scenarios,
+    when,
+    then
+)
+
+# this test repo
+from fixtures import katamari
+
+# software under test
+from neurotic.nlp.autocorrect.distance import MinimumEdits
+
+and_also = then
+scenarios("autocorrect/import_time.feature")
+
+MODULES = ("alignment", "compiled", "deletions", "distance", "edits",
+           "preprocessing", "suggestor", "trie")
+PACKAGE = "neurotic.nlp.autocorrect"
+
+
+# Scenario: The autocorrect modules are imported
+
+
+@given("the import-time report for the autocorrect modules")
+def setup_import_time(katamari):
+    imports = "; ".join(f"import {PACKAGE}.{module}" for module in MODULES)
+    report = subprocess.run([sys.executable, "-X", "importtime", "-c", imports],
+                            capture_output=True, text=True, check=True).stderr
+    # lines look like "import time:  <self> | <cumulative> |   <module>"
+    katamari.times = {}
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_time, _, module = line[len("import time:"):].split("|")
+        katamari.times[module.strip()] = int(self_time)
+    return
+
+
+@then("pandas wasn't imported")
+def check_pandas(katamari):
+    expect(katamari.times).not_to(have_key("pandas"))
+    return
+
+
+@and_also("tabulate wasn't imported")
+def check_tabulate(katamari):
+    expect(katamari.times).not_to(have_key("tabulate"))
+    return
+
+
+# Scenario: A distance table is printed
+
+
+@given("a minimum edits object")
+def setup_minimum_edits(katamari):
+    katamari.editor = MinimumEdits("play", "stay")
+    return
+
+
+@when("the user prints the distance table")
+def print_table(katamari):
+    katamari.table = str(katamari.editor)
+    return
+
+
+@then("the table has the distances")
+def check_table(katamari):
+    rows = katamari.table.splitlines()
+    expect(rows[0]).to(contain("s"))
+    expect(rows[-1].split("|")[-2].strip()).to(contain(
+        str(katamari.editor.minimum_distance)))
+    return
@@ -0,0 +1,256 @@
+"""Autocorrect Word Suggestor Engines feature tests."""
+# python
+import random
+
+# pypi
+from expects import (
+    equal,
+    expect,
+)
+
+from pytest_bdd import (
+    given,
+    parsers,
+    scenarios,
+    then,
+    when,
+)
+
+# this test repo
+from fixtures import katamari
+
+# software under test
+from neurotic.nlp.autocorrect.preprocessing import CorpusBuilder
+from neurotic.nlp.autocorrect.suggestor import Engines, WordSuggestor
+from neurotic.nlp.lru_cache import LRUCache
+
+and_also = given
+scenarios("autocorrect/suggestor.feature")
+
+TEXT = """The bookkeeper's assistant ordered coffee at the café.
+A naïve committee met the bookkeeper about the coffee bill.
+Straße, façade and résumé were all misspelled in the letter.
+Mississippi is a long river and a longer word to spell.
+The committee's letter said the café façade was too small."""
+
+# misspellings that double letters, drop doubled letters, lose accents or
+# add them
+MISSPELLINGS = ["bokkeeper", "bookeeper", "bookkkeeper", "cofee", "coffe",
+                "cofffee", "cafe", "caffé", "cafè", "naive", "naïv",
+                "comittee", "committe", "commitee", "strase", "strasse",
+                "straß", "facade", "façad", "resumé", "résume", "leter",
+                "lettter", "misisippi", "mississipi", "smal", "smalll",
+                "rivre", "wrod", "eb", "ta"]
+RANDOM_MISSPELLINGS = 50
+LETTERS = "abcdefghijklmnopqrstuvwxyzéïçß"
+
+
+def misspell(word: str, generator: random.Random) -> str:
+    """Makes one or two random edits to the word"""
+    for _ in range(generator.randint(1, 2)):
+        index = generator.randrange(len(word) + 1)
+        edit = generator.choice(("insert", "delete", "replace", "double"))
+        if edit == "insert" or not word[index:]:
+            word = word[:index] + generator.choice(LETTERS) + word[index:]
+        elif edit == "delete":
+            word = word[:index] + word[index + 1:]
+        elif edit == "replace":
+            word = word[:index] + generator.choice(LETTERS) + word[index + 1:]
+        else:
+            word = word[:index] + word[index] + word[index:]
+    return word
+
+# ********** #
+# Scenario Outline: The deletion index finds the same suggestions as the edits
+
+
+@given("a corpus with doubled letters and non-ascii words")
+def setup_corpus(katamari, tmp_path):
+    path = tmp_path/"corpus.txt"
+    path.write_text(TEXT, encoding="utf-8")
+    katamari.corpus = CorpusBuilder(path)
+    return
+
+
+@and_also("misspellings of the corpus words")
+def setup_misspellings(katamari):
+    generator = random.Random(0)
+    vocabulary = sorted(katamari.corpus.vocabulary)
+    katamari.words = MISSPELLINGS + [
+        misspell(generator.choice(vocabulary), generator)
+        for _ in range(RANDOM_MISSPELLINGS)]
+    return
+
+
+@when(parsers.parse(
+    "the user gets suggestions with both engines {switches} switches"))
+def suggest(katamari, switches):
+    want_switches = switches == "with"
+    katamari.suggestions = {}
+    for engine in (Engines.edits, Engines.deletions):
+        suggestor = WordSuggestor(katamari.corpus, suggestions=3,
+                                  want_switches=want_switches, engine=engine)
+        katamari.suggestions[engine] = [sorted(suggestor.candidates(word))
+                                        for word in katamari.words]
+    return
+
+
+@then("the deletions engine suggests the same words as the edits engine")
+def check_suggestions(katamari):
+    edits = katamari.suggestions[Engines.edits]
+    deletions = katamari.suggestions[Engines.deletions]
+    for word, expected, actual in zip(katamari.words, edits, deletions):
+        expect((word, actual)).to(equal((word, expected)))
+    # make sure the misspellings found something to compare
+    found = sum(bool(candidates) for candidates in edits)
+    expect(found > len(katamari.words)//2).to(equal(True))
+    return
+
+# ********** #
+# Scenario: The user corrects a batch of words
+
+# known words, misspellings with suggestions and a word with none, repeated
+BATCH = ["cofee", "letter", "cafe", "lettter", "cofee", "zzzzzz", "caffé",
+         "lettter", "cofee"]
+
+
+@and_also("a word suggestor for the corpus")
+def setup_suggestor(katamari):
+    katamari.suggestor = WordSuggestor(katamari.corpus, suggestions=2)
+    katamari.expected = [WordSuggestor(katamari.corpus, suggestions=2)(word)
+                         for word in BATCH]
+    return
+
+
+@when("the user corrects a batch of words with repeats")
+def correct_batch(katamari, mocker):
+    katamari.lookups = mocker.spy(katamari.suggestor, "candidates")
+    katamari.actual = katamari.suggestor.correct_many(BATCH)
+    katamari.again = katamari.suggestor.correct_many(BATCH)
+    return
+
+
+@then("each word gets the same suggestions as correcting it alone")
+def check_batch(katamari):
+    expect(katamari.actual).to(equal(katamari.expected))
+    return
+
+
+@then("each different word was only looked up once")
+def check_lookups(katamari):
+    expect(katamari.again).to(equal(katamari.expected))
+    # 'letter' is in the vocabulary so it doesn't need candidates
+    unknown = {word for word in BATCH if word != "letter"}
+    expect(katamari.lookups.call_count).to(equal(len(unknown)))
+    different = len(set(BATCH))
+    expect(len(katamari.suggestor.cache)).to(equal(different))
+    expect(katamari.suggestor.cache.misses).to(equal(different))
+    expect(katamari.suggestor.cache.hits).to(equal(different))
+    return
+
+# ********** #
+# Scenario: The user corrects a batch of words with a pool of processes
+
+
+@when("the user corrects a batch of words with two processes")
+def correct_batch_pool(katamari):
+    katamari.actual = katamari.suggestor.correct_many(BATCH, workers=2,
+                                                      chunksize=1)
+    return
+
+
+@then("the suggestions are cached")
+def check_pool_cache(katamari):
+    expect(sorted(word for word in set(BATCH)
+                  if katamari.suggestor.cache_key(word)
+                  in katamari.suggestor.cache)).to(
+                          equal(sorted(set(BATCH))))
+    return
+
+# ********** #
+# Scenario: The user corrects a document
+
+
+@when("the user corrects a document")
+def correct_document(katamari):
+    katamari.actual = katamari.suggestor.correct_text(
+        "The Bookeeper's Cofee, at the Caffé; zzzzzz LETTTER!")
+    return
+
+
+@then("the misspelled words are replaced with their best suggestions")
+def check_document(katamari):
+    expect(katamari.actual).to(equal(
+        "The bookkeeper's coffee, at the café; zzzzzz letter!"))
+    return
+
+# ********** #
+# Scenario Outline: The user changes the settings after correcting words
+
+# 'ta' gets more suggestions with three allowed and loses 'at' without
+# switches, 'teh' has to look two edits away without switches
+SETTINGS_BATCH = ["ta", "teh", "cofee"]
+NEW_SETTINGS = dict(suggestions=3, want_switches=False)
+
+
+@given(parsers.parse(
+    "a word suggestor with the {engine} engine and {count:d} suggestions"))
+def setup_engine_suggestor(katamari, engine, count):
+    katamari.suggestor = WordSuggestor(katamari.corpus, suggestions=count,
+                                       engine=engine)
+    return
+
+
+@when(parsers.parse(
+    "the user corrects words before and after changing {setting}"))
+def correct_with_new_setting(katamari, setting):
+    katamari.before = katamari.suggestor.correct_many(SETTINGS_BATCH)
+    setattr(katamari.suggestor, setting, NEW_SETTINGS[setting])
+    katamari.after = katamari.suggestor.correct_many(SETTINGS_BATCH)
+    katamari.expected = [
+        WordSuggestor(katamari.corpus,
+                      suggestions=katamari.suggestor.suggestions,
+                      want_switches=katamari.suggestor.want_switches,
+                      engine=katamari.suggestor.engine)(word)
+        for word in SETTINGS_BATCH]
+    return
+
+
+@then("the second batch matches a new suggestor with the new settings")
+def check_new_settings(katamari):
+    expect(katamari.after).to(equal(katamari.expected))
+    expect(katamari.after).not_to(equal(katamari.before))
+    return
+
+# ********** #
+# Scenario: Two suggestors share a cache
+
+
+@when("the user corrects words with two suggestors sharing a cache")
+def correct_shared_cache(katamari):
+    katamari.cache = LRUCache()
+    katamari.suggestors = [
+        WordSuggestor(katamari.corpus, suggestions=suggestions,
+                      cache=katamari.cache)
+        for suggestions in (1, 3)]
+    katamari.actual = [suggestor.correct_many(SETTINGS_BATCH)
+                       for suggestor in katamari.suggestors]
+    return
+
+
+@then("each suggestor gets its own suggestions")
+def check_shared_suggestions(katamari):
+    for suggestor, actual in zip(katamari.suggestors, katamari.actual):
+        expect(actual).to(equal([suggestor(word) for word in SETTINGS_BATCH]))
+    expect(katamari.actual[0]).not_to(equal(katamari.actual[1]))
+    return
+
+
+@then("the cache holds the suggestions for both")
+def check_shared_cache(katamari):
+    expect(len(katamari.cache)).to(equal(2 * len(SETTINGS_BATCH)))
+    expect(katamari.cache.hits).to(equal(0))
+    for suggestor in katamari.suggestors:
+        for word in SETTINGS_BATCH:
+            expect(suggestor.cache_key(word) in katamari.cache).to(equal(True))
+    return
@@ -0,0 +1,144 @@
+"""Vocabulary Trie feature tests."""
+# python
+import random
+
+# pypi
+from expects import (
+    be_empty,
+    equal,
+    expect,
+)
+
+from pytest_bdd import (
+    given,
+    parsers,
+    scenarios,
+    then,
+    when,
+)
+
+# this test repo
+from fixtures import katamari
+
+# software under test
+from neurotic.nlp.autocorrect.distance import edit_distance
+from neurotic.nlp.autocorrect.suggestor import WordSuggestor
+from neurotic.nlp.autocorrect.trie import VocabularyTrie
+
+but_also = then
+scenarios("autocorrect/trie.feature")
+
+# a small alphabet so that lots of words are close to each other
+LETTERS = "abcd"
+WORDS = 300
+QUERIES = 30
+
+
+def random_word(generator: random.Random) -> str:
+    """A short word made from the LETTERS"""
+    return "".join(generator.choice(LETTERS)
+                   for _ in range(generator.randint(0, 7)))
+
+
+def restricted_distance(source: str, target: str) -> int:
+    """The full-table optimal string alignment distance
+
+    Args:
+     source: the word to edit
+     target: the word to edit it into
+
+    Returns:
+     the fewest inserts, deletes, replacements and (once-only) switches
+    """
+    table = [[row + column if not row * column else 0
+              for column in range(len(target) + 1)]
+             for row in range(len(source) + 1)]
+    for row in range(1, len(source) + 1):
+        for column in range(1, len(target) + 1):
+            table[row][column] = min(
+                table[row - 1][column] + 1,
+                table[row][column - 1] + 1,
+                table[row - 1][column - 1]
+                + (source[row - 1] != target[column - 1]))
+            if (row > 1 and column > 1
+                    and source[row - 1] == target[column - 2]
+                    and source[row - 2] == target[column - 1]):
+                table[row][column] = min(table[row][column],
+                                         table[row - 2][column - 2] + 1)
+    return table[-1][-1]
+
+# ********** #
+# Scenario Outline: The user finds the words within a few edits
+
+
+@given("a trie of random words")
+def setup_trie(katamari):
+    generator = random.Random(0)
+    katamari.vocabulary = {random_word(generator) for _ in range(WORDS)}
+    katamari.trie = VocabularyTrie(katamari.vocabulary)
+    katamari.queries = ([random_word(generator) for _ in range(QUERIES)]
+                        + sorted(katamari.vocabulary)[:QUERIES])
+    return
+
+
+@when(parsers.parse(
+    "the user finds the words within {distance:d} edits {switches} switches"))
+def find_within(katamari, distance, switches):
+    katamari.distance = distance
+    katamari.want_switches = switches == "with"
+    katamari.found = [katamari.trie.within(query, distance,
+                                           katamari.want_switches)
+                      for query in katamari.queries]
+    return
+
+
+@then("they are the words a brute-force search finds")
+def check_within(katamari):
+    for query, found in zip(katamari.queries, katamari.found):
+        if katamari.want_switches:
+            distances = {word: restricted_distance(query, word)
+                         for word in katamari.vocabulary}
+        else:
+            distances = {word: edit_distance(query, word, replacement_cost=1)
+                         for word in katamari.vocabulary}
+        expected = {word: distance for word, distance in distances.items()
+                    if distance <= katamari.distance}
+        expect((query, found)).to(equal((query, expected)))
+    return
+
+# ********** #
+# Scenario: The trie only switches neighboring letters once
+
+
+class Corpus:
+    """A one-word corpus"""
+    vocabulary = {"cabgb"}
+    probabilities = {"cabgb": 1}
+
+
+@given("a trie with a word two edits away if a switch can follow a delete")
+def setup_switch_trie(katamari):
+    katamari.corpus = Corpus()
+    katamari.trie = VocabularyTrie(katamari.corpus.vocabulary)
+    katamari.word = "adcbgb"
+    return
+
+
+@when("the user finds the words within two edits")
+def find_within_two(katamari):
+    katamari.found = katamari.trie.within(katamari.word, 2)
+    return
+
+
+@then("the word isn't found")
+def check_not_found(katamari):
+    expect(katamari.found).to(be_empty)
+    expect(katamari.trie.within(katamari.word, 3)).to(equal({"cabgb": 3}))
+    return
+
+
+@but_also("the edits engine finds it")
+def check_edits_engine(katamari):
+    expect(WordSuggestor(katamari.corpus).candidates(katamari.word)).to(
+        equal({"cabgb"}))
+    return
@@ -0,0 +1,205 @@
+"""LogisticRegression Tweet Sentiment Classifier feature tests."""
+
+# pypi
+from expects import (
+    be_below,
+    be_true,
+    equal,
+    expect,
+    raise_error,
+)
+
+from pytest_bdd import (
+    given,
+    parsers,
+    scenarios,
+    then,
+    when,
+)
+
+import numpy
+import pandas
+
+# this test repo
+from fixtures import katamari
+
+# software under test
+from neurotic.nlp.twitter.counter import WordCounter
+from neurotic.nlp.twitter.logistic_regression import (
+    LogisticRegression,
+    Solvers,
+)
+from neurotic.nlp.twitter.persistence import Keys, ModelFormatError
+from neurotic.nlp.twitter.processor import TwitterProcessor
+
+scenarios("twitter/logistic_regression.feature")
+
+ITERATIONS = 200
+LEARNING_RATE = 0.1
+SIZE = 20
+
+# ********** #
+# Scenario Outline: The user fits the weights with a solver
+
+
+@given("a small separable set of tweet vectors")
+def setup_vectors(katamari):
+    generator = numpy.random.default_rng(0)
+    positive = numpy.column_stack([numpy.ones(SIZE),
+                                   generator.integers(5, 10, SIZE),
+                                   generator.integers(0, 3, SIZE)])
+    negative = numpy.column_stack([numpy.ones(SIZE),
+                                   generator.integers(0, 3, SIZE),
+                                   generator.integers(5, 10, SIZE)])
+    katamari.x = numpy.vstack([positive, negative]).astype(float)
+    katamari.y = numpy.vstack([numpy.ones((SIZE, 1)), numpy.zeros((SIZE, 1))])
+    return
+
+
+@when(parsers.parse("the user fits the vectors with the {solver} solver"))
+def fit_vectors(katamari, solver):
+    katamari.model = LogisticRegression(iterations=ITERATIONS,
+                                        learning_rate=LEARNING_RATE,
+                                        solver=solver, batch_size=8, seed=1)
+    solvers = {Solvers.batch: katamari.model.gradient_descent,
+               Solvers.sgd: katamari.model.stochastic_gradient_descent,
+               Solvers.lbfgs: katamari.model.lbfgs}
+    katamari.loss = solvers[solver](katamari.x, katamari.y)
+    return
+
+
+@then("the loss is close to zero")
+def check_loss(katamari):
+    expect(katamari.loss).to(be_below(0.01))
+    expect(bool(numpy.isclose(
+        katamari.loss, katamari.model.log_loss(katamari.x, katamari.y),
+        rtol=0.01))).to(be_true)
+    return
+
+# ********** #
+# Scenario: The loss stops changing
+
+
+@when("the user fits the vectors with a tolerance")
+def fit_with_tolerance(katamari, mocker):
+    katamari.iterations = 10000
+    katamari.model = LogisticRegression(iterations=katamari.iterations,
+                                        learning_rate=LEARNING_RATE,
+                                        tolerance=1e-3, loss_every=1)
+    katamari.sigmoid = mocker.spy(katamari.model, "sigmoid")
+    katamari.model.gradient_descent(katamari.x, katamari.y)
+    return
+
+
+@then("it stops before running all the iterations")
+def check_stopped(katamari):
+    expect(katamari.sigmoid.call_count).to(be_below(katamari.iterations))
+    return
+
+# ********** #
+# Scenario: The user fits the model twice
+
+
+@given("a logistic regression model with some tweets")
+def setup_model(katamari, faker, mocker):
+    mocker.patch(
+        "neurotic.nlp.twitter.logistic_regression.WordCounter",
+        side_effect=lambda tweets, labels: WordCounter(tweets, labels,
+                                                       process=str.split))
+    words = faker.words(nb=20, unique=True)
+    katamari.tweets = [" ".join(faker.random_choices(words, length=5))
+                       for tweet in range(SIZE)]
+    katamari.labels = pandas.Series([index % 2 for index in range(SIZE)])
+    katamari.model = LogisticRegression(iterations=ITERATIONS,
+                                        learning_rate=LEARNING_RATE)
+    return
+
+
+@when("the user fits the model twice")
+def fit_twice(katamari):
+    katamari.first_loss = katamari.model.fit(katamari.tweets, katamari.labels)
+    katamari.first_weights = katamari.model.weights.copy()
+    katamari.second_loss = katamari.model.fit(katamari.tweets, katamari.labels)
+    return
+
+
+@then("both fits end with the same weights")
+def check_same_weights(katamari):
+    expect(katamari.second_loss).to(equal(katamari.first_loss))
+    expect(numpy.array_equal(katamari.model.weights,
+                             katamari.first_weights)).to(be_true)
+    return
+
+# ********** #
+# Scenario: The user saves and loads the model
+
+# given to the processor so it doesn't need the NLTK stopwords
+STOPWORDS = ["the", "a", "is"]
+
+
+@given("a logistic regression model fit on some tweets")
+def setup_fit_model(katamari, faker, mocker, tmp_path):
+    mocker.patch(
+        "neurotic.nlp.twitter.logistic_regression.WordCounter",
+        side_effect=lambda tweets, labels: WordCounter(
+            tweets, labels, process=TwitterProcessor(stopwords=STOPWORDS)))
+    words = faker.words(nb=20, unique=True)
+    positive, negative = words[:10], words[10:]
+    katamari.tweets = (
+        [" ".join(faker.random_choices(positive, length=5))
+         for tweet in range(SIZE)]
+        + [" ".join(faker.random_choices(negative, length=5))
+           for tweet in range(SIZE)]
+        + [" ".join(faker.random_choices(words, length=5))
+           for tweet in range(SIZE)])
+    labels = [1] * SIZE + [0] * SIZE + [index % 2 for index in range(SIZE)]
+    # the raw counts are big enough that the default rate saturates the loss
+    katamari.model = LogisticRegression(iterations=ITERATIONS,
+                                        learning_rate=LEARNING_RATE/100)
+    katamari.model.fit(katamari.tweets, pandas.Series(labels))
+    katamari.path = tmp_path/"logistic_regression.npz"
+    return
+
+
+@when("the user saves and re-loads the model")
+def save_and_load(katamari):
+    katamari.model.save(katamari.path)
+    katamari.loaded = LogisticRegression.load(katamari.path)
+    return
+
+
+@then("the loaded model makes the same predictions")
+def check_loaded_predictions(katamari):
+    expect(katamari.loaded.counter.process.stopwords).to(equal(STOPWORDS))
+    expect(katamari.loaded.iterations).to(equal(ITERATIONS))
+    expect(numpy.array_equal(katamari.loaded.weights,
+                             katamari.model.weights)).to(be_true)
+    expected = katamari.model.predict(katamari.tweets)
+    expect(len(set(expected.ravel().tolist()))).to(equal(2))
+    actual = katamari.loaded.predict(katamari.tweets)
+    expect(numpy.array_equal(actual, expected)).to(be_true)
+    return
+
+# ********** #
+# Scenario Outline: The user loads a file that isn't a logistic regression model
+
+
+@when(parsers.parse("the user saves the model with the wrong {field}"))
+def save_wrong(katamari, field):
+    katamari.model.save(katamari.path)
+    with numpy.load(katamari.path) as saved:
+        arrays = {key: saved[key] for key in saved.files}
+    if field == "model name":
+        arrays[Keys.model] = numpy.array("naive_bayes")
+    else:
+        arrays[Keys.version] = arrays[Keys.version] + 1
+    with katamari.path.open("wb") as writer:
+        numpy.savez(writer, **arrays)
+    return
+
+
+@then("loading it raises a ModelFormatError")
+def check_format_error(katamari):
+    expect(lambda: LogisticRegression.load(katamari.path)).to(
+        raise_error(ModelFormatError))
+    return
@@ -29,6 +29,7 @@ from fixtures import katamari
 # software under test
 from neurotic.nlp.twitter.counter import WordCounter
 from neurotic.nlp.twitter.naive_bayes import NaiveBayes
+from neurotic.nlp.twitter.processor import TwitterProcessor
 
 scenarios("twitter/naive_bayes.feature")
 
@@ -194,3 +195,103 @@ def expect_sentiments(katamari):
     expect(katamari.actual_1).to(equal(katamari.expected_1))
     expect(katamari.actual_2).to(equal(katamari.expected_2))
     return
+
+
+# ********** #
+# Scenario: The user updates the classifier with new tweets
+
+
+def split_classifier(tweets: list, labels: list) -> NaiveBayes:
+    """Builds a classifier that tokenizes by splitting on spaces"""
+    classifier = NaiveBayes(tweets=tweets, labels=labels)
+    classifier.counter._process = str.split
+    return classifier
+
+
+@given("a Naive Bayes Classifier trained on some of the tweets")
+def setup_partial_classifier(katamari, faker):
+    words = faker.words(nb=30, unique=True)
+    katamari.tweets = [" ".join(faker.random_choices(words, length=5))
+                       for tweet in range(40)]
+    katamari.labels = [index % 2 for index in range(40)]
+    katamari.classifier = split_classifier(katamari.tweets[:10],
+                                           katamari.labels[:10])
+    katamari.classifier.loglikelihood
+    return
+
+
+@when("the user partially fits the rest of the tweets")
+def partial_fit(katamari):
+    katamari.classifier.partial_fit(katamari.tweets[10:25],
+                                    katamari.labels[10:25])
+    katamari.classifier.predict_ratio(katamari.tweets[0])
+    katamari.classifier.partial_fit(katamari.tweets[25:],
+                                    katamari.labels[25:])
+    return
+
+
+@then("it matches a classifier trained on all the tweets")
+def expect_same_classifier(katamari):
+    expected = split_classifier(katamari.tweets, katamari.labels)
+    actual = katamari.classifier
+    expect(math.isclose(actual.logprior, expected.logprior)).to(be_true)
+    expect(actual.vocabulary).to(equal(expected.vocabulary))
+    for word, loglikelihood in expected.loglikelihood.items():
+        expect(math.isclose(actual.loglikelihood[word],
+                            loglikelihood)).to(be_true)
+    for tweet in katamari.tweets:
+        expect(math.isclose(actual.predict_ratio(tweet),
+                            expected.predict_ratio(tweet))).to(be_true)
+    return
+
+
+# ********** #
+# Scenario: The user predicts a batch of tweets
+#  Given a Naive Bayes Classifier trained on some of the tweets
+
+
+@when("the user predicts the ratios for a batch of tweets")
+def predict_batch(katamari):
+    katamari.batch = katamari.tweets + ["unknown words only", ""]
+    katamari.actual = katamari.classifier.predict_ratios(katamari.batch)
+    katamari.actual_sentiments = katamari.classifier.predict_many(
+        katamari.batch)
+    return
+
+
+@then("they match the one-at-a-time predictions")
+def expect_batch_predictions(katamari):
+    classifier = katamari.classifier
+    expect(len(katamari.actual)).to(equal(len(katamari.batch)))
+    for tweet, ratio, sentiment in zip(katamari.batch, katamari.actual,
+                                       katamari.actual_sentiments):
+        expect(math.isclose(ratio, classifier.predict_ratio(tweet))).to(
+            be_true)
+        expect(sentiment).to(equal(int(classifier.predict_sentiment(tweet))))
+    return
+
+
+# ********** #
+# Scenario: The user saves and loads the classifier
+#  Given a Naive Bayes Classifier trained on some of the tweets
+
+
+@when("the user saves and re-loads the classifier")
+def save_and_load(katamari, tmp_path):
+    katamari.classifier.counter._process = TwitterProcessor(stopwords=["a"])
+    path = tmp_path/"naive_bayes.npz"
+    katamari.classifier.save(path)
+    katamari.loaded = NaiveBayes.load(path)
+    return
+
+
+@then("the loaded classifier makes the same predictions")
+def expect_same_predictions(katamari):
+    expect(katamari.loaded.counter.process.stopwords).to(equal(["a"]))
+    expect(katamari.loaded.vocabulary).to(
+        equal(katamari.classifier.vocabulary))
+    expected = katamari.classifier.predict_ratios(katamari.tweets)
+    actual = katamari.loaded.predict_ratios(katamari.tweets)
+    for expected_ratio, actual_ratio in zip(expected, actual):
+        expect(math.isclose(actual_ratio, expected_ratio)).to(be_true)
+    return
@@ -0,0 +1,312 @@
+"""Batch Prefetcher feature tests."""
+# python
+import os
+import random
+import time
+
+# pypi
+from expects import (
+    be_a,
+    be_above,
+    be_below_or_equal,
+    be_false,
+    be_none,
+    be_true,
+    contain,
+    equal,
+    expect,
+    raise_error,
+)
+
+from pytest_bdd import (
+    given,
+    parsers,
+    scenarios,
+    then,
+    when,
+)
+
+import numpy
+
+# this test repo
+from fixtures import katamari
+
+# software under test
+from neurotic.nlp.prefetcher import Backends, Prefetcher, WorkerError
+from neurotic.nlp.twitter.tensor_generator import (
+    RaggedTensors,
+    TensorBuilder,
+    TensorGenerator,
+)
+
+scenarios("twitter/prefetcher.feature")
+
+BATCHES = 3
+DELAY = 0.05
+
+
+class Broken(Exception):
+    """The error the failing generator raises"""
+
+
+def failing_generator():
+    """Yields two batches then fails"""
+    yield 0
+    yield 1
+    raise Broken("out of tweets")
+
+
+class Unpicklable(Exception):
+    """An error holding something pickle can't handle"""
+    def __init__(self):
+        super().__init__("can't pickle this")
+        self.callback = lambda: None
+
+
+def unpicklable_generator():
+    """Yields two batches then fails with an error that can't be pickled"""
+    yield 0
+    yield 1
+    raise Unpicklable()
+
+
+def dying_generator():
+    """Yields two batches then kills the process it's in"""
+    yield 0
+    yield 1
+    # give the queue time to send the batches
+    time.sleep(DELAY)
+    os._exit(1)
+
+
+def random_generator():
+    """Batches from python's and numpy's global generators"""
+    for batch in range(BATCHES):
+        yield random.random(), numpy.random.random(2).tolist()
+
+
+def slow_generator():
+    """Takes a while to make each batch"""
+    for batch in range(BATCHES):
+        time.sleep(DELAY)
+        yield batch
+
+
+def tweet_generator() -> TensorGenerator:
+    """Makes batches of encoded tweets in a fixed order"""
+    positive = RaggedTensors.from_lists([[3], [4, 5], [6], [7], [8, 9], [10]])
+    negative = RaggedTensors.from_lists([[11, 12, 13], [14], [15, 16], [17],
+                                         [18], [19, 20]])
+    return TensorGenerator(TensorBuilder(), positive, negative, batch_size=4,
+                           shuffle=False, infinite=False)
+
+# ********** #
+# Scenario Outline: The user prefetches the tweet batches
+
+
+@given("a tweet batch generator that isn't shuffled")
+def setup_tweet_generator(katamari):
+    katamari.generator = tweet_generator()
+    katamari.expected = list(tweet_generator())
+    return
+
+
+@when(parsers.parse("the user prefetches the batches with the {backend} backend"))
+def prefetch_backend(katamari, backend):
+    katamari.prefetcher = Prefetcher(katamari.generator, depth=1,
+                                     backend=backend)
+    katamari.batches = list(katamari.prefetcher)
+    return
+
+
+@then("the batches come out in the same order as the generator's")
+def check_order(katamari):
+    expect(len(katamari.batches)).to(equal(len(katamari.expected)))
+    for actual, expected in zip(katamari.batches, katamari.expected):
+        for actual_array, expected_array in zip(actual, expected):
+            expect(bool(numpy.array_equal(actual_array,
+                                          expected_array))).to(be_true)
+    expect(katamari.prefetcher.batches).to(equal(len(katamari.expected)))
+    return
+
+# ********** #
+# Scenario: The batch generator fails
+
+
+@given("a batch generator that raises an error part way through")
+def setup_failing(katamari):
+    katamari.generator = failing_generator()
+    return
+
+
+@when("the user prefetches the batches")
+def prefetch(katamari):
+    katamari.prefetcher = Prefetcher(katamari.generator)
+    katamari.batches = []
+    katamari.error = None
+    try:
+        for batch in katamari.prefetcher:
+            katamari.batches.append(batch)
+    except Broken as error:
+        katamari.error = error
+    return
+
+
+@then("the batches before the error come out")
+def check_before_error(katamari):
+    expect(katamari.batches).to(equal([0, 1]))
+    return
+
+
+@then("the error is raised in the training loop")
+def check_error(katamari):
+    expect(str(katamari.error)).to(equal("out of tweets"))
+    return
+
+
+@then("the prefetcher is finished")
+def check_finished(katamari):
+    expect(lambda: next(katamari.prefetcher)).to(raise_error(StopIteration))
+    expect(katamari.prefetcher._worker).to(be_none)
+    return
+
+# ********** #
+# Scenario: The batch generator is slower than the training loop
+
+
+@given("a slow batch generator")
+def setup_slow(katamari):
+    katamari.generator = slow_generator()
+    return
+
+
+@then("the waits for the batches are counted")
+def check_stalls(katamari):
+    expect(katamari.error).to(be_none)
+    expect(katamari.batches).to(equal(list(range(BATCHES))))
+    # every batch (and the end) had to be waited for
+    expect(katamari.prefetcher.stalls).to(be_above(BATCHES - 1))
+    expect(katamari.prefetcher.stall_seconds).to(
+        be_above(DELAY * (BATCHES - 1)))
+    expect(katamari.prefetcher.stall_fraction).to(be_above(0.5))
+    expect(katamari.prefetcher.stall_fraction).to(be_below_or_equal(1))
+    return
+
+# ********** #
+# Scenario: The user prefetches in a thread with a seed
+
+
+@when("the user prefetches the batches in a thread with a seed")
+def prefetch_seeded(katamari):
+    random.seed(1)
+    numpy.random.seed(1)
+    katamari.python_state = random.getstate()
+    katamari.numpy_state = numpy.random.get_state()[1].copy()
+    katamari.batches = list(Prefetcher(katamari.generator, seed=0))
+    return
+
+
+@then("the training loop's random state isn't changed")
+def check_random_state(katamari):
+    expect(len(katamari.batches)).to(equal(len(katamari.expected)))
+    expect(random.getstate() == katamari.python_state).to(be_true)
+    expect(bool(numpy.array_equal(numpy.random.get_state()[1],
+                                  katamari.numpy_state))).to(be_true)
+    return
+
+# ********** #
+# Scenario: The user prefetches in a with block
+
+
+@when("the user leaves the with block early")
+def leave_early(katamari):
+    with Prefetcher(katamari.generator) as batches:
+        katamari.worker = batches._worker
+        katamari.first = next(batches)
+    katamari.prefetcher = batches
+    return
+
+
+@then("the background worker is stopped")
+def check_stopped(katamari):
+    expect(katamari.first).to(equal(0))
+    expect(katamari.worker.is_alive()).to(be_false)
+    expect(katamari.prefetcher._worker).to(be_none)
+    return
+
+# ********** #
+# Scenario: The producer process raises an error that can't be pickled
+
+
+@given("a batch generator that raises an error that can't be pickled")
+def setup_unpicklable(katamari):
+    katamari.generator = unpicklable_generator()
+    return
+
+
+@when("the user prefetches the batches in a process")
+def prefetch_process(katamari):
+    katamari.prefetcher = Prefetcher(katamari.generator,
+                                     backend=Backends.process)
+    katamari.batches = []
+    katamari.error = None
+    try:
+        for batch in katamari.prefetcher:
+            katamari.batches.append(batch)
+    except Exception as error:
+        katamari.error = error
+    return
+
+
+@then("the error's description is raised in the training loop")
+def check_unpicklable(katamari):
+    expect(katamari.error).to(be_a(WorkerError))
+    expect(str(katamari.error)).to(contain("can't pickle this"))
+    return
+
+# ********** #
+# Scenario: The producer process dies
+
+
+@given("a batch generator whose process dies part way through")
+def setup_dying(katamari):
+    katamari.generator = dying_generator()
+    return
+
+
+@then("the training loop is told the worker stopped")
+def check_died(katamari):
+    expect(katamari.error).to(be_a(WorkerError))
+    expect(str(katamari.error)).to(contain("stopped without finishing"))
+    expect(lambda: next(katamari.prefetcher)).to(raise_error(StopIteration))
+    return
+
+# ********** #
+# Scenario: The user prefetches random batches in a process with a seed
+
+
+@given("a batch generator that uses the global random number generators")
+def setup_random(katamari):
+    katamari.prefetch = lambda seed: list(Prefetcher(
+        random_generator(), backend=Backends.process, seed=seed))
+    return
+
+
+@when("the user prefetches the batches in processes with the same seed")
+def prefetch_seeded_processes(katamari):
+    katamari.first = katamari.prefetch(7)
+    katamari.second = katamari.prefetch(7)
+    return
+
+
+@then("the batches are the same each time")
+def check_same_batches(katamari):
+    expect(len(katamari.first)).to(equal(BATCHES))
+    expect(katamari.second).to(equal(katamari.first))
+    return
+
+
+@then("another seed gives other batches")
+def check_other_seed(katamari):
+    expect(katamari.prefetch(8)).not_to(equal(katamari.first))
+    return
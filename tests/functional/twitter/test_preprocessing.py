@@ -15,15 +15,34 @@ from pytest_bdd import (
     when,
 )
 
+from nltk.corpus import twitter_samples
+
+import nltk
+import pytest
+
 And = when
 
 
 # fixtures
-from fixtures import katamari, processor
+from fixtures import katamari
+
+# software under test
+from neurotic.nlp.twitter.processor import (
+    FastTwitterProcessor,
+    TwitterProcessor,
+)
+from neurotic.nlp.twitter.stem_cache import StemCache
 
 scenarios("twitter/tweet_preprocessing.feature")
 
 
+# the autocorrect tests have a fixtures module too and only one of them gets
+# imported, so the fixtures that aren't shared are kept here
+@pytest.fixture
+def processor():
+    return TwitterProcessor()
+
+
 #Scenario: A tweet with a stock symbol is cleaned
 
 
@@ -169,3 +188,87 @@ def process_tweet(katamari, processor):
 def check_processed_tweet(katamari):
     expect(katamari.actual).to(contain_exactly(*katamari.expected))
     return
+
+
+# Scenario: The fast processor matches the processor
+
+
+@given("the NLTK twitter corpus")
+def setup_corpus(katamari):
+    nltk.download("twitter_samples", quiet=True)
+    katamari.tweets = (twitter_samples.strings("positive_tweets.json")
+                       + twitter_samples.strings("negative_tweets.json"))
+    return
+
+
+@when("the fast processor and the processor are called with the tweets")
+def process_with_both(katamari, processor):
+    fast = FastTwitterProcessor()
+    katamari.expected = [processor(tweet) for tweet in katamari.tweets]
+    katamari.actual = [fast(tweet) for tweet in katamari.tweets]
+    return
+
+
+@then("they return the same tokens")
+def check_same_tokens(katamari):
+    expect(katamari.actual).to(equal(katamari.expected))
+    return
+
+
+# Scenario: The stem cache is saved and warmed
+
+
+@given("a stem cache with some stems in it")
+def setup_stem_cache(katamari):
+    katamari.words = "running flies discontent glorious".split()
+    katamari.cache = StemCache(maximum=3)
+    katamari.expected = [katamari.cache(word) for word in katamari.words]
+    expect(len(katamari.cache)).to(equal(3))
+    expect(katamari.cache.misses).to(equal(4))
+    return
+
+
+@when("the stem cache is saved and a new one is warmed from it")
+def warm_stem_cache(katamari, tmp_path):
+    path = tmp_path/"stems.json"
+    katamari.cache.save(path)
+    katamari.warmed = StemCache(maximum=3)
+    katamari.warmed.warm(path)
+    return
+
+
+@then("the new cache has the stems without re-stemming")
+def check_warmed_cache(katamari):
+    actual = [katamari.warmed(word) for word in katamari.words[1:]]
+    expect(actual).to(equal(katamari.expected[1:]))
+    expect(katamari.warmed.hits).to(equal(3))
+    expect(katamari.warmed.misses).to(equal(0))
+    expect("running" in katamari.warmed).to(equal(False))
+    return
+
+
+# Scenario: The user processes a batch of tweets with a pool of processes
+
+
+@given("a batch of tweets")
+def setup_batch(katamari, faker):
+    katamari.processor = TwitterProcessor(stopwords=["the", "a", "is"])
+    katamari.tweets = [f"RT #{faker.word()} {faker.sentence()} {faker.uri()}"
+                       for tweet in range(50)]
+    katamari.expected = [katamari.processor(tweet)
+                         for tweet in katamari.tweets]
+    return
+
+
+@when("the batch is processed with two workers")
+def process_batch(katamari):
+    katamari.actual = katamari.processor.process_many(katamari.tweets,
+                                                      workers=2,
+                                                      chunksize=7)
+    return
+
+
+@then("the tweets are processed in the original order")
+def check_batch(katamari):
+    expect(katamari.actual).to(equal(katamari.expected))
+    return
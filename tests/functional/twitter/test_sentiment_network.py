@@ -0,0 +1,150 @@
+"""Sentiment Network Predictions feature tests."""
+# pypi
+from expects import (
+    be_true,
+    equal,
+    expect,
+)
+
+from pytest_bdd import (
+    given,
+    scenarios,
+    then,
+    when,
+)
+
+import numpy
+import pytest
+
+# the network module builds trax layers when it's imported
+trax = pytest.importorskip("trax")
+
+# this test repo
+from fixtures import katamari
+
+# software under test
+from neurotic.nlp.twitter.sentiment_network import (
+    Checkpoint,
+    SentimentNetwork,
+)
+from neurotic.nlp.twitter.tensor_generator import (
+    SpecialIDs,
+    TensorBuilder,
+    TensorGenerator,
+)
+
+and_also = then
+scenarios("twitter/sentiment_network.feature")
+
+POSITIVE = ["happy day", "good good fun", "a happy good time", "fun",
+            "what a good happy fun day", "good times"]
+NEGATIVE = ["sad day", "bad bad rain", "a sad bad time", "rain",
+            "what a bad sad rainy day", "bad times"]
+# out of order lengths so sorting them moves them around
+TWEETS = ["what a good happy fun day", "sad", "happy day", "",
+          "a bad sad rainy time", "good", "bad rain", "fun fun fun"]
+STEPS = 10
+
+
+def builder() -> TensorBuilder:
+    """Converts the tweets without the NLTK data"""
+    return TensorBuilder(positive=POSITIVE, negative=NEGATIVE,
+                         process=str.split)
+
+
+def one_at_a_time(network: SentimentNetwork) -> numpy.ndarray:
+    """The predictions made for each tweet on its own"""
+    return numpy.vstack([network.predict([tweet]) for tweet in TWEETS])
+
+# ********** #
+# Scenario: The user predicts with a stand-in model
+
+
+def stand_in(batch: numpy.ndarray) -> numpy.ndarray:
+    """Log-probabilities that depend on each tweet's tokens
+
+    The padding is left out so the padding a batch adds doesn't matter.
+    """
+    tokens = batch != SpecialIDs.padding
+    positive = ((batch * tokens).sum(axis=1) + 1)/(
+        (batch * tokens).sum(axis=1) + tokens.sum(axis=1) + 2)
+    return numpy.log(numpy.column_stack([1 - positive, positive]))
+
+
+@given("a sentiment network with a stand-in predictor")
+def setup_stand_in(katamari, tmp_path):
+    katamari.network = SentimentNetwork(
+        vocabulary_size=None, training_generator=None,
+        validation_generator=None, training_loops=1, output_path=tmp_path,
+        converter=builder(), predictor=stand_in)
+    return
+
+
+@when("the user predicts tweets of different lengths in small batches")
+def predict_small_batches(katamari):
+    katamari.predictions = katamari.network.predict(TWEETS, batch_size=3)
+    return
+
+
+@then("the rows are in the order of the tweets")
+def check_order(katamari):
+    converter = katamari.network.converter
+    expected = numpy.exp(numpy.vstack([
+        stand_in(numpy.array([converter.to_tensor(tweet) or
+                              [SpecialIDs.padding]]))
+        for tweet in TWEETS]))
+    expect(katamari.predictions.shape).to(equal((len(TWEETS), 2)))
+    expect(bool(numpy.allclose(katamari.predictions, expected))).to(be_true)
+    return
+
+
+@and_also("they match predicting one tweet at a time")
+def check_one_at_a_time(katamari):
+    expect(bool(numpy.allclose(katamari.predictions,
+                               one_at_a_time(katamari.network)))).to(be_true)
+    return
+
+# ********** #
+# Scenario: The user restores a trained network
+
+
+@given("a sentiment network trained for a few steps")
+def setup_trained(katamari, tmp_path):
+    converter = builder()
+    katamari.output_path = tmp_path
+    katamari.network = SentimentNetwork(
+        vocabulary_size=None,
+        training_generator=TensorGenerator(
+            converter, converter.positive_training_tensors,
+            converter.negative_training_tensors, batch_size=4),
+        validation_generator=TensorGenerator(
+            converter, converter.positive_training_tensors,
+            converter.negative_training_tensors, batch_size=4),
+        # the checkpoint is saved every 10 steps
+        training_loops=STEPS, output_path=str(tmp_path),
+        embedding_dimension=8, converter=converter)
+    katamari.network.fit()
+    expect((tmp_path/Checkpoint.model).is_file()).to(be_true)
+    katamari.expected = katamari.network.predict(TWEETS, batch_size=3)
+    return
+
+
+@when("the user restores the network from its checkpoint")
+def restore(katamari):
+    katamari.network = SentimentNetwork(
+        vocabulary_size=None, training_generator=None,
+        validation_generator=None, training_loops=STEPS,
+        output_path=katamari.output_path, embedding_dimension=8,
+        converter=builder())
+    katamari.predictions = katamari.network.predict(TWEETS, batch_size=3)
+    return
+
+
+@then("the restored network makes the same predictions")
+def check_restored(katamari):
+    expect(katamari.predictions.shape).to(equal((len(TWEETS), 2)))
+    expect(bool(numpy.allclose(katamari.predictions.sum(axis=1), 1))).to(
+        be_true)
+    expect(bool(numpy.allclose(katamari.predictions, katamari.expected,
+                               atol=1e-6))).to(be_true)
+    return
@@ -0,0 +1,321 @@
+"""Pre-Encoded Tweet Tensors feature tests."""
+
+# pypi
+from expects import (
+    be_a,
+    be_true,
+    contain,
+    equal,
+    expect,
+    raise_error,
+)
+
+from pytest_bdd import (
+    given,
+    parsers,
+    scenarios,
+    then,
+    when,
+)
+
+import numpy
+import zlib
+
+# this test repo
+from fixtures import katamari
+
+# software under test
+from neurotic.nlp.twitter.tensor_generator import (
+    BucketedTensorGenerator,
+    CacheSettingsError,
+    Encoded,
+    RaggedTensors,
+    SpecialIDs,
+    SpecialTokens,
+    TensorBuilder,
+    TensorGenerator,
+    pad_pair,
+)
+
+scenarios("twitter/tensor_generator.feature")
+
+TWEETS = ["a happy tweet", "another happy tweet", "happy happy"]
+
+# the token ids start after the special ids so padding is easy to spot
+FIRST_ID = len(vars(SpecialIDs))
+
+# ********** #
+# Scenario: The user pads a batch of encoded tweets
+
+
+@given("some encoded tweets of different lengths")
+def setup_tweets(katamari):
+    katamari.lists = [[3, 4, 5], [6], [], [7, 8]]
+    katamari.tensors = RaggedTensors.from_lists(katamari.lists)
+    return
+
+
+@when("the user pads a batch of them")
+def pad_batch(katamari):
+    katamari.indices = numpy.array([3, 2, 0])
+    katamari.batch = katamari.tensors.padded(katamari.indices)
+    return
+
+
+@then("the rows are the tweets filled out with padding")
+def check_padded(katamari):
+    expected = numpy.array([[7, 8, 0],
+                            [0, 0, 0],
+                            [3, 4, 5]])
+    expect(katamari.batch.dtype).to(equal(numpy.int32))
+    expect(bool((katamari.batch == expected).all())).to(be_true)
+    return
+
+# ********** #
+# Scenario: The user pads a positive and negative batch
+
+
+@given("encoded positive and negative tweets of different lengths")
+def setup_pair(katamari):
+    katamari.positive = RaggedTensors.from_lists([[3], [4, 5], [6], [7]])
+    katamari.negative = RaggedTensors.from_lists([[8, 9, 10, 11], [12],
+                                                  [13, 14], [15]])
+    return
+
+
+@when("the user pads a pair of batches")
+def pad_pair_batches(katamari):
+    katamari.batch = pad_pair(katamari.positive, numpy.array([0, 2]),
+                              katamari.negative, numpy.array([1, 0]))
+    return
+
+
+@then("both halves are padded to the longest tweet")
+def check_pair(katamari):
+    expected = numpy.array([[3, 0, 0, 0],
+                            [6, 0, 0, 0],
+                            [12, 0, 0, 0],
+                            [8, 9, 10, 11]])
+    expect(bool((katamari.batch == expected).all())).to(be_true)
+    return
+
+# ********** #
+# Scenario: The user saves and memory-maps the encoded tweets
+
+
+@when("the user saves them and loads them back")
+def save_and_load(katamari, tmp_path):
+    katamari.tensors.save(tmp_path, "positive_training")
+    expect(RaggedTensors.exists(tmp_path, "positive_training")).to(be_true)
+    katamari.loaded = RaggedTensors.load(tmp_path, "positive_training")
+    return
+
+
+@then("the loaded tweets are memory-mapped copies of the originals")
+def check_loaded(katamari):
+    expect(katamari.loaded.tokens).to(be_a(numpy.memmap))
+    expect(katamari.loaded.offsets).to(be_a(numpy.memmap))
+    expect([katamari.loaded[index].tolist()
+            for index in range(len(katamari.loaded))]).to(
+                equal(katamari.lists))
+    return
+
+# ********** #
+# Scenario: The user buckets the tweets by length
+
+
+@given("encoded positive and negative tweets of many lengths")
+def setup_lengths(katamari):
+    generator = numpy.random.default_rng(0)
+
+    def tweets():
+        return RaggedTensors.from_lists(
+            list(range(FIRST_ID, FIRST_ID + length))
+            for length in generator.integers(1, 12, 200))
+    katamari.positive = tweets()
+    katamari.negative = tweets()
+    katamari.boundaries = [4, 8]
+    katamari.batch_sizes = [8, 6, 4]
+    return
+
+
+@when("the user runs through one epoch of buckets")
+def run_epoch(katamari):
+    katamari.batches = list(BucketedTensorGenerator(
+        katamari.positive, katamari.negative,
+        boundaries=katamari.boundaries,
+        batch_sizes=katamari.batch_sizes,
+        infinite=False, seed=0))
+    return
+
+
+@then("each batch comes from one bucket with that bucket's size")
+def check_buckets(katamari):
+    expect(len(katamari.batches) > 0).to(be_true)
+    planned = 0
+    for inputs, targets, weights in katamari.batches:
+        lengths = (inputs != SpecialIDs.padding).sum(axis=1)
+        buckets = set(numpy.searchsorted(katamari.boundaries, lengths,
+                                         side="right").tolist())
+        expect(len(buckets)).to(equal(1))
+        size = katamari.batch_sizes[buckets.pop()]
+        expect(inputs.shape[0]).to(equal(size))
+        expect(inputs.shape[1]).to(equal(int(lengths.max())))
+        expect(targets.tolist()).to(equal([1] * (size//2) + [0] * (size//2)))
+        expect(weights.tolist()).to(equal([1] * size))
+        planned += 1
+
+    # every full batch the buckets hold is used once
+    generator = BucketedTensorGenerator(katamari.positive, katamari.negative,
+                                        boundaries=katamari.boundaries,
+                                        batch_sizes=katamari.batch_sizes)
+    expected = sum(
+        min(len(positives), len(negatives)) // (size//2)
+        for positives, negatives, size in zip(
+            generator.buckets(katamari.positive),
+            generator.buckets(katamari.negative),
+            katamari.batch_sizes))
+    expect(planned).to(equal(expected))
+    return
+
+# ********** #
+# Scenario: The user runs out of encoded tweets
+
+
+@when("the user generates batches that aren't infinite")
+def generate_finite(katamari):
+    katamari.batches = list(TensorGenerator(
+        TensorBuilder(), katamari.positive, katamari.negative,
+        batch_size=4, shuffle=False, infinite=False))
+    return
+
+
+@then("the generator stops after the last full batch")
+def check_finite(katamari):
+    expect(len(katamari.batches)).to(equal(2))
+    inputs, targets, weights = katamari.batches[1]
+    expected = numpy.array([[6, 0],
+                            [7, 0],
+                            [13, 14],
+                            [15, 0]])
+    expect(bool((inputs == expected).all())).to(be_true)
+    expect(targets.tolist()).to(equal([1, 1, 0, 0]))
+    return
+
+# ********** #
+# Scenario: The user re-uses a cache folder with the same settings
+
+
+def cached_builder(cache, **settings) -> TensorBuilder:
+    """Builds tensors for some tweets without the NLTK data"""
+    return TensorBuilder(cache=cache, positive=TWEETS,
+                         negative=TWEETS, process=str.split, **settings)
+
+
+@given("tweets encoded into a cache folder")
+def setup_cache(katamari, tmp_path):
+    katamari.cache = tmp_path
+    katamari.tensors = cached_builder(tmp_path).positive_training_tensors
+    expect(RaggedTensors.exists(tmp_path, Encoded.positive_training)).to(
+        be_true)
+    return
+
+
+@when("the user builds the tensors again with the same settings")
+def rebuild_same(katamari, mocker):
+    katamari.builder = cached_builder(katamari.cache)
+    katamari.encode = mocker.spy(katamari.builder, "encode")
+    katamari.loaded = katamari.builder.positive_training_tensors
+    return
+
+
+@then("the tensors are loaded from the cache")
+def check_cached(katamari):
+    expect(katamari.encode.call_count).to(equal(0))
+    expect(katamari.loaded.tokens).to(be_a(numpy.memmap))
+    expect(katamari.loaded.tokens.tolist()).to(
+        equal(katamari.tensors.tokens.tolist()))
+    return
+
+# ********** #
+# Scenario Outline: The user re-uses a cache folder with other settings
+
+
+@when(parsers.parse(
+    "the user builds the tensors again with {setting} set to {value:d}"))
+def rebuild_different(katamari, setting, value):
+    katamari.builder = cached_builder(katamari.cache, **{setting: value})
+    katamari.setting = setting
+    return
+
+
+@then("the cache folder is refused")
+def check_refused(katamari):
+    expect(lambda: katamari.builder.positive_training_tensors).to(
+        raise_error(CacheSettingsError,
+                    contain(f"was built with {katamari.setting}=")))
+    expect(lambda: katamari.builder.vocabulary).to(
+        raise_error(CacheSettingsError))
+    return
+
+# ********** #
+# Scenario Outline: The user builds a pruned vocabulary
+
+# the training tokens are seen in the order b a c d e f with 'a' three
+# times, 'b' twice and the rest once (so c, d, e and f tie)
+PRUNING_POSITIVE = ["b a c", "a d"]
+PRUNING_NEGATIVE = ["e a b", "f"]
+PRUNING_TWEET = "a c z z"
+AND_ALSO = then
+
+
+@given(parsers.parse("a tensor builder with {setting} set to {value:d}"))
+def setup_pruned_builder(katamari, setting, value):
+    katamari.builder = TensorBuilder(positive=PRUNING_POSITIVE,
+                                     negative=PRUNING_NEGATIVE,
+                                     process=str.split, **{setting: value})
+    return
+
+
+@when("the user converts a tweet to a tensor")
+def convert_tweet(katamari):
+    katamari.tensor = katamari.builder.to_tensor(PRUNING_TWEET)
+    return
+
+
+@then(parsers.parse("the vocabulary is {tokens}"))
+def check_vocabulary(katamari, tokens):
+    if tokens == "only the special tokens":
+        tokens = []
+    else:
+        tokens = tokens.split()
+    specials = [SpecialTokens.padding, SpecialTokens.ending,
+                SpecialTokens.unknown]
+    expect(list(katamari.builder.vocabulary)).to(equal(specials + tokens))
+    expect(list(katamari.builder.vocabulary.values())).to(
+        equal(list(range(len(specials) + len(tokens)))))
+    return
+
+
+@AND_ALSO(parsers.parse("the tensor is {ids}"))
+def check_tensor(katamari, ids):
+    if ids == "the hashed ids":
+        expected = [len(vars(SpecialIDs))
+                    + zlib.crc32(token.encode("utf-8")) % 16
+                    for token in PRUNING_TWEET.split()]
+        expect([katamari.builder.hashed(token)
+                for token in PRUNING_TWEET.split()]).to(equal(expected))
+        # the repeated token gets the same id and none of them are special
+        expect(katamari.tensor[2]).to(equal(katamari.tensor[3]))
+        expect(min(katamari.tensor) >= len(vars(SpecialIDs))).to(be_true)
+    else:
+        expected = [int(token_id) for token_id in ids.split()]
+    expect(katamari.tensor).to(equal(expected))
+    return
+
+
+@AND_ALSO(parsers.parse("the vocabulary size is {size:d}"))
+def check_vocabulary_size(katamari, size):
+    expect(katamari.builder.vocabulary_size).to(equal(size))
+    expect(max(katamari.tensor) < size).to(be_true)
+    return
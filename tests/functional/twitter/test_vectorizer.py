@@ -182,3 +182,30 @@ def setup_bad_counter(katamari, mocker):
 
 # When check-rep is called
 # Then it raises an AssertionError
+
+
+# Scenario: The sparse vectors match the extracted features
+
+
+@given("a Tweet Vectorizer with random tweets")
+def setup_random_tweets(katamari, faker):
+    words = faker.words(nb=50, unique=True)
+    katamari.tweets = [random.choices(words, k=random.randrange(10))
+                       for tweet in range(100)]
+    counts = Counter()
+    for tweet in katamari.tweets[:50]:
+        for token in tweet:
+            counts[(token, random.randrange(2))] += 1
+    katamari.vectorizer = TweetVectorizer(tweets=katamari.tweets,
+                                          counts=counts)
+    return
+
+#  When the user checks the count vectors
+
+
+@then("they are the same as the extracted features")
+def check_sparse_vectors(katamari):
+    expected = numpy.array([katamari.vectorizer.extract_features(tweet)
+                            for tweet in katamari.tweets])
+    expect(numpy.array_equal(katamari.actual_vectors, expected)).to(be_true)
+    return
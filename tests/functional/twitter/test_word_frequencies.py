@@ -1,3 +1,8 @@
+# python
+from itertools import repeat
+
+import json
+
 # pypi
 from expects import (
     be,
@@ -12,12 +17,17 @@ from pytest_bdd import (
     when
 )
 
+import numpy
+
 # testing setup
 from fixtures import katamari
 
 # software under test
 from neurotic.nlp.twitter.counter import WordCounter
 from neurotic.nlp.twitter.processor import TwitterProcessor
+from neurotic.nlp.twitter.stream import TweetStream
+
+and_also = then
 
 scenarios("twitter/word_frequencies.feature")
 
@@ -83,3 +93,73 @@ def check_counts(katamari):
     for key, value in katamari.counts.items():
         expect(katamari.expected[key]).to(equal(value))
     return
+
+
+# Scenario: The Word Frequency counter is updated from a stream of tweets
+
+
+@given("a file of tweets")
+def setup_tweet_file(katamari, tmp_path, mocker):
+    katamari.path = tmp_path/"positive_tweets.json"
+    with katamari.path.open("w") as writer:
+        for tweet in ("a b aab", "a b c"):
+            writer.write(json.dumps(dict(text=tweet)) + "\n")
+    katamari.processor = mocker.MagicMock(TwitterProcessor)
+    katamari.processor.side_effect = lambda x: x.split()
+    katamari.counter = WordCounter(tweets=[], labels=[])
+    katamari.counter._process = katamari.processor
+    katamari.counter.update(["c aab aab"], [0])
+    katamari.expected = {("a", 1): 2, ("b", 1): 2, ("c", 1): 1, ("aab", 1):1,
+                         ("c", 0): 1, ("aab", 0): 2}
+    return
+
+
+@when("the counter is updated from a stream of the file")
+def update_from_stream(katamari):
+    stream = TweetStream(katamari.path, process=katamari.processor)
+    katamari.counts = katamari.counter.update(stream, repeat(1),
+                                              processed=True)
+    return
+
+
+# Scenario: The Word Frequency counter builds a count matrix
+
+
+@when("the count matrix is built")
+def build_matrix(katamari):
+    katamari.matrix = katamari.counter.matrix
+    katamari.counts = dict(katamari.matrix.items())
+    expect(katamari.counts).to(equal(katamari.expected))
+    return
+
+
+@and_also("the matrix rows have the counts")
+def check_matrix_rows(katamari):
+    matrix = katamari.matrix
+    expect(matrix.counts.shape).to(equal((4, 2)))
+    expect(matrix["aab", 0]).to(equal(2))
+    expect(matrix["zulu", 1]).to(equal(0))
+    expect(matrix.token_counts("a aab".split()).tolist()).to(equal([2, 3]))
+    expect(numpy.array_equal(matrix.totals, [3, 6])).to(equal(True))
+    return
+
+
+# Scenario: The Word Frequency counter is updated after the count matrix
+
+
+@when("the counter is updated with more tweets")
+def update_after_matrix(katamari):
+    katamari.updated = katamari.counter.update(["a z"], [1])
+    return
+
+
+@then("the counts include the new tweets")
+def check_updated_counts(katamari):
+    expected = dict(katamari.expected)
+    expected[("a", 1)] += 1
+    expected[("z", 1)] = 1
+    expect(katamari.updated).to(be(katamari.matrix))
+    expect(dict(katamari.matrix.items())).to(equal(expected))
+    expect(dict(katamari.counter.counts)).to(equal(expected))
+    expect(katamari.counter.counts[("z", 1)]).to(equal(1))
+    return